@@ -0,0 +1,105 @@
+"""Benchmark of the vectorized portfolio risk.
+
+Builds `positions` random positions (10000 by default) over 500 accounts and
+50 symbols, and reports the time to load them, to compute every margin ratio,
+maintenance margin buffer and liquidation price, and to apply a `markprices`
+tick of 5 symbols, next to the same computation done with a loop over the
+position dicts:
+
+    python benchmarks/bench_risk.py [positions]
+"""
+import random
+import sys
+import time
+
+from orderly_evm_connector.lib.risk import PortfolioRisk
+
+ACCOUNTS = 500
+SYMBOLS = 50
+ROUNDS = 20
+
+
+def data(count):
+    random.seed(1)
+    symbols = [
+        {"symbol": f"PERP_S{i}_USDC", "base_imr": 0.1, "base_mmr": 0.05, "imr_factor": 0.0000002}
+        for i in range(SYMBOLS)
+    ]
+    marks = {row["symbol"]: random.uniform(1, 1000) for row in symbols}
+    positions = []
+    for i in range(count):
+        symbol = symbols[i % SYMBOLS]["symbol"]
+        qty = random.uniform(-100, 100)
+        positions.append(
+            {
+                "account_id": f"0x{random.randrange(ACCOUNTS):04x}",
+                "symbol": symbol,
+                "position_qty": qty,
+                "cost_position": qty * marks[symbol] * random.uniform(0.9, 1.1),
+                "mark_price": marks[symbol],
+                "leverage": 10,
+            }
+        )
+    collateral = {f"0x{i:04x}": 10000.0 for i in range(ACCOUNTS)}
+    return symbols, marks, positions, collateral
+
+
+def loop(symbols, marks, positions, collateral):
+    params = {row["symbol"]: row for row in symbols}
+    totals = {}
+    for row in positions:
+        p = params[row["symbol"]]
+        qty, mark = row["position_qty"], marks[row["symbol"]]
+        notional = abs(qty) * mark
+        factor = p["imr_factor"] * notional ** 0.8
+        mmr = max(p["base_mmr"], p["base_mmr"] / p["base_imr"] * factor)
+        total = totals.setdefault(row["account_id"], [0.0, 0.0, 0.0])
+        total[0] += notional
+        total[1] += qty * mark - row["cost_position"]
+        total[2] += notional * mmr
+        row["_mmr"] = mmr
+    accounts = {}
+    for account, (notional, upnl, mm) in totals.items():
+        equity = collateral[account] + upnl
+        accounts[account] = (equity / notional, equity - mm)
+    for row in positions:
+        qty = row["position_qty"]
+        buffer = accounts[row["account_id"]][1]
+        row["_liquidation_price"] = max(
+            marks[row["symbol"]] + buffer / (abs(qty) * row["_mmr"] - qty), 0
+        )
+    return accounts
+
+
+def timed(function, rounds=ROUNDS):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        function()
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    symbols, marks, positions, collateral = data(count)
+    risk = PortfolioRisk(symbols)
+
+    load = timed(lambda: risk.load_positions(positions, collateral=collateral), 5)
+    compute = timed(lambda: (risk.recompute(), risk.compute()))
+    baseline = timed(lambda: loop(symbols, marks, positions, collateral))
+
+    ticks = [
+        [{"symbol": f"PERP_S{(r * 5 + i) % SYMBOLS}_USDC", "price": random.uniform(1, 1000)} for i in range(5)]
+        for r in range(ROUNDS)
+    ]
+    ticks_iter = iter(ticks)
+    tick = timed(lambda: (risk.update_mark_prices(next(ticks_iter)), risk.compute()))
+
+    print(f"{count} positions, {ACCOUNTS} accounts, {SYMBOLS} symbols")
+    print(f"load                     {load:8.2f} ms")
+    print(f"full pass (numpy)        {compute:8.2f} ms")
+    print(f"full pass (python loop)  {baseline:8.2f} ms")
+    print(f"5 symbol tick + compute  {tick:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Micro-benchmark of request signing throughput.
+
+Compares decoding the orderly secret on every call (the previous behaviour of
+`generate_signature`) against a reusable `OrderlySigner`.
+
+    python benchmarks/bench_signing.py [iterations]
+"""
+import os
+import sys
+import time
+
+import base58
+
+from orderly_evm_connector.lib.utils import OrderlySigner
+
+MESSAGE = 'POST/v1/order{"symbol": "PERP_ETH_USDC", "order_type": "LIMIT", "side": "BUY", "order_price": 1500.5, "order_quantity": 0.1}'
+
+
+def bench(label, func, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {iterations / elapsed:>12,.0f} signatures/s  ({elapsed * 1e6 / iterations:.1f} us/op)")
+    return elapsed
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    orderly_secret = "ed25519:" + base58.b58encode(os.urandom(32)).decode()
+
+    before = bench(
+        "decode secret per request",
+        lambda: OrderlySigner(orderly_secret).sign(MESSAGE),
+        iterations,
+    )
+    signer = OrderlySigner(orderly_secret)
+    after = bench("cached OrderlySigner", lambda: signer.sign(MESSAGE), iterations)
+    print(f"speedup: {before / after:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Benchmark of websocket frame handling in the sync socket manager.
+
+Replays an `@orderbookupdate` stream through `OrderlySocketManager._handle_data`
+with a callback that needs the parsed message, and reports messages per second
+on one core for each `message_format` and JSON backend. The previous behaviour
+(parse for the ping check, deliver a string, parse again in the callback) is
+measured as a baseline.
+
+    python benchmarks/bench_ws_decode.py [recorded_stream.jsonl]
+
+A recorded stream has one raw frame per line. Without one, a synthetic stream
+of 20,000 PERP_ETH_USDC updates is used.
+"""
+import json
+import logging
+import random
+import sys
+import time
+
+from websocket import ABNF
+
+from orderly_evm_connector.lib.utils import get_json_backend, orjson
+from orderly_evm_connector.websocket.orderly_socket_manager import OrderlySocketManager
+from orderly_evm_connector.websocket.subscriptions import SubscriptionRegistry
+
+
+class Frame(object):
+    def __init__(self, data):
+        self.data = data
+
+
+def synthetic_stream(count=20000, symbol="PERP_ETH_USDC"):
+    rng = random.Random(7)
+    ts = 1700000000000
+    frames = []
+    for _ in range(count):
+        prev_ts, ts = ts, ts + 200
+        side = lambda: [
+            [round(2000 + rng.uniform(-20, 20), 2), round(rng.uniform(0, 50), 4)]
+            for _ in range(rng.randint(1, 20))
+        ]
+        message = {
+            "topic": f"{symbol}@orderbookupdate",
+            "ts": ts,
+            "data": {"symbol": symbol, "prevTs": prev_ts, "asks": side(), "bids": side()},
+        }
+        frames.append(json.dumps(message, separators=(",", ":")).encode())
+    return frames
+
+
+def load_stream(path):
+    with open(path, "rb") as f:
+        return [line.rstrip(b"\n") for line in f if line.strip()]
+
+
+def manager(message_format, json_backend, on_message):
+    # the frame handling only, without opening a connection
+    socket_manager = OrderlySocketManager.__new__(OrderlySocketManager)
+    socket_manager.message_format = message_format
+    socket_manager._json_dumps, socket_manager._json_loads = get_json_backend(json_backend)
+    socket_manager.on_message = on_message
+    socket_manager.on_error = None
+    socket_manager.router = None
+    socket_manager.conflator = None
+    socket_manager.subscriptions = SubscriptionRegistry()
+    socket_manager.logger = logging.getLogger("bench")
+    return socket_manager
+
+
+def bench(label, frames, handle):
+    start = time.process_time()
+    for frame in frames:
+        handle(frame)
+    elapsed = time.process_time() - start
+    print(f"{label:<34} {len(frames) / elapsed:>12,.0f} msg/s per core")
+    return elapsed
+
+
+def main():
+    raw = load_stream(sys.argv[1]) if len(sys.argv) > 1 else synthetic_stream()
+    frames = [Frame(data) for data in raw]
+    consume = lambda message: message["data"]["symbol"]
+
+    def baseline(frame):
+        # previous behaviour: json.loads for the ping check, then the callback
+        # receives the decoded string and parses it again
+        message = json.loads(frame.data)
+        if "event" in message and message["event"] == "ping":
+            pass
+        consume(json.loads(frame.data.decode()))
+
+    bench("before (parse twice)", frames, baseline)
+
+    backends = ["json"] + (["orjson"] if orjson is not None else [])
+    for backend in backends:
+        loads = get_json_backend(backend)[1]
+        for message_format, callback in (
+            ("str", lambda _, message: consume(loads(message))),
+            ("bytes", lambda _, message: consume(loads(message))),
+            ("dict", lambda _, message: consume(message)),
+        ):
+            socket_manager = manager(message_format, backend, callback)
+            bench(
+                f"message_format={message_format}, {backend}",
+                frames,
+                lambda frame: socket_manager._handle_data(ABNF.OPCODE_TEXT, frame, None),
+            )
+
+
+if __name__ == "__main__":
+    main()
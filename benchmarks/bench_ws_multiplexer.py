@@ -0,0 +1,113 @@
+"""Benchmark of the private websocket multiplexer.
+
+Connects `accounts` private connections (200 by default) to a local server
+acknowledging `auth`, subscribes `executionreport` on each, has the server push
+`messages` messages per account, and reports the memory and the CPU time per
+account and per message:
+
+    python benchmarks/bench_ws_multiplexer.py [accounts] [messages]
+
+Memory is measured with tracemalloc (Python allocations of the client side,
+the server runs in the same process but is excluded), CPU time with
+`time.process_time` for the whole process, server included, so it is an upper
+bound.
+"""
+import asyncio
+import json
+import sys
+import time
+import tracemalloc
+
+import base58
+import websockets
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+from cryptography.hazmat.primitives.serialization import Encoding, NoEncryption, PrivateFormat
+
+from orderly_evm_connector.websocket.multiplexer import WebsocketPrivateMultiplexer
+
+
+def orderly_secret():
+    key = Ed25519PrivateKey.generate().private_bytes(
+        Encoding.Raw, PrivateFormat.Raw, NoEncryption()
+    )
+    return "ed25519:" + base58.b58encode(key).decode()
+
+
+async def serve(messages):
+    async def handler(ws, path=None):
+        async for raw in ws:
+            message = json.loads(raw)
+            if message.get("event") == "auth":
+                await ws.send(json.dumps({"event": "auth", "success": True}))
+            elif message.get("event") == "subscribe":
+                for n in range(messages):
+                    await ws.send(
+                        json.dumps(
+                            {
+                                "topic": message["topic"],
+                                "ts": 1700000000000 + n,
+                                "data": {"symbol": "PERP_ETH_USDC", "status": "FILLED", "n": n},
+                            }
+                        )
+                    )
+
+    server = await websockets.serve(handler, "127.0.0.1", 0)
+    return server, f"ws://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+
+
+async def main(accounts, messages):
+    server, url = await serve(messages)
+    received = 0
+    done = asyncio.Event()
+
+    def on_message(account_id, message):
+        nonlocal received
+        received += 1
+        if received == accounts * messages:
+            done.set()
+
+    tracemalloc.start()
+    baseline = tracemalloc.take_snapshot()
+    cpu = time.process_time()
+    wall = time.monotonic()
+
+    mux = WebsocketPrivateMultiplexer(
+        orderly_key="ed25519:benchmark",
+        orderly_secret=orderly_secret(),
+        topics=(),
+        on_message=on_message,
+    )
+    for n in range(accounts):
+        mux.add_account(f"account{n}").websocket_url = f"{url}/account{n}"
+    failed = await mux.run()
+    connect_cpu = time.process_time() - cpu
+    connect_wall = time.monotonic() - wall
+    snapshot = tracemalloc.take_snapshot()
+    filters = [tracemalloc.Filter(True, "*orderly_evm_connector*"), tracemalloc.Filter(True, "*websockets*")]
+    memory = sum(
+        stat.size_diff
+        for stat in snapshot.filter_traces(filters).compare_to(
+            baseline.filter_traces(filters), "filename"
+        )
+    )
+    tracemalloc.stop()
+
+    cpu = time.process_time()
+    mux.subscribe("executionreport")
+    await asyncio.wait_for(done.wait(), 60)
+    message_cpu = time.process_time() - cpu
+
+    print(f"accounts: {accounts} ({len(failed)} failed), messages per account: {messages}")
+    print(f"connect + auth: {connect_wall:.2f}s wall, {connect_cpu * 1000 / accounts:.2f}ms CPU per account")
+    print(f"memory: {memory / accounts / 1024:.1f} KiB per account")
+    print(f"messages: {message_cpu * 1e6 / received:.1f}us CPU per message")
+
+    await mux.stop_async()
+    server.close()
+    await server.wait_closed()
+
+
+if __name__ == "__main__":
+    accounts = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    messages = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    asyncio.run(main(accounts, messages))
@@ -341,11 +341,12 @@ async def run_async_examples(
     client_async_public: AsyncClient,
     client_async_private: AsyncClient,
 ) -> None:
-    logging.info("Requesting registration nonce (async public API)")
-    await client_async_public.get_registration_nonce()
+    async with client_async_public, client_async_private:
+        logging.info("Requesting registration nonce (async public API)")
+        await client_async_public.get_registration_nonce()
 
-    logging.info("Requesting current holdings (async private API)")
-    await client_async_private.get_current_holdings(True)
+        logging.info("Requesting current holdings (async private API)")
+        await client_async_private.get_current_holdings(True)
 
 
 def main() -> None:
@@ -1,14 +1,20 @@
 import json
+import threading
 from json import JSONDecodeError
 import requests
+from requests.adapters import HTTPAdapter
 from .__version__ import __version__
-from orderly_evm_connector.error import ClientError, ServerError
+from orderly_evm_connector.error import ClientError, ParameterValueError, ServerError
 from orderly_evm_connector.lib.utils import (
-    generate_signature,
+    OrderlySigner,
     generate_wallet_signature,
 )
-from orderly_evm_connector.lib.utils import cleanNoneValue
+from orderly_evm_connector.lib.utils import cleanNoneValue, get_json_backend
 from orderly_evm_connector.lib.utils import orderlyLog, get_endpoints
+from orderly_evm_connector.lib.rate_limiter import RateLimiter
+from orderly_evm_connector.lib.singleflight import SingleFlight
+from orderly_evm_connector.lib.cache import ResponseCache, FRESH, STALE
+from orderly_evm_connector.lib.symbol_rules import SymbolRulesIndex
 
 class API(object):
     def __init__(
@@ -21,10 +27,17 @@ class API(object):
         proxies=None,
         timeout=None,
         debug=False,
-        orderly_api_url=None
+        orderly_api_url=None,
+        pool_maxsize=None,
+        json_backend=None,
+        rate_limiter=None,
+        singleflight=None,
+        cache=None,
+        symbol_rules=None,
     ):
         self.orderly_key = orderly_key
         self.orderly_secret = orderly_secret
+        self.signer = self._create_signer(orderly_secret)
         self.wallet_secret = wallet_secret
         self.orderly_testnet = orderly_testnet
         if orderly_api_url:
@@ -36,16 +49,44 @@ class API(object):
         self.show_header = False
         self.proxies = proxies
         self.logger = orderlyLog(debug=debug)
+        self._json_dumps, self._json_loads = get_json_backend(json_backend)
+        self.rate_limiter = RateLimiter() if rate_limiter is True else rate_limiter
+        self.singleflight = SingleFlight() if singleflight is True else singleflight
+        # responses are only cached when enabled here or per call with `use_cache`
+        self.cache = cache if isinstance(cache, ResponseCache) else ResponseCache()
+        self.cache_enabled = bool(cache)
+        # orders are checked against the symbol rules before they are signed
+        self.symbol_rules = SymbolRulesIndex(self) if symbol_rules is True else symbol_rules
         self.session = requests.Session()
+        if pool_maxsize:
+            adapter = HTTPAdapter(pool_maxsize=pool_maxsize)
+            self.session.mount("https://", adapter)
+            self.session.mount("http://", adapter)
         self.session.headers.update(
             {
-                "Content-Type": "application/json;charset=utf-8",
                 "User-Agent": "orderly-connector-python/" + __version__,
             }
         )
         return
 
-    def _request(self, http_method, url_path, payload=None):
+    def _create_signer(self, orderly_secret):
+        # without a secret requests go out unsigned, a malformed one fails
+        # here rather than as 401s from the server
+        if not orderly_secret:
+            return None
+        try:
+            return OrderlySigner(orderly_secret)
+        except ValueError as e:
+            raise ParameterValueError(["orderly_secret"]) from e
+
+    def _throttle(self, http_method, url_path):
+        if self.rate_limiter:
+            waited = self.rate_limiter.acquire(http_method, url_path)
+            if waited:
+                self.logger.debug(f"Rate limited {http_method} {url_path}, waited {waited:.3f}s")
+
+    def _request(self, http_method, url_path, payload=None, use_cache=None):
+        path = url_path
         if payload:
             _payload = cleanNoneValue(payload)
             if _payload:
@@ -55,11 +96,50 @@ class API(object):
                     )
                     payload = ""
                 else:
-                    payload = _payload
+                    payload = self._json_dumps(_payload)
 
         if payload is None:
             payload = ""
         url = self.orderly_endpoint + url_path
+        if http_method == "GET" and (use_cache or (use_cache is None and self.cache_enabled)):
+            ttl = self.cache.ttl(path, default=use_cache)
+            if ttl:
+                return self._cached_get(ttl, path, url, payload)
+        return self._get_or_fetch(http_method, path, url, payload)
+
+    def _get_or_fetch(self, http_method, url_path, url, payload):
+        if self.singleflight and http_method == "GET":
+            # identical unsigned GETs in flight share one call and its result
+            return self.singleflight.do(
+                url, lambda: self._fetch(http_method, url_path, url, payload)
+            )
+        return self._fetch(http_method, url_path, url, payload)
+
+    def _cached_get(self, ttl, url_path, url, payload):
+        state, data = self.cache.lookup(url)
+        if state == FRESH:
+            return data
+        if state == STALE:
+            if self.cache.begin_refresh(url):
+                threading.Thread(
+                    target=self._refresh, args=(ttl, url_path, url, payload), daemon=True
+                ).start()
+            return data
+        data = self._get_or_fetch("GET", url_path, url, payload)
+        self.cache.set(url, data, ttl)
+        return data
+
+    def _refresh(self, ttl, url_path, url, payload):
+        try:
+            self.cache.set(url, self._get_or_fetch("GET", url_path, url, payload), ttl)
+        except Exception as e:
+            self.logger.warning(f"Failed to refresh cached response of {url}: {e}")
+            self.cache.end_refresh(url, failed=True)
+        else:
+            self.cache.end_refresh(url)
+
+    def _fetch(self, http_method, url_path, url, payload):
+        self._throttle(http_method, url_path)
         self.logger.debug("url: " + url)
         params = cleanNoneValue(
             {
@@ -74,7 +154,7 @@ class API(object):
         self._handle_rest_exception(response)
 
         try:
-            data = response.json()
+            data = self._json_loads(response.content)
         except ValueError:
             data = response.text
 
@@ -84,6 +164,7 @@ class API(object):
         return generate_wallet_signature(self.wallet_secret, message=message)
 
     def _sign_request(self, http_method, url_path, payload=None):
+        self._throttle(http_method, url_path)
         _payload = ""
         if payload:
             _payload = cleanNoneValue(payload)
@@ -94,32 +175,29 @@ class API(object):
                     )
                     _payload = ""
         params = {}
-        payload = _payload if _payload else ""
+        # the body is encoded once, the same bytes are signed and sent
+        payload = self._json_dumps(_payload) if _payload else ""
         params["url_path"] = url_path
         params["payload"] = payload
         params["http_method"] = http_method
         query_string = self._prepare_params(params)
-        try:
-            _timestamp, _signature = generate_signature(
-                self.orderly_secret, message=query_string
-            )
-        except ValueError:
+        if self.signer:
+            _timestamp, _signature = self.signer.sign(query_string)
+        else:
             _timestamp, _signature = "mock_timestamp", "mock_signature"
 
-        self.session.headers.update(
-            {
-                "orderly-timestamp": _timestamp,
-                "orderly-account-id": self.orderly_account_id,
-                "orderly-key": self.orderly_key,
-                "orderly-signature": _signature,
-            }
-        )
-        self.logger.debug(f"Sign Request Headers: {self.session.headers}")
-        return self.send_request(http_method, url_path, payload)
+        headers = {
+            "orderly-timestamp": _timestamp,
+            "orderly-account-id": self.orderly_account_id,
+            "orderly-key": self.orderly_key,
+            "orderly-signature": _signature,
+        }
+        self.logger.debug(f"Sign Request Headers: {headers}")
+        return self.send_request(http_method, url_path, payload, headers=headers)
 
-    def send_request(self, http_method, url_path, payload=None):
+    def send_request(self, http_method, url_path, payload=None, headers=None):
         if payload is None:
-            payload = {}
+            payload = ""
         url = self.orderly_endpoint + url_path
         self.logger.debug("url: " + url)
         params = cleanNoneValue(
@@ -128,6 +206,7 @@ class API(object):
                 "params": payload,
                 "timeout": self.timeout,
                 "proxies": self.proxies,
+                "headers": headers,
             }
         )
         response = self._dispatch_request(http_method, params)
@@ -135,7 +214,7 @@ class API(object):
         self._handle_rest_exception(response)
 
         try:
-            data = response.json()
+            data = self._json_loads(response.content)
         except ValueError:
             data = response.text
         result = {}
@@ -151,33 +230,33 @@ class API(object):
     def _prepare_params(self, params: dict):
         _http_method = params["http_method"]
         _url_path = params["url_path"]
-        _payload = (
-            json.dumps(params["payload"]) if params["payload"] else params["payload"]
-        )
+        _payload = params["payload"]
+        if isinstance(_payload, bytes):
+            _payload = _payload.decode("utf-8")
         _params = "{0}{1}{2}".format(_http_method, _url_path, _payload)
         return _params
 
     def _dispatch_request(self, http_method, params):
-        method_func = {
-            "GET": self.session.get,
-            "DELETE": self.session.delete,
-            "PUT": self.session.put,
-            "POST": self.session.post,
-        }.get(http_method, "GET")
+        # headers are built per request so that one session can be shared between threads
+        headers = dict(params.get("headers") or {})
+        kwargs = {
+            "headers": headers,
+            "timeout": params.get("timeout"),
+            "proxies": params.get("proxies"),
+        }
         if http_method == "POST" or http_method == "PUT":
-            self.session.headers.update(
-                {
-                    "Content-Type": "application/json;charset=utf-8"
-                }
-            )
-            return method_func(url=params["url"], json=params["params"])
+            headers["Content-Type"] = "application/json;charset=utf-8"
+            kwargs["data"] = self._encode_body(params.get("params"))
         else:
-            self.session.headers.update(
-                {
-                    "Content-Type": "application/x-www-form-urlencoded;charset=utf-8"
-                }
-            )
-            return method_func(url=params["url"])
+            headers["Content-Type"] = "application/x-www-form-urlencoded;charset=utf-8"
+        return self.session.request(http_method, params["url"], **kwargs)
+
+    def _encode_body(self, payload):
+        if not payload:
+            return b""
+        if isinstance(payload, (bytes, str)):
+            return payload
+        return self._json_dumps(payload)
 
     def _handle_rest_exception(self, response):
         status_code = response.status_code
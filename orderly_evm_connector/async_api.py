@@ -1,11 +1,17 @@
+import asyncio
 from json import JSONDecodeError
 import aiohttp
 from .__version__ import __version__
 from orderly_evm_connector.error import ClientError, ServerError
-from orderly_evm_connector.lib.utils import (
-    generate_signature,
-)
 from orderly_evm_connector.lib.utils import cleanNoneValue
+from orderly_evm_connector.lib.singleflight import AsyncSingleFlight
+from orderly_evm_connector.lib.cache import FRESH, STALE
+from orderly_evm_connector.lib.constants import (
+    HTTP_CONNECTION_LIMIT,
+    HTTP_CONNECTION_LIMIT_PER_HOST,
+    HTTP_KEEPALIVE_TIMEOUT,
+    HTTP_DNS_CACHE_TTL,
+)
 from .api import API  # Import the original API class
 
 class AsyncAPI(API):
@@ -19,7 +25,16 @@ class AsyncAPI(API):
         proxies=None,
         timeout=None,
         debug=False,
-        orderly_api_url=None
+        orderly_api_url=None,
+        connection_limit=HTTP_CONNECTION_LIMIT,
+        connection_limit_per_host=HTTP_CONNECTION_LIMIT_PER_HOST,
+        keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+        dns_cache_ttl=HTTP_DNS_CACHE_TTL,
+        json_backend=None,
+        rate_limiter=None,
+        singleflight=None,
+        cache=None,
+        symbol_rules=None,
     ):
         super().__init__(
             orderly_key=orderly_key,
@@ -30,14 +45,73 @@ class AsyncAPI(API):
             proxies=proxies,
             timeout=timeout,
             debug=debug,
-            orderly_api_url=orderly_api_url
+            orderly_api_url=orderly_api_url,
+            json_backend=json_backend,
+            rate_limiter=rate_limiter,
+            cache=cache,
+            symbol_rules=symbol_rules,
         )
         self.headers = {
             "Content-Type": "application/json;charset=utf-8",
             "User-Agent": "orderly-connector-python/" + __version__,
         }
+        self.connection_limit = connection_limit
+        self.connection_limit_per_host = connection_limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self._session = None
+        self._session_loop = None
+        self.singleflight = AsyncSingleFlight() if singleflight is True else singleflight
+        self._refresh_tasks = set()
+
+    async def __aenter__(self):
+        self._get_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
 
-    async def _request(self, http_method, url_path, payload=None):
+    async def aclose(self):
+        """Close the pooled aiohttp session and its connections"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
+
+    def _get_session(self):
+        loop = asyncio.get_running_loop()
+        if self._session_loop is not loop:
+            # a session can not be shared across event loops (e.g. repeated asyncio.run calls)
+            self._session = None
+        if self._session is None or self._session.closed:
+            self._session_loop = loop
+            connector = aiohttp.TCPConnector(
+                limit=self.connection_limit,
+                limit_per_host=self.connection_limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=self.dns_cache_ttl,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers={"User-Agent": self.headers["User-Agent"]},
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    def _get_proxy(self):
+        """aiohttp takes a single proxy url per request, only http(s) proxies are supported"""
+        if not self.proxies:
+            return None
+        return self.proxies.get("https") or self.proxies.get("http")
+
+    async def _throttle(self, http_method, url_path):
+        if self.rate_limiter:
+            waited = await self.rate_limiter.acquire_async(http_method, url_path)
+            if waited:
+                self.logger.debug(f"Rate limited {http_method} {url_path}, waited {waited:.3f}s")
+
+    async def _request(self, http_method, url_path, payload=None, use_cache=None):
+        path = url_path
         if payload:
             _payload = cleanNoneValue(payload)
             if _payload:
@@ -47,11 +121,50 @@ class AsyncAPI(API):
                     )
                     payload = ""
                 else:
-                    payload = _payload
+                    payload = self._json_dumps(_payload)
 
         if payload is None:
             payload = ""
         url = self.orderly_endpoint + url_path
+        if http_method == "GET" and (use_cache or (use_cache is None and self.cache_enabled)):
+            ttl = self.cache.ttl(path, default=use_cache)
+            if ttl:
+                return await self._cached_get(ttl, path, url, payload)
+        return await self._get_or_fetch(http_method, path, url, payload)
+
+    async def _get_or_fetch(self, http_method, url_path, url, payload):
+        if self.singleflight and http_method == "GET":
+            # identical unsigned GETs in flight share one call and its result
+            return await self.singleflight.do(
+                url, lambda: self._fetch(http_method, url_path, url, payload)
+            )
+        return await self._fetch(http_method, url_path, url, payload)
+
+    async def _cached_get(self, ttl, url_path, url, payload):
+        state, data = self.cache.lookup(url)
+        if state == FRESH:
+            return data
+        if state == STALE:
+            if self.cache.begin_refresh(url):
+                task = asyncio.ensure_future(self._refresh(ttl, url_path, url, payload))
+                self._refresh_tasks.add(task)
+                task.add_done_callback(self._refresh_tasks.discard)
+            return data
+        data = await self._get_or_fetch("GET", url_path, url, payload)
+        self.cache.set(url, data, ttl)
+        return data
+
+    async def _refresh(self, ttl, url_path, url, payload):
+        try:
+            self.cache.set(url, await self._get_or_fetch("GET", url_path, url, payload), ttl)
+        except Exception as e:
+            self.logger.warning(f"Failed to refresh cached response of {url}: {e}")
+            self.cache.end_refresh(url, failed=True)
+        else:
+            self.cache.end_refresh(url)
+
+    async def _fetch(self, http_method, url_path, url, payload):
+        await self._throttle(http_method, url_path)
         self.logger.debug("url: " + url)
         params = cleanNoneValue(
             {
@@ -64,6 +177,7 @@ class AsyncAPI(API):
         return await self._dispatch_request(http_method, params)
 
     async def _sign_request(self, http_method, url_path, payload=None):
+        await self._throttle(http_method, url_path)
         _payload = ""
         if payload:
             _payload = cleanNoneValue(payload)
@@ -74,32 +188,29 @@ class AsyncAPI(API):
                     )
                     _payload = ""
         params = {}
-        payload = _payload if _payload else ""
+        # the body is encoded once, the same bytes are signed and sent
+        payload = self._json_dumps(_payload) if _payload else ""
         params["url_path"] = url_path
         params["payload"] = payload
         params["http_method"] = http_method
         query_string = self._prepare_params(params)
-        try:
-            _timestamp, _signature = generate_signature(
-                self.orderly_secret, message=query_string
-            )
-        except ValueError:
+        if self.signer:
+            _timestamp, _signature = self.signer.sign(query_string)
+        else:
             _timestamp, _signature = "mock_timestamp", "mock_signature"
 
-        self.headers.update(
-            {
-                "orderly-timestamp": _timestamp,
-                "orderly-account-id": self.orderly_account_id,
-                "orderly-key": self.orderly_key,
-                "orderly-signature": _signature,
-            }
-        )
-        self.logger.debug(f"Sign Request Headers: {self.headers}")
-        return await self.send_request(http_method, url_path, payload)
+        headers = {
+            "orderly-timestamp": _timestamp,
+            "orderly-account-id": self.orderly_account_id,
+            "orderly-key": self.orderly_key,
+            "orderly-signature": _signature,
+        }
+        self.logger.debug(f"Sign Request Headers: {headers}")
+        return await self.send_request(http_method, url_path, payload, headers=headers)
 
-    async def send_request(self, http_method, url_path, payload=None):
+    async def send_request(self, http_method, url_path, payload=None, headers=None):
         if payload is None:
-            payload = {}
+            payload = ""
         url = self.orderly_endpoint + url_path
         self.logger.debug("url: " + url)
         params = cleanNoneValue(
@@ -108,38 +219,34 @@ class AsyncAPI(API):
                 "params": payload,
                 "timeout": self.timeout,
                 "proxies": self.proxies,
+                "headers": headers,
             }
         )
         return await self._dispatch_request(http_method, params)
 
     async def _dispatch_request(self, http_method, params):
-        async with aiohttp.ClientSession(headers=self.headers) as session:
-            method_func = {
-                "GET": session.get,
-                "DELETE": session.delete,
-                "PUT": session.put,
-                "POST": session.post,
-            }.get(http_method, session.get)
-
-            response = None
-            if http_method == "POST" or http_method == "PUT":
-                response = await method_func(url=params["url"], json=params["params"])
-            else:
-                session.headers.update(
-                    {
-                        "Content-Type": "application/x-www-form-urlencoded;charset=utf-8"
-                    }
-                )
-                response =  await method_func(url=params["url"])
+        session = self._get_session()
+        headers = dict(self.headers)
+        headers.update(cleanNoneValue(params.get("headers") or {}))
+        kwargs = {"headers": headers}
+        proxy = self._get_proxy()
+        if proxy:
+            kwargs["proxy"] = proxy
+        if "timeout" in params:
+            kwargs["timeout"] = aiohttp.ClientTimeout(total=params["timeout"])
+        if http_method == "POST" or http_method == "PUT":
+            kwargs["data"] = self._encode_body(params.get("params"))
+        else:
+            headers["Content-Type"] = "application/x-www-form-urlencoded;charset=utf-8"
+
+        async with session.request(http_method, params["url"], **kwargs) as response:
             self.logger.debug("raw response from server:" + await response.text())
             await self._handle_rest_exception(response)
             try:
-                data = await response.json()
+                data = self._json_loads(await response.read())
             except ValueError:
                 data = await response.text()
-            result = data
-            response.close()
-            return result
+            return data
 
     async def _handle_rest_exception(self, response):
         status_code = response.status
@@ -54,6 +54,15 @@ class ParameterArgumentError(Error):
         return self.error_message
 
 
+class OrderValidationError(Error):
+    def __init__(self, symbol, errors):
+        self.symbol = symbol
+        self.errors = errors
+
+    def __str__(self):
+        return f"{self.symbol} order rejected before sending: {'; '.join(self.errors)}"
+
+
 class WebsocketClientError(Error):
     def __init__(self, error_message):
         self.error_message = error_message
@@ -0,0 +1,153 @@
+import threading
+import time
+from collections import OrderedDict
+
+from orderly_evm_connector.lib.constants import (
+    RESPONSE_CACHE_DEFAULT_TTL,
+    RESPONSE_CACHE_MAXSIZE,
+)
+
+# Time to live, in seconds, of the public reference data cached by default.
+# Path parameters are written as {name} and match a single path segment.
+DEFAULT_CACHE_TTLS = {
+    "GET /v1/public/info": 60,
+    "GET /v1/public/info/{symbol}": 60,
+    "GET /v1/public/token": 300,
+    "GET /v1/public/config": 300,
+    "GET /v1/public/fee_futures/program": 300,
+    "GET /v1/public/index_price_source": 300,
+    "GET /v1/public/chain_info": 3600,
+}
+
+FRESH = "fresh"
+STALE = "stale"
+
+
+class ResponseCache(object):
+    """LRU cache of parsed GET responses keyed by url.
+
+    Args:
+        ttls(dict): overrides of DEFAULT_CACHE_TTLS, "GET /path": seconds, a
+                    value of None stops caching that endpoint
+        maxsize(int): responses kept, the least recently used is evicted
+        stale_while_revalidate(float): seconds an expired response is still
+                    returned while it is refreshed in the background
+        default_ttl(float): time to live of the endpoints without a ttl,
+                    when caching is requested per call with `use_cache=True`
+
+    Cached responses are shared, callers should not modify them. The same
+    instance can be shared by several clients.
+    """
+
+    def __init__(
+        self,
+        ttls=None,
+        maxsize=RESPONSE_CACHE_MAXSIZE,
+        stale_while_revalidate=0,
+        default_ttl=RESPONSE_CACHE_DEFAULT_TTL,
+        clock=time.monotonic,
+    ):
+        self.ttls = dict(DEFAULT_CACHE_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.maxsize = maxsize
+        self.stale_while_revalidate = stale_while_revalidate
+        self.default_ttl = default_ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._refreshing = set()
+        self._templates = [
+            (key.split(" ", 1)[1].strip("/").split("/"), key)
+            for key in self.ttls
+            if "{" in key
+        ]
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def ttl(self, url_path, default=False):
+        """Time to live of an url path, None if it is not cached. With
+        `default`, endpoints without a ttl get `default_ttl`."""
+        path = "/" + url_path.split("?", 1)[0].strip("/")
+        key = f"GET {path}"
+        if key in self.ttls:
+            return self.ttls[key]
+        segments = path.strip("/").split("/")
+        for template, template_key in self._templates:
+            if len(template) == len(segments) and all(
+                t.startswith("{") or t == s for t, s in zip(template, segments)
+            ):
+                return self.ttls[template_key]
+        return self.default_ttl if default else None
+
+    def lookup(self, key):
+        """(`fresh`, response), (`stale`, response) within the
+        stale-while-revalidate window, or (None, None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                response, expires = entry
+                now = self._clock()
+                if now < expires:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return FRESH, response
+                if now < expires + self.stale_while_revalidate:
+                    self._entries.move_to_end(key)
+                    self._stale_hits += 1
+                    return STALE, response
+                del self._entries[key]
+            self._misses += 1
+            return None, None
+
+    def set(self, key, response, ttl):
+        with self._lock:
+            self._entries[key] = (response, self._clock() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def begin_refresh(self, key):
+        """True if the caller should refresh `key`, False if a refresh is
+        already running"""
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            self._refreshes += 1
+            return True
+
+    def end_refresh(self, key, failed=False):
+        with self._lock:
+            self._refreshing.discard(key)
+            if failed:
+                self._refresh_errors += 1
+
+    def invalidate(self, key=None):
+        """Drop the response of `key`, every response when None"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "stale_hits": self._stale_hits,
+                "misses": self._misses,
+                "refreshes": self._refreshes,
+                "refresh_errors": self._refresh_errors,
+                "evictions": self._evictions,
+                "size": len(self._entries),
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self._hits = 0
+            self._stale_hits = 0
+            self._misses = 0
+            self._refreshes = 0
+            self._refresh_errors = 0
+            self._evictions = 0
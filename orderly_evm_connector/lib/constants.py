@@ -1,3 +1,38 @@
 WEBSOCKET_TIMEOUT_IN_SECONDS = 11
 WEBSOCKET_FAILED_MAX_RETRIES = 30
 WEBSOCKET_RETRY_SLEEP_TIME = 5
+HTTP_CONNECTION_LIMIT = 100
+HTTP_CONNECTION_LIMIT_PER_HOST = 0
+HTTP_KEEPALIVE_TIMEOUT = 15
+HTTP_DNS_CACHE_TTL = 10
+PAGINATION_MAX_PAGE_SIZE = 500
+ORDERBOOK_MAX_BUFFERED_UPDATES = 1000
+WEBSOCKET_RECONNECT_INITIAL_DELAY = 0.1
+WEBSOCKET_RECONNECT_MULTIPLIER = 2
+WEBSOCKET_RECONNECT_JITTER = 0.5
+WEBSOCKET_MESSAGE_FORMATS = ("str", "dict", "bytes")
+WEBSOCKET_STREAM_MAXSIZE = 1000
+WEBSOCKET_POOL_SHARDS = 4
+WEBSOCKET_MAX_CONCURRENT_CONNECTS = 10
+# frames read in a row before the sync reader delivers conflated messages
+WEBSOCKET_CONFLATION_MAX_FRAMES = 100
+RESPONSE_CACHE_MAXSIZE = 1024
+RESPONSE_CACHE_DEFAULT_TTL = 60
+SYMBOL_RULES_TTL = 300
+BATCH_ORDER_MAX_SIZE = 10
+BATCH_MAX_WORKERS = 4
+ORDER_STORE_MAX_BUFFERED_REPORTS = 10000
+KLINE_HISTORY_LIMIT = 1000
+# seconds of the kline resolutions with a fixed length
+KLINE_RESOLUTION_SECONDS = {
+    "1m": 60,
+    "5m": 300,
+    "15m": 900,
+    "30m": 1800,
+    "1h": 3600,
+    "4h": 14400,
+    "12h": 43200,
+    "1d": 86400,
+    "1w": 604800,
+}
+CANDLE_BUFFER_SIZE = 1000
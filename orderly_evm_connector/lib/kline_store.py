@@ -0,0 +1,267 @@
+import json
+import os
+import threading
+import time
+from typing import NamedTuple
+
+from orderly_evm_connector.error import ParameterValueError
+from orderly_evm_connector.lib.constants import KLINE_HISTORY_LIMIT, KLINE_RESOLUTION_SECONDS
+from orderly_evm_connector.lib.rate_limiter import RateLimiter
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# one file per column, little endian so the files can be copied between hosts
+COLUMNS = (
+    ("time", "<i8"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("volume", "<f8"),
+    ("amount", "<f8"),
+)
+_HISTORY_KEYS = {"time": "t", "open": "o", "high": "h", "low": "l", "close": "c", "volume": "v", "amount": "a"}
+
+
+class Klines(NamedTuple):
+    """Columns of a kline series, `time` is the open time in milliseconds"""
+
+    time: "numpy.ndarray"
+    open: "numpy.ndarray"
+    high: "numpy.ndarray"
+    low: "numpy.ndarray"
+    close: "numpy.ndarray"
+    volume: "numpy.ndarray"
+    amount: "numpy.ndarray"
+
+
+def _empty():
+    return Klines(*(numpy.empty(0, dtype=dtype) for _, dtype in COLUMNS))
+
+
+def klines_from_history(response):
+    """`Klines` of a `get_kline_history` response (`t` in seconds)"""
+    data = response.get("data", response) if isinstance(response, dict) else {}
+    times = data.get("t") or ()
+    columns = [numpy.asarray(times, dtype="<i8") * 1000]
+    for name, dtype in COLUMNS[1:]:
+        values = data.get(_HISTORY_KEYS[name])
+        columns.append(numpy.asarray(values if values is not None else [0] * len(times), dtype=dtype))
+    return Klines(*columns)
+
+
+def klines_from_rows(response):
+    """`Klines` of a `get_kline` response, ordered by time"""
+    rows = response.get("data", {}).get("rows") or () if isinstance(response, dict) else response
+    rows = sorted(rows, key=lambda row: row["start_timestamp"])
+    columns = [numpy.array([row["start_timestamp"] for row in rows], dtype="<i8")]
+    for name, dtype in COLUMNS[1:]:
+        columns.append(numpy.array([float(row.get(name) or 0) for row in rows], dtype=dtype))
+    return Klines(*columns)
+
+
+def _subtract(start, end, ranges):
+    """Parts of [start, end) not covered by the sorted `ranges`"""
+    missing = []
+    for covered_start, covered_end in ranges:
+        if covered_end <= start:
+            continue
+        if covered_start >= end:
+            break
+        if covered_start > start:
+            missing.append((start, covered_start))
+        start = max(start, covered_end)
+    if start < end:
+        missing.append((start, end))
+    return missing
+
+
+def _union(ranges):
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+class KlineStore(object):
+    """Local kline history, one series per symbol and resolution.
+
+    A series is a directory `<path>/<resolution>/<symbol>` holding one raw
+    little endian file per column (`time.i8`, `open.f8`, ...) ordered by
+    time, and a `ranges.json` of the time ranges already fetched. Reads
+    memory-map the column files and return `Klines` of numpy arrays.
+
+    `backfill` fetches only the closed bars of the ranges not fetched yet,
+    with `get_kline` when they are among the latest 1000 bars and with
+    `get_kline_history` (1000 bars per request) otherwise, paced by the
+    client's rate limiter or, without one, by the published limits.
+    Newer bars are appended to the files, older ones rewrite them.
+    Requires numpy (`pip install orderly-evm-connector[numpy]`).
+    """
+
+    def __init__(self, path, client=None, clock=time.time):
+        if numpy is None:
+            raise ImportError("KlineStore requires numpy: pip install orderly-evm-connector[numpy]")
+        self.path = path
+        self.client = client
+        self._clock = clock
+        self._maps = {}
+        self._lock = threading.Lock()
+        self.requests = 0
+        # a client with a rate limiter already waits in `_sign_request`
+        self._pacer = RateLimiter() if client is not None and not client.rate_limiter else None
+
+    def _directory(self, symbol, resolution):
+        return os.path.join(self.path, resolution, symbol)
+
+    @staticmethod
+    def _step(resolution):
+        step = KLINE_RESOLUTION_SECONDS.get(resolution)
+        if step is None:
+            raise ParameterValueError([resolution])
+        return step * 1000
+
+    def symbols(self, resolution: str):
+        directory = os.path.join(self.path, resolution)
+        return sorted(os.listdir(directory)) if os.path.isdir(directory) else []
+
+    def ranges(self, symbol: str, resolution: str):
+        """Fetched [start, end) ranges of a series, in milliseconds"""
+        try:
+            with open(os.path.join(self._directory(symbol, resolution), "ranges.json")) as f:
+                return [tuple(r) for r in json.load(f)]
+        except FileNotFoundError:
+            return []
+
+    def read(self, symbol: str, resolution: str, start: int = None, end: int = None):
+        """`Klines` of the bars opened in [start, end), in milliseconds. The
+        arrays are read-only maps of the files."""
+        key = (symbol, resolution)
+        klines = self._maps.get(key)
+        if klines is None:
+            klines = self._maps[key] = self._map(symbol, resolution)
+        if start is None and end is None:
+            return klines
+        first = 0 if start is None else numpy.searchsorted(klines.time, start, "left")
+        last = len(klines.time) if end is None else numpy.searchsorted(klines.time, end, "left")
+        return Klines(*(column[first:last] for column in klines))
+
+    def read_all(self, resolution: str, symbols=None, start: int = None, end: int = None):
+        """{symbol: `Klines`} of every stored symbol, or of `symbols`"""
+        return {symbol: self.read(symbol, resolution, start, end) for symbol in symbols or self.symbols(resolution)}
+
+    def _map(self, symbol, resolution):
+        directory = self._directory(symbol, resolution)
+        paths = [os.path.join(directory, f"{name}.{dtype[1:]}") for name, dtype in COLUMNS]
+        if not all(os.path.exists(path) for path in paths):
+            return _empty()
+        # a write interrupted between two columns leaves them uneven
+        count = min(os.path.getsize(path) // 8 for path in paths)
+        if not count:
+            return _empty()
+        return Klines(
+            *(numpy.memmap(path, dtype=dtype, mode="r", shape=(count,)) for path, (_, dtype) in zip(paths, COLUMNS))
+        )
+
+    def write(self, symbol: str, resolution: str, klines, start: int = None, end: int = None):
+        """Store `klines`, replacing stored bars of the same time, and record
+        [start, end) as fetched"""
+        directory = self._directory(symbol, resolution)
+        with self._lock:
+            os.makedirs(directory, exist_ok=True)
+            stored = self._map(symbol, resolution)
+            self._maps.pop((symbol, resolution), None)
+            if len(klines.time):
+                if not len(stored.time) or klines.time[0] > stored.time[-1]:
+                    self._append(directory, klines, len(stored.time))
+                else:
+                    self._rewrite(directory, stored, klines)
+            if start is not None and end is not None and start < end:
+                ranges = _union(list(self.ranges(symbol, resolution)) + [(start, end)])
+                path = os.path.join(directory, "ranges.json")
+                with open(path + ".tmp", "w") as f:
+                    json.dump(ranges, f)
+                os.replace(path + ".tmp", path)
+
+    def _append(self, directory, klines, count):
+        for column, (name, dtype) in zip(klines, COLUMNS):
+            with open(os.path.join(directory, f"{name}.{dtype[1:]}"), "r+b" if count else "wb") as f:
+                # drop the tail of a column longer than the others
+                f.truncate(count * 8)
+                f.seek(count * 8)
+                f.write(numpy.ascontiguousarray(column, dtype=dtype).tobytes())
+
+    def _rewrite(self, directory, stored, klines):
+        times = numpy.concatenate([klines.time, stored.time])
+        # first occurrence of each time wins, the new bars come first
+        times, index = numpy.unique(times, return_index=True)
+        for new, old, (name, dtype) in zip(klines, stored, COLUMNS):
+            path = os.path.join(directory, f"{name}.{dtype[1:]}")
+            column = numpy.concatenate([numpy.asarray(new, dtype=dtype), numpy.asarray(old)])[index]
+            with open(path + ".tmp", "wb") as f:
+                f.write(column.astype(dtype).tobytes())
+            os.replace(path + ".tmp", path)
+
+    def missing(self, symbol: str, resolution: str, start: int, end: int = None):
+        """Ranges of closed bars in [start, end) not fetched yet"""
+        step = self._step(resolution)
+        now = int(self._clock() * 1000) // step * step
+        start = int(start) // step * step
+        end = now if end is None else min(-(-int(end) // step) * step, now)
+        return _subtract(start, end, self.ranges(symbol, resolution))
+
+    def _requests(self, symbol, resolution, start, end=None):
+        """(method, kwargs, start, end) of the requests filling the missing ranges"""
+        step = self._step(resolution)
+        now = int(self._clock() * 1000) // step * step
+        requests = []
+        for range_start, range_end in self.missing(symbol, resolution, start, end):
+            if range_end == now and (now - range_start) // step < KLINE_HISTORY_LIMIT:
+                # the latest bars, plus the one still open
+                limit = (now - range_start) // step + 1
+                requests.append(("get_kline", {"symbol": symbol, "type": resolution, "limit": limit}, range_start, range_end))
+                continue
+            for page_start in range(range_start, range_end, KLINE_HISTORY_LIMIT * step):
+                page_end = min(page_start + KLINE_HISTORY_LIMIT * step, range_end)
+                kwargs = {
+                    "symbol": symbol,
+                    "resolution": resolution,
+                    "from_timestamp": page_start // 1000,
+                    "to_timestamp": (page_end - step) // 1000,
+                    "limit": KLINE_HISTORY_LIMIT,
+                }
+                requests.append(("get_kline_history", kwargs, page_start, page_end))
+        return requests
+
+    def _store(self, symbol, resolution, method, response, start, end):
+        klines = klines_from_rows(response) if method == "get_kline" else klines_from_history(response)
+        keep = (klines.time >= start) & (klines.time < end)
+        self.write(symbol, resolution, Klines(*(column[keep] for column in klines)), start, end)
+        self.requests += 1
+        return int(keep.sum())
+
+    def backfill(self, symbol: str, resolution: str, start: int, end: int = None):
+        """Fetch the missing closed bars of [start, end), milliseconds, end
+        defaulting to now. Returns the number of bars stored."""
+        count = 0
+        for method, kwargs, page_start, page_end in self._requests(symbol, resolution, start, end):
+            if self._pacer is not None:
+                self._pacer.acquire("GET", "/v1/kline" if method == "get_kline" else "/v1/tv/kline_history")
+            response = getattr(self.client, method)(**kwargs)
+            count += self._store(symbol, resolution, method, response, page_start, page_end)
+        return count
+
+    async def backfill_async(self, symbol: str, resolution: str, start: int, end: int = None):
+        count = 0
+        for method, kwargs, page_start, page_end in self._requests(symbol, resolution, start, end):
+            if self._pacer is not None:
+                await self._pacer.acquire_async("GET", "/v1/kline" if method == "get_kline" else "/v1/tv/kline_history")
+            response = await getattr(self.client, method)(**kwargs)
+            count += self._store(symbol, resolution, method, response, page_start, page_end)
+        return count
@@ -0,0 +1,383 @@
+import asyncio
+import threading
+import time
+
+# Published limits of the REST endpoints, "METHOD /path": (requests, seconds).
+# Path parameters are written as {name} and match a single path segment.
+DEFAULT_RATE_LIMITS = {
+    # account
+    "GET /v1/public/account": (10, 1),
+    "GET /v1/get_account": (10, 1),
+    "GET /v1/get_broker": (10, 1),
+    "POST /v1/register_account": (10, 1),
+    "GET /v1/get_orderly_key": (10, 1),
+    "POST /v1/orderly_key": (10, 1),
+    "POST /v1/client/remove_orderly_key": (10, 1),
+    "POST /v1/client/leverage": (5, 60),
+    "GET /v1/client/holding": (10, 1),
+    "GET /v1/client/info": (10, 60),
+    "POST /v1/client/maintenance_config": (10, 60),
+    "GET /v1/client/statistics/daily": (10, 60),
+    "GET /v1/volume/user/daily": (10, 60),
+    "GET /v1/volume/user/stats": (10, 60),
+    "GET /v1/client/key_info": (10, 60),
+    "GET /v1/client/orderly_key_ip_restriction": (10, 60),
+    "POST /v1/client/set_orderly_key_ip_restriction": (10, 60),
+    "POST /v1/client/reset_orderly_key_ip_restriction": (10, 60),
+    "GET /v1/get_all_accounts": (10, 1),
+    "GET /v1/client/leverage": (1, 1),
+    "POST /v1/client/add_sub_account": (10, 1),
+    "GET /v1/client/sub_account": (10, 1),
+    "POST /v1/client/update_sub_account": (10, 1),
+    "GET /v1/client/aggregate/holding": (1, 60),
+    "GET /v1/client/aggregate/positions": (1, 60),
+    # broker
+    "GET /v1/public/broker/name": (10, 1),
+    "GET /v1/broker/user_info": (10, 60),
+    "GET /v1/volume/broker/daily": (10, 60),
+    "GET /v1/public/balance/stats": (10, 1),
+    "GET /v1/public/broker/stats": (10, 1),
+    "GET /v1/broker/leaderboard/daily": (10, 60),
+    # campaign
+    "GET /v1/public/points/epoch_dates": (10, 1),
+    "GET /v1/client/points": (10, 1),
+    "GET /v1/public/points/leaderboard": (10, 1),
+    "GET /v1/public/campaign/user": (10, 1),
+    "GET /v1/public/campaign/check": (10, 1),
+    "GET /v1/public/campaign/ranking": (10, 1),
+    "GET /v1/public/campaign/stats": (10, 1),
+    "GET /v1/public/campaign/stats/details": (10, 60),
+    "GET /v1/public/campaigns": (10, 1),
+    "POST /v1/client/campaign/sign_up": (10, 1),
+    # delegate_signer
+    "POST /v1/delegate_signer": (1, 1),
+    "POST /v1/delegate_orderly_key": (1, 1),
+    "POST /v1/delegate_withdraw_request": (1, 1),
+    "POST /v1/delegate_settle_pnl": (1, 1),
+    # general
+    "GET /v1/public/system_info": (10, 1),
+    "GET /v1/public/info/{symbol}": (10, 1),
+    "GET /v1/public/token": (10, 1),
+    "GET /v1/public/info": (10, 1),
+    "GET /v1/public/fee_futures/program": (10, 1),
+    "GET /v1/public/config": (10, 1),
+    "GET /v1/client/statistics": (10, 60),
+    "GET /v1/public/futures_market": (10, 60),
+    "GET /v1/public/announcement": (10, 1),
+    "GET /v1/public/index_price_source": (10, 1),
+    "GET /v1/public/leverage": (10, 1),
+    "GET /v1/ip_info": (10, 1),
+    # liquidation
+    "GET /v1/public/liquidation": (10, 1),
+    "GET /v1/public/liquidated_positions": (10, 1),
+    "GET /v1/public/insurancefund": (10, 1),
+    "GET /v1/client/liquidator_liquidations": (10, 1),
+    "GET /v1/liquidations": (10, 1),
+    "POST /v1/liquidation": (5, 1),
+    "POST /v1/claim_insurance_fund": (5, 1),
+    # market
+    "GET /v1/public/market_trades": (10, 1),
+    "GET /v1/public/volume/stats": (10, 1),
+    "GET /v1/public/funding_rates": (10, 1),
+    "GET /v1/public/funding_rate/{symbol}": (10, 1),
+    "GET /v1/public/funding_rate_history": (10, 1),
+    "GET /v1/public/futures": (10, 1),
+    "GET /v1/public/futures/{symbol}": (10, 1),
+    "GET /v1/tv/config": (10, 1),
+    "GET /v1/tv/history": (10, 1),
+    "GET /v1/tv/symbol_info": (10, 1),
+    "GET /v1/orderbook/{symbol}": (10, 1),
+    "GET /v1/kline": (10, 1),
+    "GET /v1/public/market_info/funding_history": (10, 1),
+    "GET /v1/public/market_info/history_charts": (10, 1),
+    "GET /v1/public/market_info/price_changes": (10, 1),
+    "GET /v1/public/market_info/traders_open_interests": (10, 1),
+    "GET /v1/tv/kline_history": (5, 10),
+    # notifications
+    "GET /v1/notification/inbox/notifications": (10, 60),
+    "GET /v1/notification/inbox/unread": (10, 60),
+    "POST /v1/notification/inbox/mark_read": (10, 60),
+    "POST /v1/notification/inbox/mark_read_all": (10, 60),
+    # referral
+    "POST /v1/referral/create": (1, 1),
+    "POST /v1/referral/update": (1, 1),
+    "POST /v1/referral/bind": (1, 1),
+    "GET /v1/referral/admin_info": (10, 1),
+    "GET /v1/referral/info": (10, 1),
+    "GET /v1/referral/referral_history": (10, 1),
+    "GET /v1/referral/rebate_summary": (10, 1),
+    "GET /v1/referral/referee_history": (10, 1),
+    "GET /v1/referral/referee_info": (10, 1),
+    "GET /v1/client/distribution_history": (1, 1),
+    "GET /v1/public/referral/check_ref_code": (10, 1),
+    "GET /v1/public/referral/verify_ref_code": (10, 1),
+    "POST /v1/referral/edit_split": (10, 1),
+    "GET /v1/referral/auto_referral/info": (1, 1),
+    "GET /v1/referral/auto_referral/progress": (1, 1),
+    "POST /v1/referral/auto_referral/update": (1, 1),
+    "POST /v1/referral/edit_referral_code": (10, 1),
+    "GET /v1/referral/referee_rebate_summary": (10, 1),
+    # rewards
+    "GET /v1/public/trading_rewards/epoch_info": (10, 1),
+    "GET /v1/public/trading_rewards/epoch_data": (10, 1),
+    "GET /v1/public/trading_rewards/broker_allocation_history": (10, 1),
+    "GET /v1/public/trading_rewards/wallet_rewards_history": (10, 1),
+    "GET /v1/public/trading_rewards/account_rewards_history": (10, 1),
+    "GET /v1/public/trading_rewards/current_epoch_estimate": (10, 1),
+    "GET /v1/public/trading_rewards/current_epoch_broker_estimate": (10, 1),
+    "GET /v1/public/market_making_rewards/epoch_info": (10, 1),
+    "GET /v1/public/market_making_rewards/group_rewards_history": (10, 1),
+    "GET /v1/public/market_making_rewards/current_epoch_estimate": (10, 1),
+    "GET /v1/staking/balance": (10, 1),
+    "GET /v1/staking/unstake_details": (10, 1),
+    "GET /v1/staking/overview": (10, 1),
+    "GET /v1/staking/valor/batch_info": (10, 1),
+    "GET /v1/staking/valor/pool_info": (10, 1),
+    "GET /v1/staking/valor/redeem": (10, 1),
+    "GET /v1/staking/valor2/pool_info": (10, 1),
+    "GET /v1/staking/valor2/batch_info": (10, 1),
+    "GET /v1/staking/valor2/redeem": (10, 1),
+    "GET /v1/staking/valor2/revenue_buyback": (10, 1),
+    "GET /v1/public/market_making_rewards/leaderboard": (10, 1),
+    "GET /v1/public/market_making_rewards/status": (10, 1),
+    "GET /v1/public/market_making_rewards/symbol_params": (10, 1),
+    "GET /v1/public/trading_rewards/status": (10, 1),
+    "GET /v1/public/trading_rewards/symbol_category": (10, 1),
+    "GET /v1/staking/esorder/vesting_list": (10, 1),
+    # settlement
+    "GET /v1/settle_nonce": (10, 1),
+    "POST /v1/settle_pnl": (1, 1),
+    "GET /v1/pnl_settlement/history": (20, 1),
+    "POST /v1/sub_account_settle_pnl": (10, 1),
+    # strategy_vault
+    "POST /v1/sv/sp_orderly_key": (10, 1),
+    "POST /v1/sv/sp_settle_pnl": (1, 1),
+    "POST /v1/sv/manual_period_delivery": (1, 1),
+    "GET /v1/sv/venue_transfer_history": (10, 1),
+    "GET /v1/sv/venue_withdrawal_history": (10, 1),
+    "GET /v1/sv/protocol_revenue_share_history": (10, 1),
+    "GET /v1/sv/liquidation_fees_share_history": (10, 1),
+    "GET /v1/sv/internal_transfer_history": (10, 1),
+    "GET /v1/public/strategy_vault/vault/info": (10, 1),
+    "GET /v1/public/strategy_vault/vault/overall_info": (10, 1),
+    "GET /v1/public/strategy_vault/user/overall_info": (10, 1),
+    "GET /v1/public/strategy_vault/vault/performance": (10, 1),
+    "GET /v1/public/strategy_vault/vault/performance_chart": (10, 1),
+    "GET /v1/public/strategy_vault/vault/positions": (10, 1),
+    "GET /v1/public/strategy_vault/vault/open_orders": (10, 1),
+    "GET /v1/public/strategy_vault/vault/trade_history": (10, 1),
+    "GET /v1/public/strategy_vault/vault/liquidator_history": (10, 1),
+    "GET /v1/public/strategy_vault/lp/info": (10, 1),
+    "GET /v1/public/strategy_vault/lp/performance": (10, 1),
+    "GET /v1/public/strategy_vault/lp/performance_chart": (10, 1),
+    "GET /v1/public/strategy_vault/lp/transaction_history": (10, 1),
+    "GET /v1/public/strategy_vault/lp/claim_info": (10, 1),
+    "GET /v1/public/strategy_vault/lp/fees_history": (10, 1),
+    "GET /v1/public/strategy_vault/sp/info": (10, 1),
+    "GET /v1/public/strategy_vault/sp/transaction_history": (10, 1),
+    "GET /v1/public/strategy_vault/vault/order_history": (10, 1),
+    "GET /v1/public/strategy_vault/sp/claim_info": (10, 1),
+    "GET /v1/public/strategy_vault/sp/fees_history": (10, 1),
+    "GET /v1/public/strategy_vault/fund/info": (10, 1),
+    "GET /v1/public/strategy_vault/fund/period_info": (10, 1),
+    "GET /v1/public/strategy_vault/fund/pending_transactions": (10, 1),
+    # system
+    "GET /v1/public/vault_balance": (10, 1),
+    "GET /v1/public/chain_info": (10, 1),
+    # trade
+    "POST /v1/order": (10, 1),
+    "POST /v1/algo/order": (10, 1),
+    "POST /v1/batch-order": (1, 1),
+    "PUT /v1/algo/order": (10, 1),
+    "PUT /v1/order": (10, 1),
+    "DELETE /v1/algo/order": (10, 1),
+    "DELETE /v1/algo/orders": (5, 1),
+    "DELETE /v1/order": (10, 1),
+    "DELETE /v1/algo/client/order": (10, 1),
+    "DELETE /v1/client/order": (10, 1),
+    "DELETE /v1/orders": (10, 1),
+    "DELETE /v1/batch-order": (10, 1),
+    "DELETE /v1/client/batch-order": (10, 1),
+    "GET /v1/algo/order/{order_id}": (10, 1),
+    "GET /v1/order/{order_id}": (10, 1),
+    "GET /v1/algo/client/order/{client_order_id}": (10, 1),
+    "GET /v1/client/order/{client_order_id}": (10, 1),
+    "GET /v1/algo/orders": (10, 1),
+    "GET /v1/orders": (10, 1),
+    "GET /v1/order/{order_id}/trades": (10, 1),
+    "GET /v1/trades": (10, 1),
+    "GET /v1/trade/{trade_id}": (10, 1),
+    "GET /v1/positions": (30, 10),
+    "GET /v1/position/{symbol}": (30, 10),
+    "GET /v1/funding_fee/history": (20, 60),
+    "GET /v1/algo/order/{order_id}/trades": (10, 1),
+    "POST /v1/order/cancel_all_after": (1, 1),
+    # wallet
+    "GET /v1/asset/history": (10, 60),
+    "GET /v1/withdraw_nonce": (10, 1),
+    "POST /v1/withdraw_request": (10, 1),
+    "GET /v1/internal_transfer_history": (10, 1),
+    "GET /v1/transfer_nonce": (10, 1),
+    "POST /v2/internal_transfer": (10, 1),
+}
+
+
+class TokenBucket(object):
+    """Allows `capacity` requests per `period` seconds.
+
+    Tokens are reserved up front and the balance may go negative, the caller
+    then waits for the returned delay. This keeps the bucket usable from both
+    threads and coroutines without holding a lock while waiting.
+    """
+
+    def __init__(self, capacity, period, clock=time.monotonic):
+        self.capacity = capacity
+        self.period = period
+        self.rate = capacity / period
+        self._clock = clock
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens=1):
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+class RateLimiter(object):
+    """Client side rate limiter keyed by endpoint
+
+    Args:
+        limits(dict): overrides of DEFAULT_RATE_LIMITS, "METHOD /path": (requests, seconds),
+                      a value of None disables limiting for that endpoint
+        default_limit(tuple): (requests, seconds) for endpoints without a published limit,
+                              default: not limited
+
+    The same instance can be shared by several clients that draw on the same quota.
+    """
+
+    _CACHE_SIZE = 4096
+
+    def __init__(self, limits=None, default_limit=None, clock=time.monotonic):
+        self.limits = dict(DEFAULT_RATE_LIMITS)
+        if limits:
+            self.limits.update(limits)
+        self.default_limit = default_limit
+        self._clock = clock
+        self._buckets = {}
+        self._stats = {}
+        self._templates = {}
+        self._resolved = {}
+        self._lock = threading.Lock()
+        for key in self.limits:
+            self._add_template(key)
+
+    def _add_template(self, key):
+        method, path = key.split(" ", 1)
+        if "{" not in path:
+            return
+        segments = tuple(
+            None if s.startswith("{") else s for s in path.strip("/").split("/")
+        )
+        self._templates.setdefault((method, len(segments)), []).append((segments, key))
+
+    def set_limit(self, key, requests, seconds):
+        """Override the limit of one endpoint, e.g. set_limit("POST /v1/order", 20, 1)"""
+        with self._lock:
+            if key not in self.limits:
+                self._add_template(key)
+            self.limits[key] = (requests, seconds) if requests else None
+            self._buckets.pop(key, None)
+            self._resolved.clear()
+
+    def resolve(self, http_method, url_path):
+        """Return the endpoint key an url path is counted against"""
+        path = url_path.split("?", 1)[0]
+        if not path.startswith("/"):
+            path = "/" + path
+        key = f"{http_method} {path}"
+        resolved = self._resolved.get(key)
+        if resolved is not None:
+            return resolved
+        resolved = key
+        if key not in self.limits:
+            segments = path.strip("/").split("/")
+            for template, template_key in self._templates.get(
+                (http_method, len(segments)), ()
+            ):
+                if all(t is None or t == s for t, s in zip(template, segments)):
+                    resolved = template_key
+                    break
+        if len(self._resolved) >= self._CACHE_SIZE:
+            self._resolved.clear()
+        self._resolved[key] = resolved
+        return resolved
+
+    def _get_bucket(self, key):
+        bucket = self._buckets.get(key)
+        if bucket is not None:
+            return bucket
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                limit = self.limits.get(key, self.default_limit)
+                if not limit:
+                    return None
+                bucket = TokenBucket(limit[0], limit[1], clock=self._clock)
+                self._buckets[key] = bucket
+        return bucket
+
+    def reserve(self, http_method, url_path, tokens=1):
+        """Reserve tokens and return (endpoint key, seconds to wait)"""
+        key = self.resolve(http_method, url_path)
+        bucket = self._get_bucket(key)
+        delay = bucket.reserve(tokens) if bucket else 0.0
+        self._record(key, delay)
+        return key, delay
+
+    def acquire(self, http_method, url_path, tokens=1):
+        """Block until the request may be sent, return the seconds waited"""
+        _, delay = self.reserve(http_method, url_path, tokens)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self, http_method, url_path, tokens=1):
+        """Wait until the request may be sent, return the seconds waited"""
+        _, delay = self.reserve(http_method, url_path, tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def _record(self, key, delay):
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = {
+                    "requests": 0,
+                    "throttled": 0,
+                    "throttled_seconds": 0.0,
+                    "max_wait": 0.0,
+                }
+            stats["requests"] += 1
+            if delay > 0:
+                stats["throttled"] += 1
+                stats["throttled_seconds"] += delay
+                stats["max_wait"] = max(stats["max_wait"], delay)
+
+    def stats(self):
+        """Per endpoint counters: requests, throttled, throttled_seconds, max_wait"""
+        with self._lock:
+            return {key: dict(value) for key, value in self._stats.items()}
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats.clear()
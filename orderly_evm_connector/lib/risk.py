@@ -0,0 +1,287 @@
+from typing import NamedTuple
+
+from orderly_evm_connector.error import ParameterValueError
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class RiskResult(NamedTuple):
+    """Arrays of one `PortfolioRisk.compute()`.
+
+    Per account, in the order of `accounts`: collateral, total_notional,
+    unrealized_pnl, initial_margin, maintenance_margin, margin_ratio and
+    mm_buffer. Per position, in the order of `account_ids`/`symbols`:
+    notional, unrealized_pnl_by_position, imr, mmr and liquidation_price.
+    Per symbol, in the order of `symbol_names`: net exposure, the signed
+    notional summed over every account.
+    """
+
+    accounts: list
+    collateral: "numpy.ndarray"
+    total_notional: "numpy.ndarray"
+    unrealized_pnl: "numpy.ndarray"
+    initial_margin: "numpy.ndarray"
+    maintenance_margin: "numpy.ndarray"
+    margin_ratio: "numpy.ndarray"
+    mm_buffer: "numpy.ndarray"
+    account_ids: "numpy.ndarray"
+    symbols: "numpy.ndarray"
+    notional: "numpy.ndarray"
+    unrealized_pnl_by_position: "numpy.ndarray"
+    imr: "numpy.ndarray"
+    mmr: "numpy.ndarray"
+    liquidation_price: "numpy.ndarray"
+    symbol_names: list
+    exposure: "numpy.ndarray"
+
+
+def _rows(response):
+    if isinstance(response, dict):
+        data = response.get("data", response)
+        return data.get("rows", []) if isinstance(data, dict) else data
+    return response
+
+
+class PortfolioRisk(object):
+    """Margin and liquidation prices of many accounts, computed on columnar
+    NumPy arrays.
+
+    Positions are loaded once (`load_positions`) into arrays of quantity,
+    cost, leverage and account/symbol indexes. With the symbol parameters of
+    `get_available_symbols` (`base_imr`, `base_mmr`, `imr_factor`) the margin
+    rates follow the Orderly formulas:
+
+        IMR = max(1 / leverage, base_imr, imr_factor * notional ** 0.8)
+        MMR = max(base_mmr, base_mmr / base_imr * imr_factor * notional ** 0.8)
+
+    and, per account, with collateral = `collateral` + unrealized PnL:
+
+        margin_ratio = collateral / total_notional
+        mm_buffer = collateral - sum(notional * MMR)
+        liquidation_price = max(mark_price + mm_buffer / (|qty| * MMR - qty), 0)
+
+    `update_mark_prices` recomputes only the positions of the symbols whose
+    price changed and adjusts the account totals by the difference.
+    Requires numpy (`pip install orderly-evm-connector[numpy]`).
+    """
+
+    def __init__(self, symbols=None):
+        if numpy is None:
+            raise ImportError(
+                "PortfolioRisk requires numpy: pip install orderly-evm-connector[numpy]"
+            )
+        self.symbol_names = []
+        self._symbol_index = {}
+        self._base_imr = numpy.zeros(0)
+        self._base_mmr = numpy.zeros(0)
+        self._imr_factor = numpy.zeros(0)
+        self._marks = numpy.zeros(0)
+        self.accounts = []
+        self._account_index = {}
+        self._collateral = numpy.zeros(0)
+        self._total_notional = numpy.zeros(0)
+        self._total_upnl = numpy.zeros(0)
+        self._total_im = numpy.zeros(0)
+        self._total_mm = numpy.zeros(0)
+        self.load_positions([])
+        if symbols is not None:
+            self.load_symbols(symbols)
+
+    def load_symbols(self, symbols):
+        """Load `base_imr`, `base_mmr` and `imr_factor` from a
+        `get_available_symbols` response or its rows"""
+        for row in _rows(symbols):
+            index = self._symbol(row["symbol"])
+            self._base_imr[index] = float(row["base_imr"])
+            self._base_mmr[index] = float(row["base_mmr"])
+            self._imr_factor[index] = float(row.get("imr_factor") or 0)
+        self.recompute()
+
+    def _symbol(self, symbol):
+        index = self._symbol_index.get(symbol)
+        if index is None:
+            index = self._symbol_index[symbol] = len(self.symbol_names)
+            self.symbol_names.append(symbol)
+            self._base_imr = numpy.append(self._base_imr, numpy.nan)
+            self._base_mmr = numpy.append(self._base_mmr, numpy.nan)
+            self._imr_factor = numpy.append(self._imr_factor, 0.0)
+            self._marks = numpy.append(self._marks, numpy.nan)
+        return index
+
+    def _account(self, account_id):
+        index = self._account_index.get(account_id)
+        if index is None:
+            index = self._account_index[account_id] = len(self.accounts)
+            self.accounts.append(account_id)
+            self._collateral = numpy.append(self._collateral, 0.0)
+            # an account without positions until the next load
+            self._total_notional = numpy.append(self._total_notional, 0.0)
+            self._total_upnl = numpy.append(self._total_upnl, 0.0)
+            self._total_im = numpy.append(self._total_im, 0.0)
+            self._total_mm = numpy.append(self._total_mm, 0.0)
+        return index
+
+    def set_collateral(self, collateral: dict):
+        """Collateral of each account, {account_id: value}, e.g. the USDC
+        holding plus the unsettled PnL"""
+        for account_id, value in collateral.items():
+            index = self._account(account_id)
+            self._collateral[index] = float(value)
+
+    def load_positions(self, positions, account_id=None, collateral: dict = None):
+        """Replace the positions with the rows of `get_aggregate_positions`
+        or `get_all_positions_info` (or a list of them). Rows without an
+        `account_id` belong to `account_id`. A row `leverage`, e.g. from
+        `get_leverage_setting`, caps the IMR; the mark price of a row is used
+        until `update_mark_prices` gives a newer one. Raises
+        `ParameterValueError`, and changes nothing, when a symbol has no
+        parameters loaded."""
+        rows = [row for row in _rows(positions) if float(row.get("position_qty") or 0)]
+        missing = set()
+        for row in rows:
+            index = self._symbol_index.get(row["symbol"])
+            if index is None or numpy.isnan(self._base_imr[index]):
+                missing.add(row["symbol"])
+        if missing:
+            raise ParameterValueError(sorted(missing))
+        if collateral:
+            self.set_collateral(collateral)
+        count = len(rows)
+        self._account_ids = numpy.empty(count, dtype=numpy.int64)
+        self._symbols = numpy.empty(count, dtype=numpy.int64)
+        self._qty = numpy.empty(count)
+        self._cost = numpy.empty(count)
+        self._leverage = numpy.full(count, numpy.inf)
+        for i, row in enumerate(rows):
+            self._account_ids[i] = self._account(row.get("account_id", account_id))
+            symbol = self._symbol(row["symbol"])
+            self._symbols[i] = symbol
+            self._qty[i] = float(row["position_qty"])
+            self._cost[i] = float(row.get("cost_position") or 0)
+            if row.get("leverage"):
+                self._leverage[i] = float(row["leverage"])
+            if row.get("mark_price") is not None and numpy.isnan(self._marks[symbol]):
+                self._marks[symbol] = float(row["mark_price"])
+        # positions of each symbol, for the mark price updates
+        order = numpy.argsort(self._symbols, kind="stable")
+        bounds = numpy.searchsorted(self._symbols[order], numpy.arange(len(self.symbol_names) + 1))
+        self._rows_by_symbol = [order[bounds[s] : bounds[s + 1]] for s in range(len(self.symbol_names))]
+        self.recompute()
+
+    def set_leverage(self, symbol: str, leverage, account_id=None):
+        """Leverage of `symbol` for `account_id`, or every account when None.
+        `leverage` is a number or a `get_leverage_setting` response"""
+        if isinstance(leverage, dict):
+            leverage = (leverage.get("data") or leverage)["leverage"]
+        mask = self._symbols == self._symbol_index[symbol]
+        if account_id is not None:
+            mask &= self._account_ids == self._account_index[account_id]
+        self._leverage[mask] = float(leverage)
+        self.recompute()
+
+    def _terms(self, rows=None):
+        """notional, unrealized PnL, IMR and MMR of the positions `rows`"""
+        select = slice(None) if rows is None else rows
+        symbols = self._symbols[select]
+        qty = self._qty[select]
+        mark = self._marks[symbols]
+        notional = numpy.abs(qty) * mark
+        base_imr, base_mmr = self._base_imr[symbols], self._base_mmr[symbols]
+        factor = self._imr_factor[symbols] * notional ** 0.8
+        imr = numpy.maximum(numpy.maximum(1 / self._leverage[select], base_imr), factor)
+        mmr = numpy.maximum(base_mmr, base_mmr / base_imr * factor)
+        return notional, qty * mark - self._cost[select], imr, mmr
+
+    def recompute(self):
+        """Recompute every position and account total"""
+        missing = numpy.isnan(self._base_imr[self._symbols])
+        if missing.any():
+            raise ParameterValueError(
+                sorted({self.symbol_names[s] for s in self._symbols[missing]})
+            )
+        self._notional, self._upnl, self._imr, self._mmr = self._terms()
+        n = len(self.accounts)
+        self._total_notional = numpy.bincount(self._account_ids, self._notional, n)
+        self._total_upnl = numpy.bincount(self._account_ids, self._upnl, n)
+        self._total_im = numpy.bincount(self._account_ids, self._notional * self._imr, n)
+        self._total_mm = numpy.bincount(self._account_ids, self._notional * self._mmr, n)
+
+    def update_mark_prices(self, prices):
+        """Apply new mark prices, {symbol: price} or the `markprices` rows
+        `[{"symbol", "price"}]`. Unknown symbols are ignored."""
+        if isinstance(prices, dict):
+            prices = [{"symbol": s, "price": p} for s, p in prices.items()]
+        rows = []
+        for row in prices:
+            index = self._symbol_index.get(row["symbol"])
+            if index is None:
+                continue
+            price = float(row["price"])
+            if self._marks[index] != price:
+                self._marks[index] = price
+                if index < len(self._rows_by_symbol):
+                    rows.append(self._rows_by_symbol[index])
+        if not rows:
+            return
+        rows = numpy.concatenate(rows)
+        notional, upnl, imr, mmr = self._terms(rows)
+        accounts = self._account_ids[rows]
+        numpy.add.at(self._total_notional, accounts, notional - self._notional[rows])
+        numpy.add.at(self._total_upnl, accounts, upnl - self._upnl[rows])
+        numpy.add.at(self._total_im, accounts, notional * imr - self._notional[rows] * self._imr[rows])
+        numpy.add.at(self._total_mm, accounts, notional * mmr - self._notional[rows] * self._mmr[rows])
+        self._notional[rows], self._upnl[rows], self._imr[rows], self._mmr[rows] = notional, upnl, imr, mmr
+
+    def compute(self):
+        """`RiskResult` of the current positions and mark prices"""
+        n = len(self.accounts)
+        collateral = self._collateral[:n] + self._total_upnl
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            margin_ratio = numpy.where(
+                self._total_notional > 0, collateral / self._total_notional, numpy.inf
+            )
+            mm_buffer = collateral - self._total_mm
+            denominator = numpy.abs(self._qty) * self._mmr - self._qty
+            liquidation_price = numpy.maximum(
+                self._marks[self._symbols] + mm_buffer[self._account_ids] / denominator, 0
+            )
+        exposure = numpy.bincount(
+            self._symbols, self._qty * self._marks[self._symbols], len(self.symbol_names)
+        )
+        return RiskResult(
+            list(self.accounts),
+            collateral,
+            self._total_notional.copy(),
+            self._total_upnl.copy(),
+            self._total_im.copy(),
+            self._total_mm.copy(),
+            margin_ratio,
+            mm_buffer,
+            numpy.array(self.accounts, dtype=object)[self._account_ids],
+            numpy.array(self.symbol_names, dtype=object)[self._symbols],
+            self._notional.copy(),
+            self._upnl.copy(),
+            self._imr.copy(),
+            self._mmr.copy(),
+            liquidation_price,
+            list(self.symbol_names),
+            exposure,
+        )
+
+    def account(self, account_id):
+        """Totals of one account as a dict"""
+        result = self.compute()
+        i = self._account_index[account_id]
+        return {
+            "account_id": account_id,
+            "collateral": float(result.collateral[i]),
+            "total_notional": float(result.total_notional[i]),
+            "unrealized_pnl": float(result.unrealized_pnl[i]),
+            "initial_margin": float(result.initial_margin[i]),
+            "maintenance_margin": float(result.maintenance_margin[i]),
+            "margin_ratio": float(result.margin_ratio[i]),
+            "mm_buffer": float(result.mm_buffer[i]),
+        }
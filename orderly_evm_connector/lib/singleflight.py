@@ -0,0 +1,91 @@
+import asyncio
+import threading
+
+
+class _Call(object):
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """Runs one call per key at a time: callers arriving while a call of the
+    same key is in flight wait for it and get its result (or exception)
+    instead of making their own.
+
+    The result is shared, callers should not modify it. Thread-safe.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._executed = 0
+        self._shared = 0
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self._executed += 1
+                leader = True
+            else:
+                self._shared += 1
+                leader = False
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    def stats(self):
+        """Calls made, and calls served by a call already in flight"""
+        with self._lock:
+            return {"executed": self._executed, "shared": self._shared}
+
+
+class AsyncSingleFlight(object):
+    """`SingleFlight` for coroutines: `await do(key, coroutine_function)`.
+
+    The call runs in its own task, cancelling one waiting caller does not
+    cancel it for the others.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._executed = 0
+        self._shared = 0
+
+    async def do(self, key, fn):
+        key = (id(asyncio.get_running_loop()), key)
+        task = self._calls.get(key)
+        if task is None:
+            task = self._calls[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda done: self._done(key, done))
+            self._executed += 1
+        else:
+            self._shared += 1
+        return await asyncio.shield(task)
+
+    def _done(self, key, task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # retrieved, in case every caller was cancelled
+            task.exception()
+
+    def stats(self):
+        return {"executed": self._executed, "shared": self._shared}
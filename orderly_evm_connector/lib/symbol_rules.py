@@ -0,0 +1,293 @@
+import asyncio
+import inspect
+import math
+import threading
+import time
+
+from orderly_evm_connector.error import OrderValidationError, ParameterValueError
+from orderly_evm_connector.lib.constants import SYMBOL_RULES_TTL
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# tolerance of the float tick arithmetic, in ticks
+_EPSILON = 1e-9
+
+
+def _decimals(tick):
+    text = repr(float(tick))
+    if "e-" in text:
+        return int(text.split("e-")[1])
+    return len(text.split(".")[1].rstrip("0")) if "." in text else 0
+
+
+def round_to_tick(value, tick, decimals, rounding="nearest", offset=0.0):
+    """Round `value` to a multiple of `tick` above `offset`, `down`, `up` or
+    to the `nearest`"""
+    steps = (value - offset) / tick
+    if rounding == "down":
+        steps = math.floor(steps + _EPSILON)
+    elif rounding == "up":
+        steps = math.ceil(steps - _EPSILON)
+    else:
+        steps = math.floor(steps + 0.5)
+    return round(offset + steps * tick, decimals)
+
+
+def _round_array(values, tick, decimals, rounding, offset=0.0):
+    steps = (numpy.asarray(values, dtype=float) - offset) / tick
+    if rounding == "down":
+        steps = numpy.floor(steps + _EPSILON)
+    elif rounding == "up":
+        steps = numpy.ceil(steps - _EPSILON)
+    else:
+        steps = numpy.floor(steps + 0.5)
+    return numpy.round(offset + steps * tick, decimals)
+
+
+class SymbolRules(object):
+    """Order rules of one symbol, from the `rows` of `get_available_symbols`
+    or the `data` of `get_exchange_info`"""
+
+    __slots__ = (
+        "symbol",
+        "quote_tick",
+        "quote_min",
+        "quote_max",
+        "base_tick",
+        "base_min",
+        "base_max",
+        "min_notional",
+        "price_decimals",
+        "quantity_decimals",
+    )
+
+    def __init__(
+        self,
+        symbol,
+        quote_tick,
+        base_tick,
+        quote_min=0,
+        quote_max=None,
+        base_min=0,
+        base_max=None,
+        min_notional=0,
+    ):
+        self.symbol = symbol
+        self.quote_tick = float(quote_tick)
+        self.base_tick = float(base_tick)
+        self.quote_min = float(quote_min or 0)
+        self.quote_max = float(quote_max) if quote_max else math.inf
+        self.base_min = float(base_min or 0)
+        self.base_max = float(base_max) if base_max else math.inf
+        self.min_notional = float(min_notional or 0)
+        self.price_decimals = max(_decimals(self.quote_tick), _decimals(self.quote_min))
+        self.quantity_decimals = max(_decimals(self.base_tick), _decimals(self.base_min))
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(
+            row["symbol"],
+            row["quote_tick"],
+            row["base_tick"],
+            quote_min=row.get("quote_min"),
+            quote_max=row.get("quote_max"),
+            base_min=row.get("base_min"),
+            base_max=row.get("base_max"),
+            min_notional=row.get("min_notional"),
+        )
+
+    @staticmethod
+    def price_rounding(side):
+        # away from the book: bids down, asks up
+        return {"BUY": "down", "SELL": "up"}.get(side, "nearest")
+
+    def round_price(self, price, side=None):
+        # the price filter is (price - quote_min) % quote_tick == 0
+        return round_to_tick(
+            float(price), self.quote_tick, self.price_decimals, self.price_rounding(side), self.quote_min
+        )
+
+    def round_quantity(self, quantity):
+        # quantities are cut, an order never grows
+        return round_to_tick(
+            float(quantity), self.base_tick, self.quantity_decimals, "down", self.base_min
+        )
+
+    def validate(self, price=None, quantity=None):
+        """Rule violations of an order, an empty list if there is none"""
+        errors = []
+        if price is not None:
+            price = float(price)
+            if not self.quote_min <= price <= self.quote_max:
+                errors.append(f"price {price} out of [{self.quote_min}, {self.quote_max}]")
+            if price != self.round_price(price):
+                errors.append(f"price {price} is not a multiple of {self.quote_tick}")
+        if quantity is not None:
+            quantity = float(quantity)
+            if not self.base_min <= quantity <= self.base_max:
+                errors.append(f"quantity {quantity} out of [{self.base_min}, {self.base_max}]")
+            elif quantity != self.round_quantity(quantity):
+                errors.append(f"quantity {quantity} is not a multiple of {self.base_tick}")
+        if price is not None and quantity is not None and price * quantity < self.min_notional:
+            errors.append(f"notional {price * quantity} below {self.min_notional}")
+        return errors
+
+
+class SymbolRulesIndex(object):
+    """Order rules of every symbol, checked before orders are signed.
+
+    With `mode="validate"`, orders breaking the tick size, min/max or min
+    notional rules raise `OrderValidationError`; with `mode="round"`, price
+    and quantity are first rounded to the ticks (bids down, asks up,
+    quantities down) and only the remaining violations raise.
+
+    The rules are loaded from `client.get_available_symbols()` and reloaded
+    once older than `ttl` seconds. With an async client the first order
+    awaits the first load (`load_async`), later reloads run in the
+    background. Unknown symbols are fetched with `get_exchange_info` by a
+    sync client.
+    """
+
+    MODES = ("validate", "round")
+
+    def __init__(self, client=None, ttl: float = SYMBOL_RULES_TTL, mode: str = "validate", clock=time.monotonic):
+        if mode not in self.MODES:
+            raise ParameterValueError([mode])
+        self.client = client
+        self.ttl = ttl
+        self.mode = mode
+        self._clock = clock
+        self._rules = {}
+        self._loaded_at = None
+        self._refresh_task = None
+        self._lock = threading.Lock()
+        self._async = client is not None and inspect.iscoroutinefunction(client._request)
+
+    def load(self, response):
+        """Load the rules from a `get_available_symbols` response, or a list
+        of its rows"""
+        rows = response
+        if isinstance(response, dict):
+            data = response.get("data", response)
+            rows = data.get("rows", [data]) if isinstance(data, dict) else data
+        rules = {row["symbol"]: SymbolRules.from_row(row) for row in rows}
+        with self._lock:
+            self._rules = rules
+            self._loaded_at = self._clock()
+
+    def refresh(self):
+        self.load(self.client.get_available_symbols())
+
+    async def refresh_async(self):
+        self.load(await self.client.get_available_symbols())
+
+    def needs_load_async(self):
+        """True for an async client whose rules were never loaded"""
+        return self._async and self._loaded_at is None
+
+    async def load_async(self):
+        """Load the rules unless they are loaded, sharing a load in flight"""
+        if self._loaded_at is not None:
+            return
+        task = self._refresh_task
+        if task is None or task.done():
+            task = self._refresh_task = asyncio.ensure_future(self.refresh_async())
+        await asyncio.shield(task)
+
+    def is_stale(self):
+        return self._loaded_at is None or self._clock() - self._loaded_at >= self.ttl
+
+    def get(self, symbol: str):
+        """`SymbolRules` of `symbol`, raises `OrderValidationError` if unknown"""
+        if self.client is not None and self.is_stale():
+            if self._async:
+                self._schedule_refresh()
+            else:
+                self.refresh()
+        rules = self._rules.get(symbol)
+        if rules is None and self.client is not None and not self._async:
+            data = self.client.get_exchange_info(symbol).get("data")
+            if data:
+                rules = self._rules[symbol] = SymbolRules.from_row(data)
+        if rules is None:
+            raise OrderValidationError(symbol, ["unknown symbol"])
+        return rules
+
+    def _schedule_refresh(self):
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        try:
+            self._refresh_task = asyncio.get_running_loop().create_task(self.refresh_async())
+        except RuntimeError:
+            pass
+
+    def round_prices(self, symbol: str, prices, side: str = None):
+        """Round many prices of `symbol` at once, with numpy when installed"""
+        rules = self.get(symbol)
+        rounding = rules.price_rounding(side)
+        if numpy is not None:
+            return _round_array(
+                prices, rules.quote_tick, rules.price_decimals, rounding, rules.quote_min
+            ).tolist()
+        return [
+            round_to_tick(float(p), rules.quote_tick, rules.price_decimals, rounding, rules.quote_min)
+            for p in prices
+        ]
+
+    def round_quantities(self, symbol: str, quantities):
+        """Round many quantities of `symbol` down at once, with numpy when
+        installed"""
+        rules = self.get(symbol)
+        if numpy is not None:
+            return _round_array(
+                quantities, rules.base_tick, rules.quantity_decimals, "down", rules.base_min
+            ).tolist()
+        return [
+            round_to_tick(float(q), rules.base_tick, rules.quantity_decimals, "down", rules.base_min)
+            for q in quantities
+        ]
+
+    def prepare_order(self, order: dict):
+        """Checked (and in `round` mode rounded) copy of an order payload"""
+        rules = self.get(order["symbol"])
+        order = dict(order)
+        price = order.get("order_price")
+        quantity = order.get("order_quantity")
+        if self.mode == "round":
+            if price is not None:
+                price = order["order_price"] = rules.round_price(price, order.get("side"))
+            if quantity is not None:
+                quantity = order["order_quantity"] = rules.round_quantity(quantity)
+        errors = rules.validate(price, quantity)
+        if errors:
+            raise OrderValidationError(rules.symbol, errors)
+        return order
+
+    def prepare_orders(self, orders: list):
+        """`prepare_order` for a batch, prices and quantities of a symbol and
+        side are rounded together"""
+        if self.mode != "round":
+            return [self.prepare_order(order) for order in orders]
+        orders = [dict(order) for order in orders]
+        groups = {}
+        for order in orders:
+            groups.setdefault((order["symbol"], order.get("side")), []).append(order)
+        for (symbol, side), group in groups.items():
+            for field, round_values in (
+                ("order_price", lambda values: self.round_prices(symbol, values, side)),
+                ("order_quantity", lambda values: self.round_quantities(symbol, values)),
+            ):
+                priced = [order for order in group if order.get(field) is not None]
+                if priced:
+                    for order, value in zip(priced, round_values([o[field] for o in priced])):
+                        order[field] = value
+        for order in orders:
+            errors = self.get(order["symbol"]).validate(
+                order.get("order_price"), order.get("order_quantity")
+            )
+            if errors:
+                raise OrderValidationError(order["symbol"], errors)
+        return orders
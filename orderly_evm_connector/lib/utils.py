@@ -1,9 +1,11 @@
 import json
 import logging
 import os
+import re
 import time
 import uuid
 from configparser import ConfigParser
+from functools import lru_cache
 from urllib.parse import urlparse
 
 import base58
@@ -18,6 +20,11 @@ from orderly_evm_connector.error import (
     ParameterTypeError,
 )
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 initialized = False
 disable_validation = os.environ.get("DISABLE_VALIDATION", False)
 test_url = os.environ.get("ORDERLY_TEST_URL", False)
@@ -60,9 +67,15 @@ def check_required_parameters(params):
             check_required_parameter(p[0], p[1])
 
 
+@lru_cache(maxsize=None)
+def get_enum_values(enum_class):
+    """Values of an enum, computed once per enum"""
+    return frozenset(item.value for item in enum_class)
+
+
 def check_enum_parameter(value, enum_class):
     if not disable_validation:
-        if value not in set(item.value for item in enum_class):
+        if value not in get_enum_values(enum_class):
             raise ParameterValueError([value])
 
 
@@ -71,6 +84,26 @@ def check_type_parameter(value, name, data_type):
         raise ParameterTypeError([name, data_type])
 
 
+def _stdlib_json_dumps(obj) -> bytes:
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def get_json_backend(name=None):
+    """Return a (dumps, loads) pair, dumps always returns bytes
+    name: "json" for the standard library, "orjson" for orjson,
+          None picks orjson when it is installed and falls back to json
+    """
+    if name is None:
+        name = "orjson" if orjson is not None else "json"
+    if name == "orjson":
+        if orjson is None:
+            raise ParameterValueError(["orjson (not installed)"])
+        return orjson.dumps, orjson.loads
+    if name == "json":
+        return _stdlib_json_dumps, json.loads
+    raise ParameterValueError([name])
+
+
 def get_timestamp():
     return int(time.time() * 1000)
 
@@ -107,22 +140,50 @@ def parse_proxies(proxies: dict):
     }
 
 
+class OrderlySigner(object):
+    """Ed25519 request signer holding a decoded orderly secret.
+
+    Decoding the `ed25519:` secret and building the private key is done once,
+    so each call to `sign` only costs a timestamp and a signature.
+    """
+
+    def __init__(self, orderly_secret):
+        if not orderly_secret:
+            raise ValueError("Please configure orderly secret in the configuration file config.ini")
+        _parts = orderly_secret.split(":")
+        if len(_parts) != 2:
+            raise ValueError("orderly secret has to be in the format ed25519:<base58 secret>")
+        self._private_key = Ed25519PrivateKey.from_private_bytes(
+            base58.b58decode(_parts[1])[0:32]
+        )
+
+    def sign(self, message=None, timestamp=None):
+        _timestamp = timestamp if timestamp is not None else get_timestamp()
+        if message and isinstance(message, dict):
+            message["timestamp"] = _timestamp
+        else:
+            message = f"{_timestamp}{message or ''}"
+        _signature = base64.b64encode(
+            self._private_key.sign(bytes(message, "utf-8"))
+        ).decode("utf-8")
+        return str(_timestamp), _signature
+
+
+@lru_cache(maxsize=32)
+def get_signer(orderly_secret):
+    """Return a cached OrderlySigner for the given secret.
+
+    The cache keeps the last 32 secrets for the life of the process; call
+    `get_signer.cache_clear()` to drop them, e.g. after rotating a key. The
+    clients hold their own signer and are not affected.
+    """
+    return OrderlySigner(orderly_secret)
+
+
 def generate_signature(orderly_secret, message=None):
     if not orderly_secret:
         raise ValueError("Please configure orderly secret in the configuration file config.ini")
-    _orderly_secret = orderly_secret.split(":")[1]
-    _orderly_private_key = Ed25519PrivateKey.from_private_bytes(
-        base58.b58decode(_orderly_secret)[0:32]
-    )
-    _timestamp = get_timestamp()
-    if message and isinstance(message, dict):
-        message["timestamp"] = _timestamp
-    else:
-        message = f"{_timestamp}{message or ''}" 
-    _signature = base64.b64encode(
-        _orderly_private_key.sign(bytes(message, "utf-8"))
-    ).decode("utf-8")
-    return str(_timestamp), _signature
+    return get_signer(orderly_secret).sign(message)
 
 
 def generate_wallet_signature(wallet_secret, message=None):
@@ -150,7 +211,7 @@ def get_endpoints(orderly_testnet):
             orderly_websocket_private_endpoint,
         )
     else:
-        orderly_endpoint = "https://api.orderly.org/"
+        orderly_endpoint = "https://api.orderly.org"
         orderly_websocket_public_endpoint = "wss://ws-evm.orderly.org/ws/stream"
         orderly_websocket_private_endpoint = (
             "wss://ws-private-evm.orderly.org/v2/ws/private/stream"
@@ -172,6 +233,35 @@ def decode_ws_error_code(data):
         return ""
 
 
+def may_be_ws_ping(data) -> bool:
+    """Cheap check of an undecoded text frame for the server `ping` event,
+    the frame still has to be decoded to confirm it"""
+    if isinstance(data, str):
+        return '"ping"' in data[:40]
+    return b'"ping"' in data[:40]
+
+
+def may_be_ws_ack(data) -> bool:
+    """Cheap check of an undecoded text frame for the server acknowledgement
+    of an `auth` or `subscribe` event"""
+    if isinstance(data, str):
+        return '"success"' in data
+    return b'"success"' in data
+
+
+_WS_TOPIC = re.compile(rb'"topic"\s*:\s*"([^"]*)"')
+_WS_TOPIC_STR = re.compile(r'"topic"\s*:\s*"([^"]*)"')
+
+
+def get_ws_topic(data):
+    """Topic of an undecoded text frame, None if it has none"""
+    if isinstance(data, str):
+        match = _WS_TOPIC_STR.search(data)
+        return match.group(1) if match else None
+    match = _WS_TOPIC.search(data)
+    return match.group(1).decode() if match else None
+
+
 def get_account_info(path: str):
     config = ConfigParser()
     config.read(path)
@@ -276,6 +276,37 @@ class Rest(API):
     from orderly_evm_connector.rest._delegate_signer import delegate_withdraw_request
     from orderly_evm_connector.rest._delegate_signer import delegate_request_pnl_settlement
 
+    # batch
+    from orderly_evm_connector.rest._batch import batch_create_orders
+    from orderly_evm_connector.rest._batch import batch_cancel_orders_chunked
+    from orderly_evm_connector.rest._batch import (
+        batch_cancel_orders_by_client_order_id_chunked,
+    )
+
+    # pagination
+    from orderly_evm_connector.rest._pagination import paginate
+    from orderly_evm_connector.rest._pagination import iter_orders
+    from orderly_evm_connector.rest._pagination import iter_algo_orders
+    from orderly_evm_connector.rest._pagination import iter_trades
+    from orderly_evm_connector.rest._pagination import iter_asset_history
+    from orderly_evm_connector.rest._pagination import iter_internal_transfer_history
+    from orderly_evm_connector.rest._pagination import iter_pnl_settlement_history
+    from orderly_evm_connector.rest._pagination import iter_account_strategy_vault_transaction_history
+    from orderly_evm_connector.rest._pagination import iter_venue_transfer_history
+    from orderly_evm_connector.rest._pagination import iter_venue_withdrawal_history
+    from orderly_evm_connector.rest._pagination import iter_protocol_revenue_share_history
+    from orderly_evm_connector.rest._pagination import iter_liquidation_fees_share_history
+    from orderly_evm_connector.rest._pagination import iter_sv_internal_transfer_history
+    from orderly_evm_connector.rest._pagination import iter_sv_vault_order_history
+    from orderly_evm_connector.rest._pagination import iter_sv_vault_open_orders
+    from orderly_evm_connector.rest._pagination import iter_sv_vault_trade_history
+    from orderly_evm_connector.rest._pagination import iter_sv_vault_liquidator_history
+    from orderly_evm_connector.rest._pagination import iter_sv_lp_transaction_history
+    from orderly_evm_connector.rest._pagination import iter_sv_lp_fees_history
+    from orderly_evm_connector.rest._pagination import iter_sv_sp_transaction_history
+    from orderly_evm_connector.rest._pagination import iter_sv_sp_fees_history
+    from orderly_evm_connector.rest._pagination import iter_sv_fund_period_info
+
 class RestAsync(AsyncAPI):
     def __init__(
         self,
@@ -302,6 +333,7 @@ class RestAsync(AsyncAPI):
     from orderly_evm_connector.rest._strategy_vault import get_protocol_revenue_share_history
     from orderly_evm_connector.rest._strategy_vault import get_liquidation_fees_share_history
     from orderly_evm_connector.rest._strategy_vault import get_sv_internal_transfer_history
+    from orderly_evm_connector.rest._strategy_vault import get_sv_vault_order_history
     # Public Strategy Vault APIs
     from orderly_evm_connector.rest._strategy_vault import get_sv_vault_info
     from orderly_evm_connector.rest._strategy_vault import get_sv_vault_overall_info
@@ -524,3 +556,76 @@ class RestAsync(AsyncAPI):
     from orderly_evm_connector.rest._delegate_signer import delegate_withdraw_request
     from orderly_evm_connector.rest._delegate_signer import delegate_request_pnl_settlement
 
+    # batch
+    from orderly_evm_connector.rest._batch import (
+        batch_create_orders_async as batch_create_orders,
+    )
+    from orderly_evm_connector.rest._batch import (
+        batch_cancel_orders_chunked_async as batch_cancel_orders_chunked,
+    )
+    from orderly_evm_connector.rest._batch import (
+        batch_cancel_orders_by_client_order_id_chunked_async as batch_cancel_orders_by_client_order_id_chunked,
+    )
+
+    # pagination
+    from orderly_evm_connector.rest._pagination import paginate_async as paginate
+    from orderly_evm_connector.rest._pagination import iter_orders_async as iter_orders
+    from orderly_evm_connector.rest._pagination import (
+        iter_algo_orders_async as iter_algo_orders,
+    )
+    from orderly_evm_connector.rest._pagination import iter_trades_async as iter_trades
+    from orderly_evm_connector.rest._pagination import (
+        iter_asset_history_async as iter_asset_history,
+    )
+    from orderly_evm_connector.rest._pagination import (
+        iter_internal_transfer_history_async as iter_internal_transfer_history,
+    )
+    from orderly_evm_connector.rest._pagination import (
+        iter_pnl_settlement_history_async as iter_pnl_settlement_history,
+    )
+    from orderly_evm_connector.rest._pagination import (
+        iter_account_strategy_vault_transaction_history_async as iter_account_strategy_vault_transaction_history,
+    )
+    from orderly_evm_connector.rest._pagination import (
+        iter_venue_transfer_history_async as iter_venue_transfer_history,
+    )
+    from orderly_evm_connector.rest._pagination import (
+        iter_venue_withdrawal_history_async as iter_venue_withdrawal_history,
+    )
+    from orderly_evm_connector.rest._pagination import (
+        iter_protocol_revenue_share_history_async as iter_protocol_revenue_share_history,
+    )
+    from orderly_evm_connector.rest._pagination import (
+        iter_liquidation_fees_share_history_async as iter_liquidation_fees_share_history,
+    )
+    from orderly_evm_connector.rest._pagination import (
+        iter_sv_internal_transfer_history_async as iter_sv_internal_transfer_history,
+    )
+    from orderly_evm_connector.rest._pagination import (
+        iter_sv_vault_order_history_async as iter_sv_vault_order_history,
+    )
+    from orderly_evm_connector.rest._pagination import (
+        iter_sv_vault_open_orders_async as iter_sv_vault_open_orders,
+    )
+    from orderly_evm_connector.rest._pagination import (
+        iter_sv_vault_trade_history_async as iter_sv_vault_trade_history,
+    )
+    from orderly_evm_connector.rest._pagination import (
+        iter_sv_vault_liquidator_history_async as iter_sv_vault_liquidator_history,
+    )
+    from orderly_evm_connector.rest._pagination import (
+        iter_sv_lp_transaction_history_async as iter_sv_lp_transaction_history,
+    )
+    from orderly_evm_connector.rest._pagination import (
+        iter_sv_lp_fees_history_async as iter_sv_lp_fees_history,
+    )
+    from orderly_evm_connector.rest._pagination import (
+        iter_sv_sp_transaction_history_async as iter_sv_sp_transaction_history,
+    )
+    from orderly_evm_connector.rest._pagination import (
+        iter_sv_sp_fees_history_async as iter_sv_sp_fees_history,
+    )
+    from orderly_evm_connector.rest._pagination import (
+        iter_sv_fund_period_info_async as iter_sv_fund_period_info,
+    )
+
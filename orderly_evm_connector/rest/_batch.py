@@ -0,0 +1,250 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from orderly_evm_connector.error import ParameterValueError
+from orderly_evm_connector.lib.constants import BATCH_MAX_WORKERS, BATCH_ORDER_MAX_SIZE
+from orderly_evm_connector.lib.rate_limiter import RateLimiter
+
+_pacer_lock = threading.Lock()
+
+
+def _chunks(items, chunk_size):
+    if not 0 < chunk_size <= BATCH_ORDER_MAX_SIZE:
+        raise ParameterValueError([chunk_size])
+    return [items[i : i + chunk_size] for i in range(0, len(items), chunk_size)]
+
+
+def _ids(ids):
+    if isinstance(ids, str):
+        return [i.strip() for i in ids.split(",") if i.strip()]
+    return [str(i) for i in ids]
+
+
+def _result(item, data=None, error=None):
+    return {"input": item, "success": error is None, "data": data, "error": error}
+
+
+def _create_results(orders, response, error):
+    """One result per order, rows are matched to the orders by position"""
+    if error is None and isinstance(response, dict) and response.get("success") is False:
+        error = response
+    if error is not None:
+        return [_result(order, error=error) for order in orders]
+    data = (response or {}).get("data") if isinstance(response, dict) else None
+    rows = (data or {}).get("rows") or []
+    results = []
+    for i, order in enumerate(orders):
+        if i >= len(rows):
+            results.append(_result(order, error="no result returned for this order"))
+            continue
+        message = rows[i].get("error_message")
+        if message and message.lower() != "none":
+            results.append(_result(order, rows[i], message))
+        else:
+            results.append(_result(order, rows[i]))
+    return results
+
+
+def _cancel_results(ids, response, error):
+    """The batch cancel endpoints answer once per chunk, every id of the chunk
+    gets that answer"""
+    if error is None and isinstance(response, dict) and response.get("success") is False:
+        error = response
+    if error is not None:
+        return [_result(i, error=error) for i in ids]
+    data = response.get("data") if isinstance(response, dict) else response
+    return [_result(i, data) for i in ids]
+
+
+def _pacer(self):
+    # a client with a rate limiter already waits in `_sign_request`, the
+    # others pace every batch call with one limiter kept on the client
+    if self.rate_limiter:
+        return None
+    pacer = getattr(self, "_batch_pacer", None)
+    if pacer is None:
+        with _pacer_lock:
+            pacer = getattr(self, "_batch_pacer", None)
+            if pacer is None:
+                pacer = self._batch_pacer = RateLimiter()
+    return pacer
+
+
+def _dispatch(self, chunks, send, http_method, url_path, max_workers):
+    pacer = _pacer(self)
+
+    def run(chunk):
+        if pacer is not None:
+            pacer.acquire(http_method, url_path)
+        try:
+            return send(chunk), None
+        except Exception as e:
+            return None, e
+
+    with ThreadPoolExecutor(max(min(max_workers, len(chunks)), 1)) as pool:
+        return list(pool.map(run, chunks))
+
+
+async def _dispatch_async(self, chunks, send, http_method, url_path, max_workers):
+    pacer = _pacer(self)
+    semaphore = asyncio.Semaphore(max(max_workers, 1))
+
+    async def run(chunk):
+        async with semaphore:
+            if pacer is not None:
+                await pacer.acquire_async(http_method, url_path)
+            try:
+                return await send(chunk), None
+            except Exception as e:
+                return None, e
+
+    return await asyncio.gather(*(run(chunk) for chunk in chunks))
+
+
+def _merge(chunks, outcomes, to_results):
+    results = []
+    for chunk, (response, error) in zip(chunks, outcomes):
+        results.extend(to_results(chunk, response, error))
+    return results
+
+
+def batch_create_orders(
+    self,
+    orders: list,
+    chunk_size: int = BATCH_ORDER_MAX_SIZE,
+    max_workers: int = BATCH_MAX_WORKERS,
+):
+    """[Private] Create any number of orders with `batch_create_order`
+
+    The orders are split into chunks of at most 10, sent from a pool of
+    `max_workers` threads and paced within the limit of POST /v1/batch-order
+    (by the client's rate limiter when it has one).
+
+    Args:
+        orders(list): orders, as for `batch_create_order`
+    Optional Args:
+        chunk_size(int): orders per request, 1 to 10 (default: 10)
+        max_workers(int): requests in flight at once (default: 4)
+
+    Returns a list with one result per order, in the order of `orders`:
+    {"input": order, "success": bool, "data": row of the response, "error": exception or message}
+    """
+    chunks = _chunks(list(orders), chunk_size)
+    outcomes = _dispatch(
+        self, chunks, self.batch_create_order, "POST", "/v1/batch-order", max_workers
+    )
+    return _merge(chunks, outcomes, _create_results)
+
+
+def batch_cancel_orders_chunked(
+    self,
+    order_ids,
+    chunk_size: int = BATCH_ORDER_MAX_SIZE,
+    max_workers: int = BATCH_MAX_WORKERS,
+):
+    """[Private] Cancel any number of orders with `batch_cancel_orders`
+
+    Args:
+        order_ids(list or string): order ids, a list or comma-separated
+    Optional Args:
+        chunk_size(int): order ids per request, 1 to 10 (default: 10)
+        max_workers(int): requests in flight at once (default: 4)
+
+    Returns a list with one result per order id, see `batch_create_orders`
+    """
+    chunks = _chunks(_ids(order_ids), chunk_size)
+    outcomes = _dispatch(
+        self,
+        chunks,
+        lambda chunk: self.batch_cancel_orders(",".join(chunk)),
+        "DELETE",
+        "/v1/batch-order",
+        max_workers,
+    )
+    return _merge(chunks, outcomes, _cancel_results)
+
+
+def batch_cancel_orders_by_client_order_id_chunked(
+    self,
+    client_order_ids,
+    chunk_size: int = BATCH_ORDER_MAX_SIZE,
+    max_workers: int = BATCH_MAX_WORKERS,
+):
+    """[Private] Cancel any number of orders with
+    `batch_cancel_orders_by_client_order_id`
+
+    Args:
+        client_order_ids(list or string): client order ids, a list or comma-separated
+    Optional Args:
+        chunk_size(int): client order ids per request, 1 to 10 (default: 10)
+        max_workers(int): requests in flight at once (default: 4)
+
+    Returns a list with one result per client order id, see `batch_create_orders`
+    """
+    chunks = _chunks(_ids(client_order_ids), chunk_size)
+    outcomes = _dispatch(
+        self,
+        chunks,
+        lambda chunk: self.batch_cancel_orders_by_client_order_id(",".join(chunk)),
+        "DELETE",
+        "/v1/client/batch-order",
+        max_workers,
+    )
+    return _merge(chunks, outcomes, _cancel_results)
+
+
+async def batch_create_orders_async(
+    self,
+    orders: list,
+    chunk_size: int = BATCH_ORDER_MAX_SIZE,
+    max_workers: int = BATCH_MAX_WORKERS,
+):
+    """[Private] Create any number of orders with `batch_create_order`, see
+    `batch_create_orders`. Up to `max_workers` requests are awaited at once."""
+    chunks = _chunks(list(orders), chunk_size)
+    outcomes = await _dispatch_async(
+        self, chunks, self.batch_create_order, "POST", "/v1/batch-order", max_workers
+    )
+    return _merge(chunks, outcomes, _create_results)
+
+
+async def batch_cancel_orders_chunked_async(
+    self,
+    order_ids,
+    chunk_size: int = BATCH_ORDER_MAX_SIZE,
+    max_workers: int = BATCH_MAX_WORKERS,
+):
+    """[Private] Cancel any number of orders with `batch_cancel_orders`, see
+    `batch_cancel_orders_chunked`"""
+    chunks = _chunks(_ids(order_ids), chunk_size)
+    outcomes = await _dispatch_async(
+        self,
+        chunks,
+        lambda chunk: self.batch_cancel_orders(",".join(chunk)),
+        "DELETE",
+        "/v1/batch-order",
+        max_workers,
+    )
+    return _merge(chunks, outcomes, _cancel_results)
+
+
+async def batch_cancel_orders_by_client_order_id_chunked_async(
+    self,
+    client_order_ids,
+    chunk_size: int = BATCH_ORDER_MAX_SIZE,
+    max_workers: int = BATCH_MAX_WORKERS,
+):
+    """[Private] Cancel any number of orders with
+    `batch_cancel_orders_by_client_order_id`, see
+    `batch_cancel_orders_by_client_order_id_chunked`"""
+    chunks = _chunks(_ids(client_order_ids), chunk_size)
+    outcomes = await _dispatch_async(
+        self,
+        chunks,
+        lambda chunk: self.batch_cancel_orders_by_client_order_id(",".join(chunk)),
+        "DELETE",
+        "/v1/client/batch-order",
+        max_workers,
+    )
+    return _merge(chunks, outcomes, _cancel_results)
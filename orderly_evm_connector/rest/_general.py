@@ -65,7 +65,7 @@ def get_faucet_usdc(self, broker_id: str, user_address: str, chain_id: str):
     return result
 
 
-def get_exchange_info(self, symbol: str):
+def get_exchange_info(self, symbol: str, use_cache: bool = None):
     """[Public] Exchange information
 
     Limit: 10 requests per 1 second per IP address
@@ -96,14 +96,16 @@ def get_exchange_info(self, symbol: str):
 
     Args:
         symbol(string)
+    Optional Args:
+        use_cache(bool): cache the response, see `ResponseCache`
 
     https://orderly.network/docs/build-on-omnichain/evm-api/restful-api/public/get-exchange-information
     """
     check_required_parameters([[symbol, "symbol"]])
-    return self._request("GET", f"/v1/public/info/{symbol}")
+    return self._request("GET", f"/v1/public/info/{symbol}", use_cache=use_cache)
 
 
-def get_token_info(self, chain_id: str = None):
+def get_token_info(self, chain_id: str = None, use_cache: bool = None):
     """[Public] Token info
 
     Limit: 10 requests per 1 second per IP address
@@ -114,6 +116,8 @@ def get_token_info(self, chain_id: str = None):
 
     Args:
         chain_id: str
+    Optional Args:
+        use_cache(bool): cache the response, see `ResponseCache`
 
     https://orderly.network/docs/build-on-omnichain/evm-api/restful-api/public/get-supported-collateral-info
 
@@ -122,10 +126,10 @@ def get_token_info(self, chain_id: str = None):
     payload = {
         "chain_id": chain_id
     }
-    return self._request("GET", "/v1/public/token", payload=payload)
+    return self._request("GET", "/v1/public/token", payload=payload, use_cache=use_cache)
 
 
-def get_available_symbols(self):
+def get_available_symbols(self, use_cache: bool = None):
     """[Public] Available symbols
 
     Limit: 10 requests per 1 second per IP address
@@ -134,12 +138,15 @@ def get_available_symbols(self):
 
     Get available symbols that Orderly Network supports, and also send order rules for each symbol. The definition of rules can be found at Exchange Infomation
 
+    Optional Args:
+        use_cache(bool): cache the response, see `ResponseCache`
+
     https://orderly.network/docs/build-on-omnichain/evm-api/restful-api/public/get-available-symbols
     """
-    return self._request("GET", "/v1/public/info")
+    return self._request("GET", "/v1/public/info", use_cache=use_cache)
 
 
-def get_fee_futures_information(self):
+def get_fee_futures_information(self, use_cache: bool = None):
     """[Public] Futures fee information
 
     Limit: 10 requests per 1 second per IP address
@@ -148,21 +155,27 @@ def get_fee_futures_information(self):
 
     Get fee information for futures trading.
 
+    Optional Args:
+        use_cache(bool): cache the response, see `ResponseCache`
+
     https://docs-api-evm.orderly.network/#restful-api-public-futures-fee-information
     """
-    return self._request("GET", "/v1/public/fee_futures/program")
+    return self._request("GET", "/v1/public/fee_futures/program", use_cache=use_cache)
 
 
-def get_leverage_configuration(self):
+def get_leverage_configuration(self, use_cache: bool = None):
     """[Public] Get leverage configuration
 
     Limit: 10 requests per 1 second per IP address
 
     GET v1/public/config
 
+    Optional Args:
+        use_cache(bool): cache the response, see `ResponseCache`
+
     https://orderly.network/docs/build-on-omnichain/evm-api/restful-api/public/get-leverage-configuration
     """
-    return self._request("GET", "/v1/public/config")
+    return self._request("GET", "/v1/public/config", use_cache=use_cache)
 
 
 def get_user_statistics(self):
@@ -212,7 +225,7 @@ def get_announcements(self):
     return self._request("GET", "/v1/public/announcement")
 
 
-def get_index_price_source(self):
+def get_index_price_source(self, use_cache: bool = None):
     """[Public] Get Index Price Source
     
     Limit: 10 requests per 1 second per IP address
@@ -220,10 +233,13 @@ def get_index_price_source(self):
     GET /v1/public/index_price_source
     
     Retrieves the available tokens to be used as collateral within Orderly
-    
+
+    Optional Args:
+        use_cache(bool): cache the response, see `ResponseCache`
+
     https://orderly.network/docs/build-on-omnichain/evm-api/restful-api/public/get-index-price-source
     """
-    return self._request("GET", "/v1/public/index_price_source")
+    return self._request("GET", "/v1/public/index_price_source", use_cache=use_cache)
 
 
 def get_max_leverage_setting(self):
@@ -0,0 +1,197 @@
+import asyncio
+from collections import deque
+
+from orderly_evm_connector.lib.constants import PAGINATION_MAX_PAGE_SIZE
+
+
+def _page_rows(response):
+    """Return (rows, total) from a paged response. `total` is None when the
+    endpoint does not report it."""
+    data = (response or {}).get("data") or {}
+    if isinstance(data, list):
+        return data, None
+    rows = data.get("rows") or []
+    total = (data.get("meta") or {}).get("total")
+    return rows, total
+
+
+def _last_page(total, size):
+    if total is None:
+        return None
+    return max(-(-int(total) // size), 1)
+
+
+def paginate(self, fetch, size: int = PAGINATION_MAX_PAGE_SIZE, page: int = 1, **kwargs):
+    """Iterate over every row of a paged endpoint
+
+    Pages are requested one at a time, only when the rows of the previous page
+    have been consumed. Iteration stops on an empty or short page, or once
+    `meta.total` rows have been returned.
+
+    Args:
+        fetch(str or callable): endpoint method (or its name), e.g. `get_orders`
+    Optional Args:
+        size(int): page size (default: 500, the maximum accepted by the API)
+        page(int): first page to request (default: 1)
+        **kwargs: filters passed to the endpoint on every page
+    """
+    if isinstance(fetch, str):
+        fetch = getattr(self, fetch)
+    while True:
+        rows, total = _page_rows(fetch(page=page, size=size, **kwargs))
+        yield from rows
+        last_page = _last_page(total, size)
+        if len(rows) < size or (last_page is not None and page >= last_page):
+            return
+        page += 1
+
+
+async def paginate_async(
+    self,
+    fetch,
+    size: int = PAGINATION_MAX_PAGE_SIZE,
+    page: int = 1,
+    prefetch: int = 1,
+    **kwargs
+):
+    """Asynchronously iterate over every row of a paged endpoint
+
+    Up to `prefetch` pages following the current one are requested while its
+    rows are being consumed, so at most `prefetch + 1` pages are held in memory.
+    Requests for pages past the end reported by `meta.total` are cancelled.
+
+    Args:
+        fetch(str or callable): endpoint method (or its name), e.g. `get_orders`
+    Optional Args:
+        size(int): page size (default: 500, the maximum accepted by the API)
+        page(int): first page to request (default: 1)
+        prefetch(int): number of pages requested ahead (default: 1, 0 disables)
+        **kwargs: filters passed to the endpoint on every page
+    """
+    if isinstance(fetch, str):
+        fetch = getattr(self, fetch)
+    prefetch = max(int(prefetch), 0)
+    pending = deque()
+    next_page = page
+    last_page = None
+
+    def schedule(count):
+        nonlocal next_page
+        while len(pending) < count and (last_page is None or next_page <= last_page):
+            task = asyncio.ensure_future(fetch(page=next_page, size=size, **kwargs))
+            pending.append((next_page, task))
+            next_page += 1
+
+    try:
+        # the current page and the `prefetch` following ones
+        schedule(prefetch + 1)
+        while pending:
+            current, task = pending.popleft()
+            rows, total = _page_rows(await task)
+            if total is not None:
+                last_page = _last_page(total, size)
+            if len(rows) < size or (last_page is not None and current >= last_page):
+                for _, task in pending:
+                    task.cancel()
+                pending.clear()
+                more = False
+            else:
+                schedule(prefetch)
+                more = True
+            for row in rows:
+                yield row
+            if more:
+                # without prefetch, the next page once this one is consumed
+                schedule(1)
+    finally:
+        for _, task in pending:
+            if task.done() and not task.cancelled():
+                task.exception()
+            else:
+                task.cancel()
+
+
+def _iterator(endpoint):
+    def iterator(self, size: int = PAGINATION_MAX_PAGE_SIZE, **kwargs):
+        return paginate(self, endpoint, size=size, **kwargs)
+
+    iterator.__name__ = iterator.__qualname__ = "iter_" + endpoint[len("get_"):]
+    iterator.__doc__ = (
+        "Iterate over every row returned by `%s`, see `paginate`" % endpoint
+    )
+    return iterator
+
+
+def _async_iterator(endpoint):
+    def iterator(self, size: int = PAGINATION_MAX_PAGE_SIZE, prefetch: int = 1, **kwargs):
+        return paginate_async(self, endpoint, size=size, prefetch=prefetch, **kwargs)
+
+    iterator.__name__ = iterator.__qualname__ = "iter_" + endpoint[len("get_"):]
+    iterator.__doc__ = (
+        "Asynchronously iterate over every row returned by `%s`, see `paginate_async`"
+        % endpoint
+    )
+    return iterator
+
+
+# trade
+iter_orders = _iterator("get_orders")
+iter_orders_async = _async_iterator("get_orders")
+iter_algo_orders = _iterator("get_algo_orders")
+iter_algo_orders_async = _async_iterator("get_algo_orders")
+iter_trades = _iterator("get_trades")
+iter_trades_async = _async_iterator("get_trades")
+
+# wallet
+iter_asset_history = _iterator("get_asset_history")
+iter_asset_history_async = _async_iterator("get_asset_history")
+iter_internal_transfer_history = _iterator("get_internal_transfer_history")
+iter_internal_transfer_history_async = _async_iterator("get_internal_transfer_history")
+
+# settlement
+iter_pnl_settlement_history = _iterator("get_pnl_settlement_history")
+iter_pnl_settlement_history_async = _async_iterator("get_pnl_settlement_history")
+
+# strategy vault
+iter_account_strategy_vault_transaction_history = _iterator(
+    "get_account_strategy_vault_transaction_history"
+)
+iter_account_strategy_vault_transaction_history_async = _async_iterator(
+    "get_account_strategy_vault_transaction_history"
+)
+iter_venue_transfer_history = _iterator("get_venue_transfer_history")
+iter_venue_transfer_history_async = _async_iterator("get_venue_transfer_history")
+iter_venue_withdrawal_history = _iterator("get_venue_withdrawal_history")
+iter_venue_withdrawal_history_async = _async_iterator("get_venue_withdrawal_history")
+iter_protocol_revenue_share_history = _iterator("get_protocol_revenue_share_history")
+iter_protocol_revenue_share_history_async = _async_iterator(
+    "get_protocol_revenue_share_history"
+)
+iter_liquidation_fees_share_history = _iterator("get_liquidation_fees_share_history")
+iter_liquidation_fees_share_history_async = _async_iterator(
+    "get_liquidation_fees_share_history"
+)
+iter_sv_internal_transfer_history = _iterator("get_sv_internal_transfer_history")
+iter_sv_internal_transfer_history_async = _async_iterator(
+    "get_sv_internal_transfer_history"
+)
+iter_sv_vault_order_history = _iterator("get_sv_vault_order_history")
+iter_sv_vault_order_history_async = _async_iterator("get_sv_vault_order_history")
+iter_sv_vault_open_orders = _iterator("get_sv_vault_open_orders")
+iter_sv_vault_open_orders_async = _async_iterator("get_sv_vault_open_orders")
+iter_sv_vault_trade_history = _iterator("get_sv_vault_trade_history")
+iter_sv_vault_trade_history_async = _async_iterator("get_sv_vault_trade_history")
+iter_sv_vault_liquidator_history = _iterator("get_sv_vault_liquidator_history")
+iter_sv_vault_liquidator_history_async = _async_iterator(
+    "get_sv_vault_liquidator_history"
+)
+iter_sv_lp_transaction_history = _iterator("get_sv_lp_transaction_history")
+iter_sv_lp_transaction_history_async = _async_iterator("get_sv_lp_transaction_history")
+iter_sv_lp_fees_history = _iterator("get_sv_lp_fees_history")
+iter_sv_lp_fees_history_async = _async_iterator("get_sv_lp_fees_history")
+iter_sv_sp_transaction_history = _iterator("get_sv_sp_transaction_history")
+iter_sv_sp_transaction_history_async = _async_iterator("get_sv_sp_transaction_history")
+iter_sv_sp_fees_history = _iterator("get_sv_sp_fees_history")
+iter_sv_sp_fees_history_async = _async_iterator("get_sv_sp_fees_history")
+iter_sv_fund_period_info = _iterator("get_sv_fund_period_info")
+iter_sv_fund_period_info_async = _async_iterator("get_sv_fund_period_info")
@@ -34,7 +34,7 @@ def get_valut_balances(self, chain_id: int = None, token: str = None):
 #     }
 #     return self._request("GET", "/v1/public/chain_info", payload=payload)
 
-def get_supported_chains_broker(self,broker_id: str = None):
+def get_supported_chains_broker(self,broker_id: str = None, use_cache: bool = None):
     """
     Get Supported Chains per Broker
     Limit: 10 requests per 1 second per IP address
@@ -42,9 +42,12 @@ def get_supported_chains_broker(self,broker_id: str = None):
     GET /v1/public/chain_info
 
     Get chains specified broker is available on.
+
+    Optional Args:
+        use_cache(bool): cache the response, see `ResponseCache`
     """
     # check_required_parameters(
     #     [[broker_id, "broker_id"]]
     # )
     payload = {"broker_id":broker_id}
-    return self._request("GET", "/v1/public/chain_info",payload=payload)
+    return self._request("GET", "/v1/public/chain_info",payload=payload, use_cache=use_cache)
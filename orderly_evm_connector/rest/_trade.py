@@ -49,8 +49,18 @@ def create_order(
         "reduce_only": reduce_only,
         "visible_quantity": visible_quantity,
     }
+    if self.symbol_rules is not None:
+        if self.symbol_rules.needs_load_async():
+            return _sign_prepared_async(self, "/v1/order", self.symbol_rules.prepare_order, payload)
+        payload = self.symbol_rules.prepare_order(payload)
     return self._sign_request("POST", "/v1/order", payload=payload)
 
+
+async def _sign_prepared_async(self, url_path, prepare, payload):
+    # the first order of an async client waits for the symbol rules
+    await self.symbol_rules.load_async()
+    return await self._sign_request("POST", url_path, payload=prepare(payload))
+
 def create_algo_order(
     self,
     algo_type: str,
@@ -148,6 +158,15 @@ def batch_create_order(self, orders: list):
             ]
         )
         check_enum_parameter(order["order_type"], OrderType)
+    if self.symbol_rules is not None:
+        if self.symbol_rules.needs_load_async():
+            return _sign_prepared_async(
+                self,
+                "/v1/batch-order",
+                lambda payload: {"orders": self.symbol_rules.prepare_orders(payload["orders"])},
+                {"orders": orders},
+            )
+        orders = self.symbol_rules.prepare_orders(orders)
 
     payload = {"orders": orders}
     return self._sign_request("POST", "/v1/batch-order", payload=payload)
@@ -265,11 +284,6 @@ def cancel_algo_order(self, order_id: int, symbol: str):
 
     https://orderly.network/docs/build-on-omnichain/evm-api/restful-api/private/cancel-algo-order
     """
-    self.session.headers.update(
-            {
-                "Content-Type": "application/x-www-form-urlencoded"
-            }
-        )
     check_required_parameters([[order_id, "order_id"], [symbol, "symbol"]])
     return self._sign_request("DELETE", f"/v1/algo/order?order_id={order_id}&symbol={symbol}")
 
@@ -289,11 +303,6 @@ def cancel_algo_all_pending_order(self, symbol: str = None, algo_type: str = Non
 
     https://orderly.network/docs/build-on-omnichain/evm-api/restful-api/private/cancel-all-pending-algo-orders
     """
-    self.session.headers.update(
-            {
-                "Content-Type": "application/x-www-form-urlencoded"
-            }
-        )
     if algo_type:
         check_enum_parameter(algo_type, AlgoType)
     # add symbol and algo type if they are not None
@@ -344,11 +353,6 @@ def cancel_algo_order_by_client_order_id(self, client_order_id: str, symbol: str
     check_required_parameters(
         [[client_order_id, "client_order_id"], [symbol, "symbol"]]
     )
-    self.session.headers.update(
-            {
-                "Content-Type": "application/x-www-form-urlencoded"
-            }
-        )
     return self._sign_request("DELETE", f"/v1/algo/client/order?client_order_id={client_order_id}&symbol={symbol}")
 
 
@@ -1,20 +1,45 @@
 import asyncio
 import inspect
 import json
+import time
 import websockets
 from websockets.exceptions import (
     ConnectionClosedError,
     ConnectionClosedOK,
     WebSocketException,
 )
-from orderly_evm_connector.lib.utils import orderlyLog, parse_proxies, decode_ws_error_code
+from orderly_evm_connector.error import ParameterValueError, WebsocketClientError
+from orderly_evm_connector.lib.utils import (
+    orderlyLog,
+    parse_proxies,
+    decode_ws_error_code,
+    get_json_backend,
+    get_ws_topic,
+    may_be_ws_ack,
+    may_be_ws_ping,
+)
 from orderly_evm_connector.lib.constants import (
     WEBSOCKET_TIMEOUT_IN_SECONDS,
     WEBSOCKET_FAILED_MAX_RETRIES,
     WEBSOCKET_RETRY_SLEEP_TIME,
+    WEBSOCKET_MESSAGE_FORMATS,
 )
+from orderly_evm_connector.websocket.reconnect import ReconnectPolicy
+from orderly_evm_connector.websocket.subscriptions import SubscriptionRegistry
 
 class AsyncWebsocketManager:
+    """Async websocket connection of the async clients.
+
+    Readiness is signalled with `asyncio.Event`s, cleared again while
+    reconnecting:
+
+        connected: the connection is open and `on_open` has run
+        authenticated: the server acknowledged the `auth` event; a rejected
+            `auth` is kept in `auth_error` and wakes the waiters
+        subscribed: no subscription of `subscriptions` is waiting for the
+            server acknowledgement
+    """
+
     def __init__(
         self,
         websocket_url,
@@ -28,6 +53,13 @@ class AsyncWebsocketManager:
         debug=False,
         proxies=None,
         max_retries=WEBSOCKET_FAILED_MAX_RETRIES,
+        reconnect_policy=None,
+        message_format="dict",
+        json_backend=None,
+        router=None,
+        conflator=None,
+        subscriptions=None,
+        connect_semaphore=None,
     ):
         self.websocket_url = websocket_url
         self.on_message = on_message
@@ -40,9 +72,27 @@ class AsyncWebsocketManager:
         self.timeout = timeout
         self.logger = orderlyLog(debug=debug)
         self._proxy_params = parse_proxies(proxies) if proxies else {}
-        self.subscriptions = []
+        self.subscriptions = subscriptions if subscriptions is not None else SubscriptionRegistry()
         self._login = False
         self.max_retries = max_retries
+        self.reconnect_policy = reconnect_policy or ReconnectPolicy(max_retries=max_retries)
+        if message_format not in WEBSOCKET_MESSAGE_FORMATS:
+            raise ParameterValueError([message_format])
+        self.message_format = message_format
+        self._json_dumps, self._json_loads = get_json_backend(json_backend)
+        self.router = router
+        self.conflator = conflator
+        # bounds the connections opened at once by managers sharing it
+        self.connect_semaphore = connect_semaphore
+        self._conflated = asyncio.Event()
+        self._conflation_task = None
+        self.connected = asyncio.Event()
+        self.authenticated = asyncio.Event()
+        self.auth_error = None
+        self._auth_failed = asyncio.Event()
+        self.subscribed = asyncio.Event()
+        self.subscribed.set()
+        self._closed = asyncio.Event()
         self.ws = None
         self.loop = asyncio.get_event_loop()
         self._stopping = False
@@ -51,43 +101,73 @@ class AsyncWebsocketManager:
     def start(self):
         pass
 
-    async def create_ws_connection(self):
-        retries = 0
-        while retries <= self.max_retries:
+    async def create_ws_connection(self, reconnecting=False):
+        attempt = 0
+        while True:
+            if reconnecting:
+                await asyncio.sleep(self.reconnect_policy.delay(attempt))
+                if self._stopping:
+                    raise WebsocketClientError("Websocket client stopped while reconnecting")
             try:
                 self.logger.debug(
                     f"Creating connection with WebSocket Server: {self.websocket_url}, proxies: {self._proxy_params}"
                 )
-                self.ws = await websockets.connect(
-                    self.websocket_url, timeout=self.timeout, **self._proxy_params
-                )
+                self.ws = await self._connect()
                 self.logger.debug(
                     f"WebSocket connection has been established: {self.websocket_url}, proxies: {self._proxy_params}"
                 )
                 self._stopping = False
                 self._on_close_called = False
                 self.init = False
+                self._closed.clear()
                 if self.on_open:
                     await self._callback(self.on_open)
-                return
+                self.connected.set()
+                return attempt + 1
             except Exception as e:
                 self.logger.error(f"Failed to create WebSocket connection: {e}")
-                retries += 1
-                if retries <= self.max_retries:
-                    self.logger.warning(
-                        f"Retrying connection... (Attempt {retries}/{self.max_retries})"
-                    )
-                    await asyncio.sleep(WEBSOCKET_RETRY_SLEEP_TIME)
-                else:
+                self.reconnect_policy.record_failure()
+                if self._stopping or not self.reconnect_policy.should_retry(attempt):
                     raise
+                attempt += 1
+                self.logger.warning(
+                    f"Retrying connection... (Attempt {attempt}/{self.reconnect_policy.max_retries})"
+                )
+                reconnecting = True
+
+    async def _connect(self):
+        if self.connect_semaphore is None:
+            return await websockets.connect(
+                self.websocket_url, timeout=self.timeout, **self._proxy_params
+            )
+        async with self.connect_semaphore:
+            return await websockets.connect(
+                self.websocket_url, timeout=self.timeout, **self._proxy_params
+            )
 
     async def reconnect(self):
+        """Reconnect with the backoff of `reconnect_policy`. Returns False if
+        the policy gave up and the connection was closed."""
         if self._stopping:
-            return
+            return False
         self.logger.warning("Reconnecting to WebSocket...")
+        disconnected_at = time.monotonic()
         await self._internal_close()
         self._login = False
-        await self.create_ws_connection()
+        try:
+            attempts = await self.create_ws_connection(reconnecting=True)
+        except Exception as e:
+            if self._stopping:
+                return False
+            self.reconnect_policy.record_give_up()
+            self.logger.error(f"Giving up reconnecting: {e}")
+            if self.reconnect_policy.give_up == "raise":
+                raise
+            self._stopping = True
+            await self._notify_close()
+            return False
+        self.reconnect_policy.record_reconnect(time.monotonic() - disconnected_at, attempts)
+        return True
 
     def send_message(self, message):
         self.logger.debug("Sending message to Orderly WebSocket Server: %s", message)
@@ -96,15 +176,73 @@ class AsyncWebsocketManager:
         else:
             self.logger.debug("Skipping send_message because websocket is not connected.")
 
+    def send_messages(self, messages):
+        """Send several messages from one task, in order"""
+        if self.subscriptions.has_pending():
+            self.subscribed.clear()
+        if self.ws and not self.ws.closed and not self._stopping:
+            asyncio.create_task(self._send_all(self.ws, messages))
+        else:
+            self.logger.debug("Skipping send_messages because websocket is not connected.")
+
+    async def _send_all(self, ws, messages):
+        for message in messages:
+            self.logger.debug("Sending message to Orderly WebSocket Server: %s", message)
+            await ws.send(message)
+
     async def run(self):
-        await self.create_ws_connection()
-        await self.read_data()
+        if self.conflator is not None and self._conflation_task is None:
+            self._conflation_task = asyncio.ensure_future(self._deliver_conflated())
+        try:
+            await self.create_ws_connection()
+            await self.read_data()
+        finally:
+            self._closed.set()
 
     async def ensure_init(self):
-        while not self._stopping:
-            if self.init:
-                break
-            await asyncio.sleep(1)
+        """Wait until the connection is open"""
+        await self.wait_for(self.connected)
+
+    async def wait_for(self, event, timeout=None):
+        """Wait for one of the readiness events. Returns False if the manager
+        stopped, the server rejected `auth` or `timeout` expired first."""
+        if event.is_set():
+            return True
+        waiters = [
+            asyncio.ensure_future(event.wait()),
+            asyncio.ensure_future(self._closed.wait()),
+            asyncio.ensure_future(self._auth_failed.wait()),
+        ]
+        try:
+            await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+        return event.is_set()
+
+    def _awaiting_ack(self):
+        return self.subscriptions.has_pending() or (
+            self._login and not self.authenticated.is_set()
+        )
+
+    def _handle_ack(self, message):
+        if not isinstance(message, dict):
+            return
+        event = message.get("event")
+        if event == "auth":
+            if message.get("success"):
+                self.auth_error = None
+                self._auth_failed.clear()
+                self.authenticated.set()
+            else:
+                self.logger.error(f"Websocket authentication failed: {message}")
+                self.auth_error = message
+                self._auth_failed.set()
+        elif event == "subscribe":
+            if self.subscriptions.acknowledge(message) is not None and not message.get("success"):
+                self.logger.error(f"Websocket subscription failed: {message}")
+            if not self.subscriptions.has_pending():
+                self.subscribed.set()
 
     async def _handle_heartbeat(self):
         try:
@@ -158,6 +296,26 @@ class AsyncWebsocketManager:
                 await self.reconnect()
                 continue
 
+            if self.message_format != "dict":
+                if may_be_ws_ping(message) and self._is_ping(message):
+                    await self._handle_heartbeat()
+                    continue
+                if self._awaiting_ack() and may_be_ws_ack(message):
+                    try:
+                        self._handle_ack(self._json_loads(message))
+                    except ValueError:
+                        pass
+                if self.router or self.conflator is not None:
+                    topic = get_ws_topic(message)
+                else:
+                    topic = None
+                if self.message_format == "bytes" and isinstance(message, str):
+                    message = message.encode()
+                elif self.message_format == "str" and not isinstance(message, str):
+                    message = bytes(message).decode()
+                await self._dispatch(message, topic)
+                continue
+
             payload = b""
             try:
                 payload = message
@@ -165,8 +323,8 @@ class AsyncWebsocketManager:
                     payload = message.encode()
                 elif isinstance(message, (bytearray, memoryview)):
                     payload = bytes(message)
-                _message = json.loads(message)
-            except json.JSONDecodeError:
+                _message = self._json_loads(message)
+            except ValueError:
                 err_code = decode_ws_error_code(payload)
                 if err_code == "1000":
                     self.logger.info("Websocket closed normally (code 1000).")
@@ -179,14 +337,46 @@ class AsyncWebsocketManager:
                     )
                 continue
 
-            if "event" in _message and _message["event"] == "ping":
+            if isinstance(_message, dict) and _message.get("event") == "ping":
                 await self._handle_heartbeat()
             else:
-                await self._callback(self.on_message, _message)
+                topic = _message.get("topic") if isinstance(_message, dict) else None
+                if topic is None and isinstance(_message, dict) and self._awaiting_ack():
+                    self._handle_ack(_message)
+                await self._dispatch(_message, topic)
+
+    async def _dispatch(self, message, topic):
+        if self.conflator is not None and self.conflator.offer(topic, message):
+            self._conflated.set()
+            return
+        await self._deliver(message, topic)
+
+    async def _deliver_conflated(self):
+        while not self._stopping:
+            await self._conflated.wait()
+            self._conflated.clear()
+            for topic, message in self.conflator.drain():
+                await self._deliver(message, topic)
+
+    async def _deliver(self, message, topic):
+        handlers = self.router.match(topic) if self.router is not None else ()
+        if not handlers:
+            await self._callback(self.on_message, message)
+        for handler in handlers:
+            await self._callback(handler, message)
+
+    def _is_ping(self, message):
+        try:
+            message = self._json_loads(message)
+        except ValueError:
+            return False
+        return isinstance(message, dict) and message.get("event") == "ping"
 
     async def close(self):
         self._stopping = True
+        self._conflated.set()
         await self._internal_close()
+        self._closed.set()
 
     async def _callback(self, callback, *args):
         if callback:
@@ -210,3 +400,7 @@ class AsyncWebsocketManager:
         self.ws = None
         self.init = False
         self._login = False
+        self.connected.clear()
+        self.authenticated.clear()
+        if len(self.subscriptions):
+            self.subscribed.clear()
@@ -0,0 +1,265 @@
+import json
+import re
+import threading
+
+from orderly_evm_connector.error import ParameterValueError
+from orderly_evm_connector.lib.constants import CANDLE_BUFFER_SIZE
+from orderly_evm_connector.websocket.websocket_api import _stream
+
+_TIME_SPEC = re.compile(r"^(\d+)([smh])$")
+_UNITS = {"s": 1000, "m": 60000, "h": 3600000}
+BAR_KINDS = ("time", "tick", "volume", "notional")
+
+
+def parse_bar_spec(spec: str):
+    """(kind, size) of a bar spec: "5s"/"1m"/"1h" are time bars (size in
+    milliseconds), "tick:100", "volume:10" and "notional:50000" close a bar
+    after that many trades, that base quantity or that quote amount"""
+    match = _TIME_SPEC.match(spec)
+    if match:
+        size = int(match.group(1)) * _UNITS[match.group(2)]
+        if size > 0:
+            return "time", size
+    else:
+        kind, _, size = spec.partition(":")
+        try:
+            size = float(size)
+        except ValueError:
+            size = 0
+        if kind in BAR_KINDS[1:] and size > 0:
+            return kind, size
+    raise ParameterValueError([spec])
+
+
+class _BarRing(object):
+    """Bars of one symbol and spec in preallocated columns.
+
+    The bar being built is the slot at `head`; closing it moves `head` to
+    the next slot, overwriting the oldest bar once `capacity - 1` are kept.
+    """
+
+    __slots__ = (
+        "kind", "size", "capacity", "start", "end", "open", "high", "low", "close",
+        "volume", "amount", "trades", "head", "count", "unflushed", "building",
+    )
+
+    def __init__(self, kind, size, capacity):
+        self.kind = kind
+        self.size = size
+        self.capacity = capacity
+        self.start = [0] * capacity
+        self.end = [0] * capacity
+        self.open = [0.0] * capacity
+        self.high = [0.0] * capacity
+        self.low = [0.0] * capacity
+        self.close = [0.0] * capacity
+        self.volume = [0.0] * capacity
+        self.amount = [0.0] * capacity
+        self.trades = [0] * capacity
+        self.head = 0
+        # closed bars kept, and closed bars not flushed yet
+        self.count = 0
+        self.unflushed = 0
+        self.building = False
+
+    def add(self, price, size, ts):
+        """Add a trade, returns the slots of the bars it closed"""
+        closed = []
+        if self.kind == "time":
+            start = ts // self.size * self.size
+            if self.building:
+                if start > self.start[self.head]:
+                    closed.append(self.close_bar())
+                else:
+                    # a late trade stays in the current bar
+                    start = self.start[self.head]
+            self._fill(price, size, ts, start)
+            return closed
+        column = self.volume if self.kind == "volume" else self.amount
+        while True:
+            if self.kind == "tick":
+                part = size
+            else:
+                room = self.size - (column[self.head] if self.building else 0.0)
+                # split the trade when it overflows the bar
+                part = min(size, room if self.kind == "volume" else room / price)
+            self._fill(price, part, ts, ts)
+            size -= part
+            if self._full():
+                closed.append(self.close_bar())
+            if self.kind == "tick" or size <= 1e-12:
+                return closed
+
+    def _full(self):
+        i = self.head
+        if self.kind == "tick":
+            return self.trades[i] >= self.size
+        filled = self.volume[i] if self.kind == "volume" else self.amount[i]
+        return filled >= self.size * (1 - 1e-9)
+
+    def _fill(self, price, size, ts, start):
+        i = self.head
+        if not self.building:
+            self.building = True
+            self.start[i] = start
+            self.open[i] = self.high[i] = self.low[i] = price
+            self.volume[i] = self.amount[i] = 0.0
+            self.trades[i] = 0
+        elif price > self.high[i]:
+            self.high[i] = price
+        elif price < self.low[i]:
+            self.low[i] = price
+        self.close[i] = price
+        self.volume[i] += size
+        self.amount[i] += price * size
+        self.trades[i] += 1
+        self.end[i] = start + self.size if self.kind == "time" else ts
+
+    def close_bar(self):
+        i = self.head
+        self.building = False
+        self.head = (i + 1) % self.capacity
+        # the slot at `head` is the next bar, not a kept one
+        self.count = min(self.count + 1, self.capacity - 1)
+        self.unflushed = min(self.unflushed + 1, self.capacity - 1)
+        return i
+
+    def slots(self, count):
+        """Slots of the last `count` closed bars, oldest first"""
+        count = min(count, self.count)
+        return [(self.head - count + k) % self.capacity for k in range(count)]
+
+    def row(self, i, symbol, spec):
+        return {
+            "open": self.open[i],
+            "close": self.close[i],
+            "low": self.low[i],
+            "high": self.high[i],
+            "volume": self.volume[i],
+            "amount": self.amount[i],
+            "symbol": symbol,
+            "type": spec,
+            "start_timestamp": self.start[i],
+            "end_timestamp": self.end[i],
+        }
+
+
+class CandleBuilder(object):
+    """OHLCV bars built from the `{symbol}@trade` topic.
+
+    Every symbol gets a bar of each spec of `bars` (see `parse_bar_spec`):
+    time bars of any length, e.g. "1s", "5s", "15s", start on multiples of
+    their length and are closed by the first trade of a later bar or by
+    `close_expired`; tick, volume and notional bars close once full, a trade
+    overflowing one is split over the next. Intervals without trades have no
+    bar.
+
+    Bars are kept in preallocated ring buffers of `capacity` bars per symbol
+    and spec. `on_bar(symbol, spec, row)` is called for every closed bar;
+    `flush` and `get_kline` return rows shaped like the REST `get_kline`
+    rows, oldest first. Queries take a short lock and return copies.
+    """
+
+    def __init__(self, client=None, bars=("1s", "5s", "15s"), capacity: int = CANDLE_BUFFER_SIZE, on_bar=None):
+        self.specs = {spec: parse_bar_spec(spec) for spec in bars}
+        self.capacity = max(capacity, 2)
+        self.on_bar = on_bar
+        self.client = client
+        self.rings = {}
+        self._lock = threading.Lock()
+        if client is not None:
+            self.attach(client)
+
+    def attach(self, client):
+        """Route the `@trade` topics of `client` to the builder"""
+        self.client = client
+        client.add_handler("*@trade", self._on_message)
+
+    def _on_message(self, manager, message):
+        self.process(message)
+
+    def subscribe(self, symbol: str):
+        self._rings(symbol)
+        _stream.get_trade(self.client, f"{symbol}@trade")
+
+    def unsubscribe(self, symbol: str):
+        self.client.send_message_to_server(
+            {"id": self.client.wss_id, "event": "unsubscribe", "topic": f"{symbol}@trade"}
+        )
+
+    def _rings(self, symbol):
+        rings = self.rings.get(symbol)
+        if rings is None:
+            with self._lock:
+                rings = self.rings.setdefault(
+                    symbol,
+                    {spec: _BarRing(kind, size, self.capacity) for spec, (kind, size) in self.specs.items()},
+                )
+        return rings
+
+    def process(self, message):
+        if isinstance(message, (str, bytes, bytearray)):
+            try:
+                message = json.loads(message)
+            except ValueError:
+                return
+        if not isinstance(message, dict) or not str(message.get("topic", "")).endswith("@trade"):
+            return
+        data = message.get("data")
+        for trade in data if isinstance(data, list) else (data,):
+            if isinstance(trade, dict):
+                self.add_trade(
+                    trade["symbol"], trade["price"], trade["size"], trade.get("ts", message.get("ts"))
+                )
+
+    def add_trade(self, symbol: str, price, size, ts: int):
+        """Add one trade, `ts` in milliseconds"""
+        price, size = float(price), float(size)
+        closed = []
+        rings = self._rings(symbol)
+        with self._lock:
+            for spec, ring in rings.items():
+                for i in ring.add(price, size, ts):
+                    closed.append(ring.row(i, symbol, spec))
+        self._emit(symbol, closed)
+
+    def close_expired(self, now: int):
+        """Close the time bars ended before `now`, in milliseconds, even
+        without a later trade"""
+        closed = {}
+        with self._lock:
+            for symbol, rings in self.rings.items():
+                for spec, ring in rings.items():
+                    if ring.kind == "time" and ring.building and ring.end[ring.head] <= now:
+                        closed.setdefault(symbol, []).append(ring.row(ring.close_bar(), symbol, spec))
+        for symbol, rows in closed.items():
+            self._emit(symbol, rows)
+
+    def _emit(self, symbol, rows):
+        if self.on_bar is not None:
+            for row in rows:
+                self.on_bar(symbol, row["type"], row)
+
+    def flush(self, symbol: str, spec: str):
+        """Rows of the bars closed since the last flush, oldest first. Bars
+        overwritten in the ring before being flushed are lost."""
+        ring = self._ring(symbol, spec)
+        with self._lock:
+            rows = [ring.row(i, symbol, spec) for i in ring.slots(ring.unflushed)]
+            ring.unflushed = 0
+        return rows
+
+    def get_kline(self, symbol: str, spec: str, limit: int = None, include_open: bool = False):
+        """The last `limit` closed bars, and the one being built with
+        `include_open`, as a REST `get_kline` response"""
+        ring = self._ring(symbol, spec)
+        with self._lock:
+            rows = [ring.row(i, symbol, spec) for i in ring.slots(ring.count if limit is None else limit)]
+            if include_open and ring.building:
+                rows.append(ring.row(ring.head, symbol, spec))
+        return {"success": True, "data": {"rows": rows}}
+
+    def _ring(self, symbol, spec):
+        if spec not in self.specs:
+            raise ParameterValueError([spec])
+        return self._rings(symbol)[spec]
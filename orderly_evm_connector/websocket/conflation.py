@@ -0,0 +1,124 @@
+import threading
+
+CONFLATED_TOPICS = (
+    "*@bbo",
+    "*@ticker",
+    "*@markprice",
+    "*@indexprice",
+    "bbos",
+    "tickers",
+    "markprices",
+    "indexprices",
+)
+# topics pushing one entry per symbol in `data`
+ARRAY_TOPICS = ("bbos", "tickers", "markprices", "indexprices")
+
+
+class Conflator(object):
+    """Keeps only the newest message of each conflated topic until the
+    consumer takes them.
+
+    The socket managers `offer` every message; messages of conflated topics
+    replace the pending message of the same topic, other messages are
+    delivered right away. The sync manager delivers the pending messages
+    from its reader thread once the frames already received are read, the
+    async one from a task on the same event loop, so callbacks are never
+    called concurrently. For array topics such as `bbos` and parsed (`dict`) messages, the
+    newest entry of each symbol is kept and the pending entries are merged
+    into one message.
+
+    Args:
+        topics: patterns of the topics to conflate, `*@bbo` for a stream of
+            every symbol, `{symbol}@*` for every stream of a symbol or an
+            exact topic
+        array_topics: conflated topics whose `data` is a list of per-symbol
+            entries
+    """
+
+    def __init__(self, topics=CONFLATED_TOPICS, array_topics=ARRAY_TOPICS):
+        self.topics = frozenset(topics)
+        self.array_topics = frozenset(array_topics)
+        self._matches = {}
+        self._pending = {}
+        self._received = {}
+        self._delivered = {}
+        self._lock = threading.Lock()
+
+    def matches(self, topic):
+        if topic is None:
+            return False
+        matched = self._matches.get(topic)
+        if matched is None:
+            patterns = [topic]
+            if "@" in topic:
+                symbol, stream = topic.split("@", 1)
+                patterns += [f"*@{stream}", f"{symbol}@*"]
+            matched = self._matches[topic] = any(p in self.topics for p in patterns)
+        return matched
+
+    def offer(self, topic, message):
+        """Keep `message` as the pending message of `topic`. Returns False,
+        and keeps nothing, when `topic` is not conflated."""
+        if not self.matches(topic):
+            return False
+        with self._lock:
+            self._received[topic] = self._received.get(topic, 0) + 1
+            if topic in self.array_topics and isinstance(message, dict):
+                data = message.get("data")
+                if isinstance(data, list):
+                    pending = self._pending.get(topic)
+                    entries = pending[1] if pending is not None else {}
+                    for entry in data:
+                        entries[entry.get("symbol")] = entry
+                    self._pending[topic] = (message, entries)
+                    return True
+            self._pending[topic] = (message, None)
+        return True
+
+    def has_pending(self):
+        return bool(self._pending)
+
+    def drain(self):
+        """Take the pending messages, one per topic"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            for topic in pending:
+                self._delivered[topic] = self._delivered.get(topic, 0) + 1
+        messages = []
+        for topic, (message, entries) in pending.items():
+            if entries is not None:
+                message = dict(message, data=list(entries.values()))
+            messages.append((topic, message))
+        return messages
+
+    def stats(self):
+        """Messages received, delivered and coalesced (dropped as stale) per
+        topic"""
+        with self._lock:
+            stats = {}
+            for topic, received in self._received.items():
+                pending = 1 if topic in self._pending else 0
+                delivered = self._delivered.get(topic, 0)
+                stats[topic] = {
+                    "received": received,
+                    "delivered": delivered,
+                    "coalesced": received - delivered - pending,
+                }
+            return stats
+
+    def reset_stats(self):
+        with self._lock:
+            self._received = {topic: 1 for topic in self._pending}
+            self._delivered = {}
+
+
+def get_conflator(conflate):
+    """Conflator for the `conflate` argument of the websocket clients: True
+    for the default topics, a list of topic patterns, or a Conflator"""
+    if not conflate:
+        return None
+    if isinstance(conflate, Conflator):
+        return conflate
+    if conflate is True:
+        return Conflator()
+    return Conflator(topics=conflate)
@@ -0,0 +1,182 @@
+import asyncio
+from typing import Optional
+
+from orderly_evm_connector.lib.constants import WEBSOCKET_MAX_CONCURRENT_CONNECTS
+from orderly_evm_connector.lib.utils import get_signer, orderlyLog
+from orderly_evm_connector.websocket.reconnect import ReconnectPolicy
+from orderly_evm_connector.websocket.websocket_api import WebsocketPrivateAPIClientAsync
+
+PRIVATE_TOPICS = ("executionreport", "position", "balance")
+
+
+class WebsocketPrivateMultiplexer(object):
+    """Private websocket connections of many accounts in one event loop.
+
+    Each account has its own authenticated connection, read by a task of
+    the running loop instead of a thread. The callbacks and handlers get the
+    account id in place of the socket manager: `on_message(account_id,
+    message)`, `handler(account_id, message)`, `on_error(account_id, error)`
+    and `on_close(account_id)`.
+
+    Accounts share the signer of their secret, one `ReconnectPolicy` (so
+    `reconnect_policy.stats()` covers every account) and a semaphore letting
+    at most `max_concurrent_connects` connections open at once, on start and
+    after a mass disconnect.
+
+    Args:
+        orderly_key, orderly_secret: default credentials of the accounts
+        topics: subscribed on every account once it is connected
+    """
+
+    def __init__(
+        self,
+        orderly_testnet=False,
+        orderly_key=None,
+        orderly_secret=None,
+        topics=PRIVATE_TOPICS,
+        timeout=None,
+        debug=False,
+        proxies: Optional[dict] = None,
+        on_message=None,
+        on_close=None,
+        on_error=None,
+        reconnect_policy=None,
+        max_concurrent_connects: int = WEBSOCKET_MAX_CONCURRENT_CONNECTS,
+        message_format=None,
+        json_backend=None,
+    ):
+        self.orderly_testnet = orderly_testnet
+        self.orderly_key = orderly_key
+        self.orderly_secret = orderly_secret
+        self.topics = tuple(topics)
+        self.timeout = timeout
+        self.debug = debug
+        self.proxies = proxies
+        self.on_message = on_message
+        self.on_close = on_close
+        self.on_error = on_error
+        self.reconnect_policy = reconnect_policy or ReconnectPolicy()
+        self.connect_semaphore = asyncio.Semaphore(max_concurrent_connects)
+        self.message_format = message_format
+        self.json_backend = json_backend
+        self.logger = orderlyLog(debug=debug)
+        self.clients = {}
+        self._started = set()
+        self._topics = {}
+        # (topic, handler) -> {account_id: tagged handler}
+        self._handlers = {}
+
+    def add_account(
+        self,
+        orderly_account_id: str,
+        orderly_key: str = None,
+        orderly_secret: str = None,
+        signer=None,
+        topics=None,
+    ):
+        """Register an account, connected by the next `run()`. Returns its
+        `WebsocketPrivateAPIClientAsync`."""
+        orderly_secret = orderly_secret or self.orderly_secret
+        if signer is None and orderly_secret:
+            # accounts sharing a secret share the cached signer
+            signer = get_signer(orderly_secret)
+        client = WebsocketPrivateAPIClientAsync(
+            orderly_testnet=self.orderly_testnet,
+            orderly_account_id=orderly_account_id,
+            orderly_key=orderly_key or self.orderly_key,
+            orderly_secret=orderly_secret,
+            timeout=self.timeout,
+            debug=self.debug,
+            proxies=self.proxies,
+            on_message=self._tagged(orderly_account_id, self.on_message),
+            on_close=self._tagged(orderly_account_id, self.on_close),
+            on_error=self._tagged(orderly_account_id, self.on_error),
+            signer=signer,
+            reconnect_policy=self.reconnect_policy,
+            message_format=self.message_format,
+            json_backend=self.json_backend,
+            connect_semaphore=self.connect_semaphore,
+        )
+        self._topics[orderly_account_id] = self.topics if topics is None else tuple(topics)
+        for (topic, handler), tagged in self._handlers.items():
+            tagged[orderly_account_id] = self._tagged(orderly_account_id, handler)
+            client.add_handler(topic, tagged[orderly_account_id])
+        self.clients[orderly_account_id] = client
+        return client
+
+    @staticmethod
+    def _tagged(account_id, callback):
+        if callback is None:
+            return None
+
+        def tagged(manager, *args):
+            return callback(account_id, *args)
+
+        return tagged
+
+    async def run(self):
+        """Connect and subscribe the accounts added since the last call.
+        Returns the ids of the accounts which failed to connect."""
+        account_ids = [a for a in self.clients if a not in self._started]
+        self._started.update(account_ids)
+        results = await asyncio.gather(
+            *(self._start(account_id) for account_id in account_ids), return_exceptions=True
+        )
+        failed = []
+        for account_id, result in zip(account_ids, results):
+            if isinstance(result, BaseException):
+                self.logger.error(f"Failed to connect account {account_id}: {result}")
+                self._started.discard(account_id)
+                failed.append(account_id)
+        return failed
+
+    async def _start(self, account_id):
+        client = self.clients[account_id]
+        await client.run()
+        for topic in self._topics[account_id]:
+            client.send_message_to_server({"id": client.wss_id, "event": "subscribe", "topic": topic})
+
+    def subscribe(self, topic: str, account_ids=None, params: dict = None):
+        """Subscribe `topic` on `account_ids`, every connected account by default"""
+        self._send("subscribe", topic, account_ids, params)
+
+    def unsubscribe(self, topic: str, account_ids=None, params: dict = None):
+        self._send("unsubscribe", topic, account_ids, params)
+
+    def _send(self, event, topic, account_ids, params):
+        for account_id in self._started if account_ids is None else account_ids:
+            client = self.clients[account_id]
+            message = {"id": client.wss_id, "event": event, "topic": topic}
+            if params:
+                message["params"] = params
+            client.send_message_to_server(message)
+
+    def add_handler(self, topic: str, handler):
+        """Call `handler(account_id, message)` for the messages of `topic` of
+        every account, see `OrderlyWebsocketClient.add_handler`"""
+        tagged = self._handlers.setdefault((topic, handler), {})
+        for account_id, client in self.clients.items():
+            if account_id not in tagged:
+                tagged[account_id] = self._tagged(account_id, handler)
+                client.add_handler(topic, tagged[account_id])
+
+    def remove_handler(self, topic: str, handler):
+        for account_id, tagged in self._handlers.pop((topic, handler), {}).items():
+            client = self.clients.get(account_id)
+            if client is not None:
+                client.remove_handler(topic, tagged)
+
+    async def remove_account(self, orderly_account_id: str):
+        client = self.clients.pop(orderly_account_id)
+        self._topics.pop(orderly_account_id, None)
+        for tagged in self._handlers.values():
+            tagged.pop(orderly_account_id, None)
+        if orderly_account_id in self._started:
+            self._started.discard(orderly_account_id)
+            await client.stop_async()
+
+    async def stop_async(self):
+        await asyncio.gather(
+            *(self.clients[account_id].stop_async() for account_id in self._started)
+        )
+        self._started.clear()
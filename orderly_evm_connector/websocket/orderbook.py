@@ -0,0 +1,419 @@
+import asyncio
+import json
+import threading
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+
+from orderly_evm_connector.async_api import AsyncAPI
+from orderly_evm_connector.error import ParameterValueError
+from orderly_evm_connector.lib.constants import ORDERBOOK_MAX_BUFFERED_UPDATES
+from orderly_evm_connector.lib.utils import orderlyLog
+from orderly_evm_connector.websocket.websocket_api import _stream
+
+
+def _level(level):
+    if isinstance(level, dict):
+        return float(level["price"]), float(level["quantity"])
+    return float(level[0]), float(level[1])
+
+
+class _BookSide(object):
+    """Price levels of one side of a book.
+
+    Keys are kept in an ascending list with the best level last, so the best
+    price is read in O(1), the top k levels in O(k), and updates near the top
+    of the book only move a few elements. Ask prices are stored negated.
+    """
+
+    def __init__(self, sign):
+        self.sign = sign
+        self.keys = []
+        self.sizes = {}
+
+    def clear(self):
+        self.keys = []
+        self.sizes = {}
+
+    def set(self, price, quantity):
+        key = price * self.sign
+        if quantity > 0:
+            if key not in self.sizes:
+                keys = self.keys
+                if not keys or key > keys[-1]:
+                    keys.append(key)
+                else:
+                    keys.insert(bisect_left(keys, key), key)
+            self.sizes[key] = quantity
+        elif key in self.sizes:
+            del self.sizes[key]
+            keys = self.keys
+            if keys[-1] == key:
+                keys.pop()
+            else:
+                del keys[bisect_left(keys, key)]
+
+    def best(self):
+        if not self.keys:
+            return None
+        key = self.keys[-1]
+        return [key * self.sign, self.sizes[key]]
+
+    def top(self, depth=None):
+        keys = self.keys
+        selected = keys[::-1] if depth is None else keys[: -depth - 1 : -1]
+        sign, sizes = self.sign, self.sizes
+        return [[key * sign, sizes[key]] for key in selected]
+
+    def __len__(self):
+        return len(self.keys)
+
+
+class OrderBook(object):
+    """Local L2 order book of one symbol.
+
+    `ts` is the timestamp of the last snapshot or update applied. Updates are
+    chained by `prevTs`; `apply_update` returns False when one is missing and
+    the book needs a new snapshot.
+    """
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.bids = _BookSide(1)
+        self.asks = _BookSide(-1)
+        self.ts = None
+        self.synced = False
+
+    def apply_snapshot(self, bids, asks, ts):
+        self.bids.clear()
+        self.asks.clear()
+        for level in bids:
+            self.bids.set(*_level(level))
+        for level in asks:
+            self.asks.set(*_level(level))
+        self.ts = ts
+        self.synced = True
+
+    def apply_update(self, bids, asks, ts, prev_ts):
+        if not self.synced:
+            return False
+        if self.ts is not None and ts is not None:
+            if ts <= self.ts:
+                # already contained in the snapshot
+                return True
+            if prev_ts is not None and prev_ts > self.ts:
+                self.synced = False
+                return False
+        for level in bids:
+            self.bids.set(*_level(level))
+        for level in asks:
+            self.asks.set(*_level(level))
+        self.ts = ts
+        return True
+
+    def bbo(self):
+        return {"symbol": self.symbol, "ts": self.ts, "bid": self.bids.best(), "ask": self.asks.best()}
+
+    def depth(self, depth=None):
+        return {
+            "symbol": self.symbol,
+            "ts": self.ts,
+            "bids": self.bids.top(depth),
+            "asks": self.asks.top(depth),
+        }
+
+
+class OrderBookManager(object):
+    """Maintains local order books from the public websocket streams.
+
+    Each symbol is started from a snapshot, requested with `request_orderbook`
+    on the websocket or with `get_orderbook_snapshot` when a REST client is
+    given, then kept up to date from `{symbol}@orderbookupdate`. Updates
+    received while a snapshot is pending are buffered and replayed; a missing
+    update triggers a new snapshot. `{symbol}@orderbook` pushes are applied as
+    snapshots.
+
+    Queries take a short lock and return copies, so they can be made from any
+    thread without holding up the websocket reader.
+    """
+
+    def __init__(
+        self,
+        client=None,
+        rest_client=None,
+        snapshot_level: int = None,
+        max_buffered_updates: int = ORDERBOOK_MAX_BUFFERED_UPDATES,
+        debug=False,
+    ):
+        self.client = client
+        self.rest_client = rest_client
+        self.snapshot_level = snapshot_level
+        self.max_buffered_updates = max_buffered_updates
+        self.logger = orderlyLog(debug=debug)
+        self.books = {}
+        self.resyncs = 0
+        self._buffers = {}
+        self._resyncing = set()
+        # symbols kept from `@orderbookupdate` deltas
+        self._delta_symbols = set()
+        self._ready = {}
+        self._waiters = {}
+        self._lock = threading.Lock()
+        if client is not None:
+            self.attach(client)
+
+    def attach(self, client):
+        """Route the `@orderbookupdate` and `@orderbook` topics of `client` to
+        the books. Snapshots requested with `request_orderbook` have no topic,
+        they are taken from `on_message`, which still receives them."""
+        self.client = client
+        client.add_handler("*@orderbookupdate", self._on_message)
+        client.add_handler("*@orderbook", self._on_message)
+        on_message = client.on_message
+
+        def _on_message(manager, message):
+            self.process(message)
+            if on_message:
+                return on_message(manager, message)
+
+        client.on_message = _on_message
+        socket_manager = getattr(client, "socket_manager", None)
+        if socket_manager is not None:
+            socket_manager.on_message = _on_message
+
+    def _on_message(self, manager, message):
+        self.process(message)
+
+    def subscribe(self, symbol: str):
+        """Subscribe to `{symbol}@orderbookupdate` and request a snapshot"""
+        self._book(symbol)
+        self._delta_symbols.add(symbol)
+        _stream.get_orderbookupdate(self.client, f"{symbol}@orderbookupdate")
+        self.resync(symbol)
+
+    def unsubscribe(self, symbol: str):
+        self.client.send_message_to_server(
+            {"id": self.client.wss_id, "event": "unsubscribe", "topic": f"{symbol}@orderbookupdate"}
+        )
+        with self._lock:
+            self._delta_symbols.discard(symbol)
+            self.books.pop(symbol, None)
+            self._buffers.pop(symbol, None)
+            self._ready.pop(symbol, None)
+
+    def _book(self, symbol):
+        book = self.books.get(symbol)
+        if book is None:
+            with self._lock:
+                book = self.books.setdefault(symbol, OrderBook(symbol))
+                self._buffers.setdefault(symbol, deque(maxlen=self.max_buffered_updates))
+                self._ready.setdefault(symbol, threading.Event())
+        return book
+
+    def process(self, message):
+        if isinstance(message, (str, bytes, bytearray)):
+            try:
+                message = json.loads(message)
+            except ValueError:
+                return
+        if not isinstance(message, dict):
+            return
+        topic = message.get("topic")
+        data = message.get("data")
+        if not isinstance(data, dict):
+            return
+        if topic:
+            if topic.endswith("@orderbookupdate"):
+                self._on_update(data, message.get("ts"))
+            elif topic.endswith("@orderbook") and data["symbol"] not in self._delta_symbols:
+                # a book kept from deltas is deeper than these pushes and
+                # chained by their `prevTs`
+                self._on_snapshot(data["symbol"], data, message.get("ts"))
+        elif message.get("event") == "request" and "symbol" in data:
+            if message.get("success"):
+                self._on_snapshot(data["symbol"], data, data.get("ts", message.get("ts")))
+            else:
+                self._on_resync_error(data["symbol"], message)
+
+    def _on_update(self, data, ts):
+        symbol = data["symbol"]
+        book = self._book(symbol)
+        self._delta_symbols.add(symbol)
+        prev_ts = data.get("prevTs")
+        with self._lock:
+            if not book.synced:
+                self._buffers[symbol].append((data, ts))
+                need_resync = symbol not in self._resyncing
+            else:
+                need_resync = not book.apply_update(
+                    data.get("bids", ()), data.get("asks", ()), ts, prev_ts
+                )
+                if need_resync:
+                    self.logger.warning(
+                        f"Orderbook gap for {symbol}: prevTs {prev_ts} after {book.ts}, resyncing"
+                    )
+                    self._ready[symbol].clear()
+                    self._buffers[symbol].append((data, ts))
+        if need_resync:
+            self.resync(symbol)
+
+    def _on_snapshot(self, symbol, data, ts):
+        book = self._book(symbol)
+        ts = data.get("timestamp", ts)
+        with self._lock:
+            self._resyncing.discard(symbol)
+            if ts is not None and book.synced and book.ts is not None and ts < book.ts:
+                return
+            book.apply_snapshot(data.get("bids", ()), data.get("asks", ()), ts)
+            buffered, self._buffers[symbol] = self._buffers[symbol], deque(
+                maxlen=self.max_buffered_updates
+            )
+            while buffered:
+                update, update_ts = buffered[0]
+                if not book.apply_update(
+                    update.get("bids", ()), update.get("asks", ()), update_ts, update.get("prevTs")
+                ):
+                    self._buffers[symbol].extend(buffered)
+                    break
+                buffered.popleft()
+            synced = book.synced
+            if synced:
+                self._ready[symbol].set()
+        if synced:
+            self._notify_ready(symbol)
+        else:
+            self.resync(symbol)
+
+    def resync(self, symbol: str):
+        """Request a new snapshot of `symbol`, updates are buffered until it
+        arrives"""
+        with self._lock:
+            if symbol in self._resyncing:
+                return
+            self._resyncing.add(symbol)
+            self.resyncs += 1
+            book = self.books.get(symbol)
+            if book is not None:
+                book.synced = False
+                self._ready[symbol].clear()
+        if self.rest_client is None:
+            _stream.request_orderbook(self.client, "orderbook", symbol)
+            return
+        if isinstance(self.rest_client, AsyncAPI):
+            asyncio.ensure_future(self._resync_async(symbol))
+        else:
+            threading.Thread(target=self._resync_rest, args=(symbol,), daemon=True).start()
+
+    def _resync_rest(self, symbol):
+        try:
+            self._on_rest_snapshot(
+                symbol,
+                self.rest_client.get_orderbook_snapshot(symbol, max_level=self.snapshot_level),
+            )
+        except Exception as e:
+            self._on_resync_error(symbol, e)
+
+    async def _resync_async(self, symbol):
+        try:
+            self._on_rest_snapshot(
+                symbol,
+                await self.rest_client.get_orderbook_snapshot(
+                    symbol, max_level=self.snapshot_level
+                ),
+            )
+        except Exception as e:
+            self._on_resync_error(symbol, e)
+
+    def _on_rest_snapshot(self, symbol, response):
+        if response.get("success"):
+            self._on_snapshot(symbol, response["data"], None)
+        else:
+            self._on_resync_error(symbol, response)
+
+    def _on_resync_error(self, symbol, error):
+        self.logger.error(f"Failed to get orderbook snapshot for {symbol}: {error}")
+        with self._lock:
+            self._resyncing.discard(symbol)
+
+    def _notify_ready(self, symbol):
+        with self._lock:
+            waiters = self._waiters.pop(symbol, ())
+        for loop, future in waiters:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(_set_result, future)
+
+    # queries
+    def get_bbo(self, symbol: str, timeout: float = 0):
+        """Best bid and ask as `[price, quantity]`, None for an empty side.
+        Raises `TimeoutError` if the book is not synced within `timeout`
+        seconds"""
+        with self._synced_book(symbol, timeout) as book:
+            return book.bbo()
+
+    def get_depth(self, symbol: str, depth: int = None, timeout: float = 0):
+        """Top `depth` levels of each side, best price first. Raises
+        `TimeoutError` if the book is not synced within `timeout` seconds"""
+        with self._synced_book(symbol, timeout) as book:
+            return book.depth(depth)
+
+    @contextmanager
+    def _synced_book(self, symbol, timeout):
+        event = self._ready.get(symbol)
+        if event is None:
+            raise ParameterValueError([symbol])
+        if not event.wait(timeout):
+            raise TimeoutError(f"Order book of {symbol} not synced")
+        with self._lock:
+            book = self.books.get(symbol)
+            if book is None or not book.synced:
+                # resyncing or unsubscribed since
+                raise TimeoutError(f"Order book of {symbol} not synced")
+            yield book
+
+    def is_ready(self, symbol: str):
+        event = self._ready.get(symbol)
+        return event is not None and event.is_set()
+
+    def wait_ready(self, symbol: str, timeout: float = None):
+        self._book(symbol)
+        return self._ready[symbol].wait(timeout)
+
+    async def wait_ready_async(self, symbol: str, timeout: float = None):
+        self._book(symbol)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._lock:
+            if self._ready[symbol].is_set():
+                return True
+            self._waiters.setdefault(symbol, []).append((loop, future))
+        try:
+            await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            with self._lock:
+                waiters = self._waiters.get(symbol)
+                if waiters and (loop, future) in waiters:
+                    waiters.remove((loop, future))
+                    if not waiters:
+                        del self._waiters[symbol]
+        return True
+
+    async def get_bbo_async(self, symbol: str, timeout: float = None):
+        """Like `get_bbo`, waiting for the book to be synced first. Raises
+        `TimeoutError` if it is not synced within `timeout` seconds"""
+        if not await self.wait_ready_async(symbol, timeout):
+            raise TimeoutError(f"Order book of {symbol} not synced")
+        return self.get_bbo(symbol)
+
+    async def get_depth_async(self, symbol: str, depth: int = None, timeout: float = None):
+        """Like `get_depth`, waiting for the book to be synced first. Raises
+        `TimeoutError` if it is not synced within `timeout` seconds"""
+        if not await self.wait_ready_async(symbol, timeout):
+            raise TimeoutError(f"Order book of {symbol} not synced")
+        return self.get_depth(symbol, depth)
+
+
+def _set_result(future):
+    if not future.done():
+        future.set_result(True)
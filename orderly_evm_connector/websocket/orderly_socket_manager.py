@@ -1,5 +1,6 @@
 import threading
 import json
+import select
 import time
 from websocket import (
     create_connection,
@@ -8,12 +9,24 @@ from websocket import (
     WebSocketConnectionClosedException,
     WebSocketTimeoutException,
 )
-from orderly_evm_connector.lib.utils import orderlyLog, parse_proxies, decode_ws_error_code
+from orderly_evm_connector.error import ParameterValueError, WebsocketClientError
+from orderly_evm_connector.lib.utils import (
+    orderlyLog,
+    parse_proxies,
+    decode_ws_error_code,
+    get_json_backend,
+    get_ws_topic,
+    may_be_ws_ack,
+    may_be_ws_ping,
+)
 from orderly_evm_connector.lib.constants import (
     WEBSOCKET_TIMEOUT_IN_SECONDS,
     WEBSOCKET_FAILED_MAX_RETRIES,
-    WEBSOCKET_RETRY_SLEEP_TIME,
+    WEBSOCKET_MESSAGE_FORMATS,
+    WEBSOCKET_CONFLATION_MAX_FRAMES,
 )
+from orderly_evm_connector.websocket.reconnect import ReconnectPolicy
+from orderly_evm_connector.websocket.subscriptions import SubscriptionRegistry
 
 
 class OrderlySocketManager(threading.Thread):
@@ -30,6 +43,12 @@ class OrderlySocketManager(threading.Thread):
         debug=False,
         proxies=None,
         max_retries=WEBSOCKET_FAILED_MAX_RETRIES,
+        reconnect_policy=None,
+        message_format="str",
+        json_backend=None,
+        router=None,
+        conflator=None,
+        subscriptions=None,
     ):
         threading.Thread.__init__(self)
         self.websocket_url = websocket_url
@@ -42,14 +61,26 @@ class OrderlySocketManager(threading.Thread):
         self.timeout = timeout
         self.logger = orderlyLog(debug=debug)
         self._proxy_params = parse_proxies(proxies) if proxies else {}
-        self.subscriptions = []
+        self.subscriptions = subscriptions if subscriptions is not None else SubscriptionRegistry()
         self._login = False
         self._stopping = False
+        self.reconnect_policy = reconnect_policy or ReconnectPolicy(max_retries=max_retries)
+        if message_format not in WEBSOCKET_MESSAGE_FORMATS:
+            raise ParameterValueError([message_format])
+        self.message_format = message_format
+        self._json_dumps, self._json_loads = get_json_backend(json_backend)
+        self.router = router
+        self.conflator = conflator
+        self._frames_since_flush = 0
         self.create_ws_connection()
 
-    def create_ws_connection(self):
-        retries = 0
-        while retries <= WEBSOCKET_FAILED_MAX_RETRIES:
+    def create_ws_connection(self, reconnecting=False):
+        attempt = 0
+        while True:
+            if reconnecting:
+                time.sleep(self.reconnect_policy.delay(attempt))
+                if self._stopping:
+                    raise WebsocketClientError("Websocket client stopped while reconnecting")
             try:
                 self.logger.debug(
                     f"Creating connection with WebSocket Server: {self.websocket_url}, proxies: {self._proxy_params}"
@@ -62,42 +93,52 @@ class OrderlySocketManager(threading.Thread):
                 )
                 if self.on_open:
                     self.on_open(self)
-                break
+                return attempt + 1
             except Exception as e:
                 self.logger.error(f"Failed to create WebSocket connection: {e}")
-                retries += 1
-                if retries <= WEBSOCKET_FAILED_MAX_RETRIES:
-                    self.logger.warning(
-                        f"Retrying connection... (Attempt {retries}/{WEBSOCKET_FAILED_MAX_RETRIES})"
-                    )
-                    time.sleep(WEBSOCKET_RETRY_SLEEP_TIME)
-                else:
+                self.reconnect_policy.record_failure()
+                if self._stopping or not self.reconnect_policy.should_retry(attempt):
                     raise
+                attempt += 1
+                self.logger.warning(
+                    f"Retrying connection... (Attempt {attempt}/{self.reconnect_policy.max_retries})"
+                )
+                reconnecting = True
 
     def reconnect(self):
+        """Reconnect with the backoff of `reconnect_policy`. Returns False if
+        the policy gave up and the connection was closed."""
         if self._stopping:
-            return
-        retries = 0
-        while retries <= WEBSOCKET_FAILED_MAX_RETRIES:
-            try:
-                self.create_ws_connection()
-                self._login = False
-                break
-            except Exception as e:
-                self.logger.error(f"Failed to reconnect: {e}")
-                retries += 1
-                if retries <= WEBSOCKET_FAILED_MAX_RETRIES:
-                    self.logger.warning(
-                        f"Retrying connection... (Attempt {retries}/{WEBSOCKET_FAILED_MAX_RETRIES})"
-                    )
-                    time.sleep(WEBSOCKET_RETRY_SLEEP_TIME)
-                else:
-                    raise
+            return False
+        disconnected_at = time.monotonic()
+        try:
+            self.ws.close()
+        except Exception:
+            pass
+        self._login = False
+        try:
+            attempts = self.create_ws_connection(reconnecting=True)
+        except Exception as e:
+            if self._stopping:
+                return False
+            self.reconnect_policy.record_give_up()
+            self.logger.error(f"Giving up reconnecting: {e}")
+            if self.reconnect_policy.give_up == "raise":
+                raise
+            self._stopping = True
+            self._callback(self.on_close)
+            return False
+        self.reconnect_policy.record_reconnect(time.monotonic() - disconnected_at, attempts)
+        return True
 
     def send_message(self, message):
         self.logger.debug("Sending message to Orderly WebSocket Server: %s", message)
         self.ws.send(message)
 
+    def send_messages(self, messages):
+        for message in messages:
+            self.send_message(message)
+
     def run(self):
         self.read_data()
 
@@ -117,13 +158,8 @@ class OrderlySocketManager(threading.Thread):
             err_code = None
             try:
                 op_code, frame = self.ws.recv_data_frame(True)
-                try:
-                    _message = json.loads(frame.data)
-                    if "event" in _message:
-                        if _message["event"] == "ping":
-                            self._handle_heartbeat()
-                except Exception:
-                    err_code = decode_ws_error_code(frame.data)
+                if op_code == ABNF.OPCODE_CLOSE:
+                    err_code = decode_ws_error_code(frame.data[:2])
                     if err_code == "1000":
                         self.logger.info(
                             "Websocket closed normally (code 1000)."
@@ -137,25 +173,26 @@ class OrderlySocketManager(threading.Thread):
                     self.logger.info("WebSocket connection closed by client.")
                     break
                 self.logger.warning("WebSocket connection closed. Reconnecting...")
-                self.reconnect()
+                if not self.reconnect():
+                    break
                 continue
             except WebSocketException as e:
                 if isinstance(e, WebSocketTimeoutException):
                     self.logger.error("Websocket connection timeout")
                 else:
                     self.logger.error(f"Websocket exception: {e}")
-                if self._stopping:
+                if self._stopping or not self.reconnect():
                     break
-                self.reconnect()
                 continue
             except Exception as e:
                 self.logger.error(f"Exception in read_data: {e}")
                 self.logger.warning("Reconnecting...")
-                if self._stopping:
+                if self._stopping or not self.reconnect():
                     break
-                self.reconnect()
                 continue
             self._handle_data(op_code, frame, data)
+            if self.conflator is not None:
+                self._flush_conflated()
 
             if op_code == ABNF.OPCODE_CLOSE:
                 if err_code == "1000":
@@ -167,12 +204,94 @@ class OrderlySocketManager(threading.Thread):
                         "CLOSE frame received, closing websocket connection"
                     )
                 self._callback(self.on_close)
+                if err_code != "1000" and not self._stopping and self.reconnect():
+                    continue
                 break
 
     def _handle_data(self, op_code, frame, data):
-        if op_code == ABNF.OPCODE_TEXT:
-            data = frame.data.decode()
-            self._callback(self.on_message, data)
+        if op_code != ABNF.OPCODE_TEXT:
+            return
+        data = frame.data
+        # every frame is decoded once at most, and only in the `dict` format
+        if self.message_format == "dict":
+            try:
+                message = self._json_loads(data)
+            except ValueError:
+                self.logger.warning(f"Failed to decode websocket message: {data[:200]}")
+                return
+            if isinstance(message, dict) and message.get("event") == "ping":
+                self._handle_heartbeat()
+                return
+            topic = message.get("topic") if isinstance(message, dict) else None
+            if topic is None and isinstance(message, dict) and self.subscriptions.has_pending():
+                self._handle_ack(message)
+        else:
+            message = data if self.message_format == "bytes" else data.decode()
+            if may_be_ws_ping(data) and self._is_ping(data):
+                # answered here and not delivered, like the async manager
+                self._handle_heartbeat()
+                return
+            if self.subscriptions.has_pending() and may_be_ws_ack(data):
+                try:
+                    self._handle_ack(self._json_loads(data))
+                except ValueError:
+                    pass
+            if self.router or self.conflator is not None:
+                topic = get_ws_topic(data)
+            else:
+                topic = None
+        self._dispatch(message, topic)
+
+    def _dispatch(self, message, topic):
+        if self.conflator is not None and self.conflator.offer(topic, message):
+            return
+        self._deliver(message, topic)
+
+    def _flush_conflated(self):
+        """Deliver the conflated messages, on the reader thread like every
+        other message, once the frames already received are read or after
+        `WEBSOCKET_CONFLATION_MAX_FRAMES` frames in a row"""
+        self._frames_since_flush += 1
+        if not self.conflator.has_pending():
+            self._frames_since_flush = 0
+            return
+        if self._frames_since_flush < WEBSOCKET_CONFLATION_MAX_FRAMES and self._data_ready():
+            return
+        self._frames_since_flush = 0
+        for topic, message in self.conflator.drain():
+            self._deliver(message, topic)
+
+    def _data_ready(self):
+        sock = getattr(self.ws, "sock", None)
+        if sock is None:
+            return False
+        try:
+            # TLS records already decrypted are not seen by select
+            if hasattr(sock, "pending") and sock.pending():
+                return True
+            return bool(select.select([sock], [], [], 0)[0])
+        except (OSError, ValueError):
+            return False
+
+    def _deliver(self, message, topic):
+        handlers = self.router.match(topic) if self.router is not None else ()
+        if not handlers:
+            self._callback(self.on_message, message)
+        for handler in handlers:
+            self._callback(handler, message)
+
+    def _handle_ack(self, message):
+        if not isinstance(message, dict) or message.get("event") != "subscribe":
+            return
+        if self.subscriptions.acknowledge(message) is not None and not message.get("success"):
+            self.logger.error(f"Websocket subscription failed: {message}")
+
+    def _is_ping(self, data):
+        try:
+            message = self._json_loads(data)
+        except ValueError:
+            return False
+        return isinstance(message, dict) and message.get("event") == "ping"
 
     def close(self):
         self._stopping = True
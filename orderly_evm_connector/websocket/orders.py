@@ -0,0 +1,284 @@
+import asyncio
+import json
+import threading
+from collections import deque
+
+from orderly_evm_connector.async_api import AsyncAPI
+from orderly_evm_connector.lib.constants import ORDER_STORE_MAX_BUFFERED_REPORTS
+from orderly_evm_connector.lib.utils import orderlyLog
+from orderly_evm_connector.websocket.websocket_api import _private_stream
+
+# an order in any other status is still open
+CLOSED_STATUSES = frozenset({"FILLED", "CANCELLED", "REJECTED", "EXPIRED", "COMPLETED"})
+
+# `executionreport` fields and their name in the rows of `get_orders`
+_REPORT_FIELDS = {
+    "orderId": "order_id",
+    "clientOrderId": "client_order_id",
+    "symbol": "symbol",
+    "side": "side",
+    "type": "type",
+    "price": "price",
+    "quantity": "quantity",
+    "amount": "amount",
+    "visible": "visible",
+    "totalExecutedQuantity": "executed",
+    "avgPrice": "average_executed_price",
+    "totalFee": "total_fee",
+    "feeAsset": "fee_asset",
+    "reduceOnly": "reduce_only",
+    "status": "status",
+    "orderTag": "order_tag",
+    "timestamp": "updated_time",
+}
+
+
+def report_to_row(report: dict):
+    """An `executionreport` in the shape of a `get_orders` row"""
+    row = {_REPORT_FIELDS[k]: v for k, v in report.items() if k in _REPORT_FIELDS}
+    if not row.get("client_order_id"):
+        # sent empty for orders without one
+        row.pop("client_order_id", None)
+    return row
+
+
+class OpenOrderStore(object):
+    """Open orders of an account, kept from the `executionreport` stream.
+
+    The store is seeded from a `get_orders(status="INCOMPLETE")` snapshot,
+    read page by page, and reconciled again after every (re)connection of the
+    private client. Reports received while a snapshot is loading are applied
+    right away and replayed over the snapshot, unless the snapshot row is
+    newer. Orders are indexed by order_id, client_order_id and symbol.
+
+    Queries take a short lock and return copies, so they can be made from any
+    thread without holding up the websocket reader.
+    """
+
+    def __init__(
+        self,
+        client=None,
+        rest_client=None,
+        symbol: str = None,
+        max_buffered_reports: int = ORDER_STORE_MAX_BUFFERED_REPORTS,
+        debug=False,
+    ):
+        self.client = client
+        self.rest_client = rest_client
+        self.symbol = symbol
+        self.max_buffered_reports = max_buffered_reports
+        self.logger = orderlyLog(debug=debug)
+        self.reconciles = 0
+        self._orders = {}
+        self._by_client_order_id = {}
+        self._by_symbol = {}
+        self._buffer = None
+        self._generation = 0
+        self._ready = threading.Event()
+        self._waiters = []
+        self._lock = threading.Lock()
+        if client is not None:
+            self.attach(client)
+
+    def attach(self, client):
+        """Route the `executionreport` topic of `client` to the store and
+        reconcile after each of its (re)connections"""
+        self.client = client
+        client.add_handler("executionreport", self._on_message)
+        client.add_connect_handler(self._on_connect)
+
+    def _on_connect(self, manager):
+        self.reconcile()
+
+    def _on_message(self, manager, message):
+        self.process(message)
+
+    def subscribe(self):
+        """Subscribe to `executionreport` (of `symbol` when set) and load a
+        snapshot"""
+        if self.symbol is None:
+            _private_stream.get_execution_report(self.client)
+        else:
+            _private_stream.get_execution_report_by_symbol(self.client, self.symbol)
+        self.reconcile()
+
+    def process(self, message):
+        if isinstance(message, (str, bytes, bytearray)):
+            try:
+                message = json.loads(message)
+            except ValueError:
+                return
+        if not isinstance(message, dict) or message.get("topic") != "executionreport":
+            return
+        data = message.get("data")
+        for report in data if isinstance(data, list) else [data]:
+            if isinstance(report, dict) and "orderId" in report:
+                self.apply_report(report)
+
+    def apply_report(self, report: dict):
+        row = report_to_row(report)
+        with self._lock:
+            if self._buffer is not None:
+                self._buffer.append(row)
+            self._apply(row)
+
+    def _apply(self, row):
+        order_id = row["order_id"]
+        if self.symbol is not None and row.get("symbol") not in (None, self.symbol):
+            return
+        current = self._orders.get(order_id)
+        if current is not None:
+            updated = current.get("updated_time")
+            if updated is not None and row.get("updated_time") is not None and row["updated_time"] < updated:
+                return
+        if row.get("status") in CLOSED_STATUSES:
+            if current is not None:
+                self._remove(order_id)
+            return
+        if current is None:
+            self._add(dict(row))
+        else:
+            current.update(row)
+            client_order_id = current.get("client_order_id")
+            if client_order_id:
+                self._by_client_order_id[client_order_id] = order_id
+
+    def _add(self, row):
+        order_id = row["order_id"]
+        self._orders[order_id] = row
+        if row.get("client_order_id"):
+            self._by_client_order_id[row["client_order_id"]] = order_id
+        self._by_symbol.setdefault(row.get("symbol"), set()).add(order_id)
+
+    def _remove(self, order_id):
+        row = self._orders.pop(order_id)
+        client_order_id = row.get("client_order_id")
+        if client_order_id and self._by_client_order_id.get(client_order_id) == order_id:
+            del self._by_client_order_id[client_order_id]
+        ids = self._by_symbol.get(row.get("symbol"))
+        if ids is not None:
+            ids.discard(order_id)
+            if not ids:
+                del self._by_symbol[row.get("symbol")]
+
+    def load_snapshot(self, rows, generation=None):
+        """Replace the open orders with `rows` of `get_orders`, then replay the
+        reports received since the snapshot was requested"""
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                # a newer reconcile is running
+                return
+            buffered, self._buffer = self._buffer or (), None
+            overflowed = len(buffered) >= self.max_buffered_reports
+            self._orders = {}
+            self._by_client_order_id = {}
+            self._by_symbol = {}
+            for row in rows:
+                if row.get("status") not in CLOSED_STATUSES:
+                    self._add(dict(row))
+            for row in buffered:
+                self._apply(row)
+            self._ready.set()
+            waiters, self._waiters = self._waiters, []
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_set_result, future)
+        if overflowed:
+            self.logger.warning("Execution reports dropped while loading open orders, reconciling again")
+            self.reconcile()
+
+    def reconcile(self):
+        """Load a new snapshot of the open orders from `rest_client`, in the
+        background"""
+        if self.rest_client is None:
+            return
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+            self._buffer = deque(maxlen=self.max_buffered_reports)
+            self.reconciles += 1
+        if isinstance(self.rest_client, AsyncAPI):
+            asyncio.ensure_future(self._reconcile_async(generation))
+        else:
+            threading.Thread(target=self._reconcile_rest, args=(generation,), daemon=True).start()
+
+    def _reconcile_rest(self, generation):
+        try:
+            rows = list(self.rest_client.iter_orders(symbol=self.symbol, status="INCOMPLETE"))
+        except Exception as e:
+            self._on_reconcile_error(generation, e)
+        else:
+            self.load_snapshot(rows, generation)
+
+    async def _reconcile_async(self, generation):
+        try:
+            rows = [
+                row
+                async for row in self.rest_client.iter_orders(
+                    symbol=self.symbol, status="INCOMPLETE"
+                )
+            ]
+        except Exception as e:
+            self._on_reconcile_error(generation, e)
+        else:
+            self.load_snapshot(rows, generation)
+
+    def _on_reconcile_error(self, generation, error):
+        self.logger.error(f"Failed to load open orders: {error}")
+        with self._lock:
+            if generation == self._generation:
+                self._buffer = None
+
+    # queries
+    def get(self, order_id):
+        """Open order `order_id`, None if it is not open"""
+        with self._lock:
+            row = self._orders.get(order_id)
+            return dict(row) if row is not None else None
+
+    def get_by_client_order_id(self, client_order_id: str):
+        with self._lock:
+            order_id = self._by_client_order_id.get(client_order_id)
+            return dict(self._orders[order_id]) if order_id is not None else None
+
+    def get_open_orders(self, symbol: str = None):
+        """Open orders, of `symbol` when given"""
+        with self._lock:
+            if symbol is None:
+                return [dict(row) for row in self._orders.values()]
+            return [dict(self._orders[i]) for i in self._by_symbol.get(symbol, ())]
+
+    def symbols(self):
+        """Symbols with open orders"""
+        with self._lock:
+            return list(self._by_symbol)
+
+    def __contains__(self, order_id):
+        return order_id in self._orders
+
+    def __len__(self):
+        return len(self._orders)
+
+    def is_ready(self):
+        return self._ready.is_set()
+
+    def wait_ready(self, timeout: float = None):
+        """Wait for the first snapshot, returns False if `timeout` expired"""
+        return self._ready.wait(timeout)
+
+    async def wait_ready_async(self, timeout: float = None):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._lock:
+            if self._ready.is_set():
+                return True
+            self._waiters.append((loop, future))
+        try:
+            await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+
+def _set_result(future):
+    if not future.done():
+        future.set_result(True)
@@ -0,0 +1,212 @@
+import asyncio
+import threading
+import zlib
+from typing import Optional
+
+from orderly_evm_connector.error import ParameterArgumentError
+from orderly_evm_connector.lib.constants import WEBSOCKET_POOL_SHARDS, WEBSOCKET_STREAM_MAXSIZE
+from orderly_evm_connector.lib.utils import get_uuid
+from orderly_evm_connector.websocket.router import TopicRouter
+from orderly_evm_connector.websocket.websocket_api import (
+    WebsocketPublicAPIClient,
+    WebsocketPublicAPIClientAsync,
+)
+
+
+class WebsocketPublicAPIClientPool(object):
+    """Public websocket client spreading its topics across `shards`
+    connections.
+
+    Each shard is a public client with its own connection, reader and
+    reconnects, so one slow or dropped connection does not hold up the
+    others. Every shard delivers to the same `on_message` and the same
+    topic handlers (`add_handler`, `stream`).
+
+    A topic goes to the shard of `crc32(topic) % shards`, or with `weights`,
+    to the least loaded shard. `weights` maps a topic or a stream pattern
+    (`*@orderbookupdate`) to its load, 1 when not listed.
+
+    The subscription methods are the ones of `WebsocketPublicAPIClient`;
+    with `async_mode=True`, `await pool.run()` connects every shard first.
+    """
+
+    def __init__(
+        self,
+        shards: int = WEBSOCKET_POOL_SHARDS,
+        weights: Optional[dict] = None,
+        async_mode=False,
+        orderly_testnet=False,
+        orderly_account_id=None,
+        wss_id=None,
+        timeout=None,
+        debug=False,
+        proxies: Optional[dict] = None,
+        on_message=None,
+        on_open=None,
+        on_close=None,
+        on_error=None,
+        reconnect_policy=None,
+        message_format=None,
+        json_backend=None,
+        conflate=None,
+    ):
+        if shards < 1:
+            raise ParameterArgumentError("shards has to be at least 1")
+        self.wss_id = wss_id if wss_id else get_uuid()
+        self.weights = weights
+        self.async_mode = async_mode
+        self.router = TopicRouter()
+        self._assignments = {}
+        self._loads = [0] * shards
+        # a topic keeps its shard and load while subscribed with
+        # `send_message_to_server` or held by an open stream
+        self._subscribed = set()
+        self._streams = {}
+        self._lock = threading.Lock()
+        client_class = WebsocketPublicAPIClientAsync if async_mode else WebsocketPublicAPIClient
+        self.clients = [
+            client_class(
+                orderly_testnet=orderly_testnet,
+                orderly_account_id=orderly_account_id,
+                wss_id=self.wss_id,
+                timeout=timeout,
+                debug=debug,
+                proxies=proxies,
+                on_message=on_message,
+                on_open=on_open,
+                on_close=on_close,
+                on_error=on_error,
+                reconnect_policy=reconnect_policy,
+                message_format=message_format,
+                json_backend=json_backend,
+                conflate=conflate,
+                router=self.router,
+            )
+            for _ in range(shards)
+        ]
+
+    async def run(self):
+        await asyncio.gather(*(client.run() for client in self.clients))
+
+    def _weight(self, topic):
+        weight = self.weights.get(topic)
+        if weight is None and "@" in topic:
+            weight = self.weights.get("*@" + topic.split("@", 1)[1])
+        return 1 if weight is None else weight
+
+    def shard_for(self, topic: str):
+        """Index of the shard carrying `topic`, assigned on first use"""
+        with self._lock:
+            shard = self._assignments.get(topic)
+            if shard is None:
+                if self.weights is None:
+                    shard = zlib.crc32(topic.encode()) % len(self.clients)
+                    weight = 1
+                else:
+                    weight = self._weight(topic)
+                    shard = self._loads.index(min(self._loads))
+                self._assignments[topic] = shard
+                self._loads[shard] += weight
+            return shard
+
+    def _release(self, topic):
+        with self._lock:
+            if topic in self._subscribed or self._streams.get(topic):
+                return
+            shard = self._assignments.pop(topic, None)
+            if shard is not None:
+                self._loads[shard] -= 1 if self.weights is None else self._weight(topic)
+
+    def send_message_to_server(self, message: dict):
+        topic = message.get("topic")
+        client = self.clients[self.shard_for(topic)] if topic else self.clients[0]
+        if topic and message.get("event") == "subscribe":
+            with self._lock:
+                self._subscribed.add(topic)
+        elif topic and message.get("event") == "unsubscribe":
+            with self._lock:
+                self._subscribed.discard(topic)
+            self._release(topic)
+        return client.send_message_to_server(message)
+
+    def send(self, message: dict):
+        # requests are answered on the connection they are sent on, every
+        # shard delivers to the same on_message
+        self.clients[0].send(message)
+
+    def add_handler(self, topic: str, handler):
+        self.router.add(topic, handler)
+
+    def remove_handler(self, topic: str, handler=None):
+        self.router.remove(topic, handler)
+
+    def stream(
+        self,
+        topic: str,
+        maxsize: int = WEBSOCKET_STREAM_MAXSIZE,
+        overflow: str = "drop_oldest",
+        subscribe: bool = True,
+    ):
+        """`TopicStream` of `topic`, subscribed on its shard, see
+        `OrderlyWebsocketClient.stream`"""
+        if "*" in topic:
+            return self.clients[0].stream(topic, maxsize, overflow, subscribe=False)
+        client = self.clients[self.shard_for(topic)]
+        stream = client.stream(topic, maxsize, overflow, subscribe)
+        with self._lock:
+            self._streams[topic] = self._streams.get(topic, 0) + 1
+        close_stream = stream._on_close
+
+        def _close_stream(stream):
+            close_stream(stream)
+            with self._lock:
+                self._streams[topic] -= 1
+                if not self._streams[topic]:
+                    del self._streams[topic]
+            # the load is released with the last stream of the topic, unless
+            # it is also subscribed without a stream
+            self._release(topic)
+
+        stream._on_close = _close_stream
+        return stream
+
+    def shard_stats(self):
+        """Topics and load of each shard"""
+        with self._lock:
+            topics = [0] * len(self.clients)
+            for shard in self._assignments.values():
+                topics[shard] += 1
+            return [
+                {"topics": count, "load": load} for count, load in zip(topics, self._loads)
+            ]
+
+    def stop(self):
+        for client in self.clients:
+            client.stop()
+
+    async def stop_async(self):
+        await asyncio.gather(*(client.stop_async() for client in self.clients))
+
+    from orderly_evm_connector.websocket.websocket_api._stream import request_orderbook
+    from orderly_evm_connector.websocket.websocket_api._stream import get_orderbook
+    from orderly_evm_connector.websocket.websocket_api._stream import get_orderbookupdate
+    from orderly_evm_connector.websocket.websocket_api._stream import get_trade
+    from orderly_evm_connector.websocket.websocket_api._stream import get_24h_ticker
+    from orderly_evm_connector.websocket.websocket_api._stream import get_24h_tickers
+    from orderly_evm_connector.websocket.websocket_api._stream import get_24h_ticker_by_builder
+    from orderly_evm_connector.websocket.websocket_api._stream import get_24h_tickers_by_builder
+    from orderly_evm_connector.websocket.websocket_api._stream import get_bbo
+    from orderly_evm_connector.websocket.websocket_api._stream import get_bbos
+    from orderly_evm_connector.websocket.websocket_api._stream import get_kline
+    from orderly_evm_connector.websocket.websocket_api._stream import get_market_price_changes_info
+    from orderly_evm_connector.websocket.websocket_api._stream import get_traders_open_interest
+    from orderly_evm_connector.websocket.websocket_api._stream import get_price_for_small_charts
+    from orderly_evm_connector.websocket.websocket_api._stream import get_index_price
+    from orderly_evm_connector.websocket.websocket_api._stream import get_index_prices
+    from orderly_evm_connector.websocket.websocket_api._stream import get_mark_price
+    from orderly_evm_connector.websocket.websocket_api._stream import get_mark_prices
+    from orderly_evm_connector.websocket.websocket_api._stream import get_open_interest
+    from orderly_evm_connector.websocket.websocket_api._stream import get_estimated_funding_rate
+    from orderly_evm_connector.websocket.websocket_api._stream import get_liquidation_push
+    from orderly_evm_connector.websocket.websocket_api._stream import get_system_maintenance_status
+    from orderly_evm_connector.websocket.websocket_api._stream import get_announcement
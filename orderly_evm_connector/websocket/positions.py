@@ -0,0 +1,371 @@
+import asyncio
+import json
+import re
+import threading
+from typing import NamedTuple
+
+from orderly_evm_connector.async_api import AsyncAPI
+from orderly_evm_connector.lib.utils import orderlyLog
+from orderly_evm_connector.websocket.websocket_api import _private_stream, _stream
+
+_CAMEL = re.compile(r"(?<!^)(?=[A-Z])")
+
+
+class Position(NamedTuple):
+    symbol: str
+    position_qty: float
+    cost_position: float
+    average_open_price: float
+    mark_price: float
+    unrealized_pnl: float
+    unsettled_pnl: float
+    mmr: float
+    imr: float
+    timestamp: int
+
+
+class Balance(NamedTuple):
+    token: str
+    holding: float
+    frozen: float
+    pending_short: float
+    updated_time: int
+
+
+class AccountState(NamedTuple):
+    """One consistent view of the account, never modified once published"""
+
+    positions: dict
+    balances: dict
+    account: dict
+    unrealized_pnl: float
+    ts: int
+
+
+EMPTY_STATE = AccountState({}, {}, {}, 0.0, None)
+
+
+def _position(symbol, qty, cost, average_open_price, mark_price, unsettled_pnl, mmr, imr, timestamp):
+    qty, cost, mark_price = float(qty or 0), float(cost or 0), float(mark_price or 0)
+    return Position(
+        symbol,
+        qty,
+        cost,
+        float(average_open_price or 0),
+        mark_price,
+        qty * mark_price - cost,
+        float(unsettled_pnl or 0),
+        float(mmr or 0),
+        float(imr or 0),
+        timestamp,
+    )
+
+
+def position_from_push(row: dict):
+    """A `Position` from a row of the `position` topic"""
+    return _position(
+        row["symbol"],
+        row.get("positionQty"),
+        row.get("costPosition"),
+        row.get("averageOpenPrice"),
+        row.get("markPrice"),
+        row.get("unsettledPnl"),
+        row.get("mmr"),
+        row.get("imr"),
+        row.get("timestamp"),
+    )
+
+
+def position_from_row(row: dict):
+    """A `Position` from a row of `get_all_positions_info`"""
+    return _position(
+        row["symbol"],
+        row.get("position_qty"),
+        row.get("cost_position"),
+        row.get("average_open_price"),
+        row.get("mark_price"),
+        row.get("unsettled_pnl"),
+        row.get("mmr"),
+        row.get("imr"),
+        row.get("timestamp"),
+    )
+
+
+def _snake_case(data):
+    return {_CAMEL.sub("_", key).lower(): value for key, value in data.items()}
+
+
+class PositionEngine(object):
+    """Positions, balances and account of an account, kept from the
+    `position`, `balance` and `account` private topics.
+
+    The unrealized PnL of each position, `position_qty * mark_price -
+    cost_position`, and the account total are updated by the `markprices`
+    topic of a public client, only for the symbols whose price moved. After
+    every (re)connection of the private client the state is reloaded with
+    `get_all_positions_info`, `get_current_holdings` and
+    `get_account_information`; pushes received meanwhile are replayed over it.
+
+    Updates build a new `AccountState` and publish it with a single
+    assignment, so `state` and the queries are read without any lock from
+    any thread or coroutine.
+    """
+
+    def __init__(self, client=None, public_client=None, rest_client=None, debug=False):
+        self.client = client
+        self.public_client = public_client
+        self.rest_client = rest_client
+        self.logger = orderlyLog(debug=debug)
+        self.state = EMPTY_STATE
+        self.resyncs = 0
+        self._marks = {}
+        # time a position was closed, to ignore older pushes
+        self._closed = {}
+        self._buffer = None
+        self._generation = 0
+        self._ready = threading.Event()
+        self._waiters = []
+        # serializes the writers, readers never take it
+        self._lock = threading.Lock()
+        if client is not None:
+            self.attach(client)
+        if public_client is not None:
+            self.attach_public(public_client)
+
+    def attach(self, client):
+        """Route the private topics of `client` to the engine and resync after
+        each of its (re)connections"""
+        self.client = client
+        for topic in ("position", "balance", "account"):
+            client.add_handler(topic, self._on_message)
+        client.add_connect_handler(self._on_connect)
+
+    def _on_connect(self, manager):
+        self.resync()
+
+    def attach_public(self, public_client):
+        self.public_client = public_client
+        public_client.add_handler("markprices", self._on_message)
+
+    def _on_message(self, manager, message):
+        self.process(message)
+
+    def subscribe(self):
+        """Subscribe to the private topics, and `markprices` when a public
+        client is attached, then load the state from `rest_client`"""
+        _private_stream.get_position(self.client)
+        _private_stream.get_balance(self.client)
+        _private_stream.get_account(self.client)
+        if self.public_client is not None:
+            _stream.get_mark_prices(self.public_client)
+        self.resync()
+
+    def process(self, message):
+        if isinstance(message, (str, bytes, bytearray)):
+            try:
+                message = json.loads(message)
+            except ValueError:
+                return
+        if not isinstance(message, dict):
+            return
+        topic = message.get("topic")
+        data = message.get("data")
+        if topic == "markprices":
+            self.update_mark_prices(data or (), message.get("ts"))
+        elif topic in ("position", "balance", "account") and isinstance(data, dict):
+            with self._lock:
+                if self._buffer is not None:
+                    self._buffer.append((topic, data, message.get("ts")))
+                self._publish(self._apply(self.state, topic, data, message.get("ts")))
+
+    def _apply(self, state, topic, data, ts):
+        if topic == "position":
+            positions = dict(state.positions)
+            for row in data.get("positions") or ():
+                symbol = row["symbol"]
+                current = positions.get(symbol)
+                updated = current.timestamp if current is not None else self._closed.get(symbol)
+                if updated is not None and row.get("timestamp") is not None and row["timestamp"] < updated:
+                    continue
+                position = position_from_push(row)
+                mark_price = self._marks.get(symbol)
+                if mark_price is not None:
+                    position = _with_mark_price(position, mark_price)
+                if position.position_qty:
+                    positions[symbol] = position
+                    self._closed.pop(symbol, None)
+                else:
+                    positions.pop(symbol, None)
+                    self._closed[symbol] = position.timestamp
+            return _state(state, positions=positions, ts=ts)
+        if topic == "balance":
+            balances = dict(state.balances)
+            for token, row in (data.get("balances") or {}).items():
+                balances[token] = Balance(
+                    token,
+                    float(row.get("holding") or 0),
+                    float(row.get("frozen") or 0),
+                    float(row.get("pendingShortQty") or 0),
+                    ts,
+                )
+            return state._replace(balances=balances, ts=ts)
+        return state._replace(account={**state.account, **_snake_case(data)}, ts=ts)
+
+    def update_mark_prices(self, prices, ts=None):
+        """Apply `markprices` rows, `[{"symbol", "price"}]`"""
+        with self._lock:
+            state = self.state
+            positions = None
+            total = state.unrealized_pnl
+            for row in prices:
+                symbol, price = row["symbol"], float(row["price"])
+                self._marks[symbol] = price
+                position = state.positions.get(symbol)
+                if position is None or position.mark_price == price:
+                    continue
+                if positions is None:
+                    positions = dict(state.positions)
+                updated = _with_mark_price(position, price)
+                total += updated.unrealized_pnl - position.unrealized_pnl
+                positions[symbol] = updated
+            if positions is not None:
+                self._publish(state._replace(positions=positions, unrealized_pnl=total, ts=ts))
+
+    def load_snapshot(self, positions_response, holdings_response=None, account_response=None, generation=None):
+        """Replace the state with the responses of `get_all_positions_info`,
+        `get_current_holdings` and `get_account_information`, then replay the
+        pushes received since they were requested"""
+        rows = ((positions_response or {}).get("data") or {}).get("rows") or ()
+        positions = {}
+        for row in rows:
+            position = position_from_row(row)
+            if position.position_qty:
+                positions[position.symbol] = position
+        balances = {}
+        for row in ((holdings_response or {}).get("data") or {}).get("holding") or ():
+            balances[row["token"]] = Balance(
+                row["token"],
+                float(row.get("holding") or 0),
+                float(row.get("frozen") or 0),
+                float(row.get("pending_short") or 0),
+                row.get("updated_time"),
+            )
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                # a newer resync is running
+                return
+            for symbol, position in positions.items():
+                if symbol in self._marks:
+                    positions[symbol] = _with_mark_price(position, self._marks[symbol])
+            account = dict(self.state.account)
+            account.update(((account_response or {}).get("data")) or {})
+            state = _state(self.state, positions=positions, balances=balances, account=account)
+            buffered, self._buffer = self._buffer or (), None
+            self._closed = {}
+            for topic, data, ts in buffered:
+                state = self._apply(state, topic, data, ts)
+            self._publish(state)
+            self._ready.set()
+            waiters, self._waiters = self._waiters, []
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_set_result, future)
+
+    def _publish(self, state):
+        self.state = state
+
+    def resync(self):
+        """Reload the state from `rest_client`, in the background"""
+        if self.rest_client is None:
+            return
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+            self._buffer = []
+            self.resyncs += 1
+        if isinstance(self.rest_client, AsyncAPI):
+            asyncio.ensure_future(self._resync_async(generation))
+        else:
+            threading.Thread(target=self._resync_rest, args=(generation,), daemon=True).start()
+
+    def _resync_rest(self, generation):
+        try:
+            responses = (
+                self.rest_client.get_all_positions_info(),
+                self.rest_client.get_current_holdings(),
+                self.rest_client.get_account_information(),
+            )
+        except Exception as e:
+            self._on_resync_error(generation, e)
+        else:
+            self.load_snapshot(*responses, generation=generation)
+
+    async def _resync_async(self, generation):
+        try:
+            responses = await asyncio.gather(
+                self.rest_client.get_all_positions_info(),
+                self.rest_client.get_current_holdings(),
+                self.rest_client.get_account_information(),
+            )
+        except Exception as e:
+            self._on_resync_error(generation, e)
+        else:
+            self.load_snapshot(*responses, generation=generation)
+
+    def _on_resync_error(self, generation, error):
+        self.logger.error(f"Failed to load positions and balances: {error}")
+        with self._lock:
+            if generation == self._generation:
+                self._buffer = None
+
+    # queries, lock free
+    def get_position(self, symbol: str):
+        """`Position` of `symbol`, None if flat"""
+        return self.state.positions.get(symbol)
+
+    def get_positions(self):
+        return list(self.state.positions.values())
+
+    def get_balance(self, token: str = "USDC"):
+        return self.state.balances.get(token)
+
+    def get_unrealized_pnl(self):
+        return self.state.unrealized_pnl
+
+    def is_ready(self):
+        return self._ready.is_set()
+
+    def wait_ready(self, timeout: float = None):
+        """Wait for the first snapshot, returns False if `timeout` expired"""
+        return self._ready.wait(timeout)
+
+    async def wait_ready_async(self, timeout: float = None):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._lock:
+            if self._ready.is_set():
+                return True
+            self._waiters.append((loop, future))
+        try:
+            await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+
+def _with_mark_price(position, mark_price):
+    return position._replace(
+        mark_price=mark_price,
+        unrealized_pnl=position.position_qty * mark_price - position.cost_position,
+    )
+
+
+def _state(state, ts=None, **changes):
+    """`state` with new positions, the unrealized PnL total recomputed"""
+    positions = changes.get("positions", state.positions)
+    total = sum(position.unrealized_pnl for position in positions.values())
+    return state._replace(unrealized_pnl=total, ts=ts if ts is not None else state.ts, **changes)
+
+
+def _set_result(future):
+    if not future.done():
+        future.set_result(True)
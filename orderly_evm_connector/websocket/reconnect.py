@@ -0,0 +1,121 @@
+import random
+import threading
+
+from orderly_evm_connector.error import ParameterArgumentError, ParameterValueError
+from orderly_evm_connector.lib.constants import (
+    WEBSOCKET_FAILED_MAX_RETRIES,
+    WEBSOCKET_RECONNECT_INITIAL_DELAY,
+    WEBSOCKET_RECONNECT_JITTER,
+    WEBSOCKET_RECONNECT_MULTIPLIER,
+    WEBSOCKET_RETRY_SLEEP_TIME,
+)
+
+
+class ReconnectPolicy(object):
+    """Exponential backoff with jitter for websocket (re)connections.
+
+    The delay before retry `attempt` (starting at 0) is
+    `min(max_delay, initial_delay * multiplier ** attempt)`, reduced by a
+    random fraction of up to `jitter` so that clients dropped at the same
+    time do not reconnect at the same time.
+
+    Args:
+        initial_delay(float): delay before the first retry, in seconds
+        max_delay(float): upper bound of the delay, in seconds
+        multiplier(float): growth factor of the delay between attempts
+        jitter(float): 0 (no jitter) to 1 (delay drawn from [0, delay])
+        max_retries(int): attempts before giving up, None to retry forever
+        give_up(str): `raise` the last connection error, or `close` the
+            connection and call `on_close`
+
+    A policy can be shared by several managers; `stats()` then aggregates
+    their reconnects.
+    """
+
+    GIVE_UP_BEHAVIOURS = ("raise", "close")
+
+    def __init__(
+        self,
+        initial_delay: float = WEBSOCKET_RECONNECT_INITIAL_DELAY,
+        max_delay: float = WEBSOCKET_RETRY_SLEEP_TIME,
+        multiplier: float = WEBSOCKET_RECONNECT_MULTIPLIER,
+        jitter: float = WEBSOCKET_RECONNECT_JITTER,
+        max_retries: int = WEBSOCKET_FAILED_MAX_RETRIES,
+        give_up: str = "raise",
+        random_func=random.random,
+    ):
+        if give_up not in self.GIVE_UP_BEHAVIOURS:
+            raise ParameterValueError([give_up])
+        if not 0 <= jitter <= 1:
+            raise ParameterArgumentError("jitter has to be between 0 and 1")
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.max_retries = max_retries
+        self.give_up = give_up
+        self._random = random_func
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def should_retry(self, attempt: int):
+        return self.max_retries is None or attempt < self.max_retries
+
+    def delay(self, attempt: int):
+        delay = min(self.max_delay, self.initial_delay * self.multiplier ** attempt)
+        return delay * (1 - self.jitter * self._random())
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+
+    def record_reconnect(self, latency: float, attempts: int):
+        """Record a reconnect that took `latency` seconds from the disconnect
+        and `attempts` connection attempts"""
+        with self._lock:
+            self._reconnects += 1
+            self._attempts += attempts
+            self._latencies.append(latency)
+            if len(self._latencies) > 1000:
+                del self._latencies[:500]
+            self._last_latency = latency
+            self._max_latency = max(self._max_latency, latency)
+            self._total_latency += latency
+
+    def record_give_up(self):
+        with self._lock:
+            self._give_ups += 1
+
+    def stats(self):
+        with self._lock:
+            latencies = sorted(self._latencies)
+            return {
+                "reconnects": self._reconnects,
+                "attempts": self._attempts,
+                "failures": self._failures,
+                "give_ups": self._give_ups,
+                "last_latency": self._last_latency,
+                "max_latency": self._max_latency,
+                "mean_latency": self._total_latency / self._reconnects
+                if self._reconnects
+                else None,
+                "p50_latency": _percentile(latencies, 0.5),
+                "p99_latency": _percentile(latencies, 0.99),
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self._reconnects = 0
+            self._attempts = 0
+            self._failures = 0
+            self._give_ups = 0
+            self._latencies = []
+            self._last_latency = None
+            self._max_latency = 0.0
+            self._total_latency = 0.0
+
+
+def _percentile(values, q):
+    if not values:
+        return None
+    return values[min(int(q * len(values)), len(values) - 1)]
@@ -0,0 +1,65 @@
+import threading
+
+
+class TopicRouter(object):
+    """Maps websocket topics to handlers.
+
+    Patterns are an exact topic (`PERP_ETH_USDC@bbo`, `executionreport`), a
+    stream for every symbol (`*@bbo`), every stream of a symbol
+    (`PERP_ETH_USDC@*`) or `*` for every topic. The handlers of a topic are
+    resolved once and cached until the routes change, so dispatching a
+    message is a dict lookup.
+    """
+
+    def __init__(self):
+        self._routes = {}
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def add(self, pattern: str, handler):
+        with self._lock:
+            handlers = self._routes.setdefault(pattern, [])
+            if handler not in handlers:
+                handlers.append(handler)
+            self._cache = {}
+
+    def remove(self, pattern: str, handler=None):
+        """Remove `handler`, or every handler when None, from `pattern`"""
+        with self._lock:
+            handlers = self._routes.get(pattern)
+            if not handlers:
+                return
+            if handler is None:
+                del self._routes[pattern]
+            elif handler in handlers:
+                handlers.remove(handler)
+                if not handlers:
+                    del self._routes[pattern]
+            self._cache = {}
+
+    def match(self, topic):
+        """Handlers of `topic`, an empty tuple if none"""
+        if topic is None or not self._routes:
+            return ()
+        cache = self._cache
+        handlers = cache.get(topic)
+        if handlers is None:
+            handlers = cache[topic] = self._resolve(topic)
+        return handlers
+
+    def _resolve(self, topic):
+        routes = self._routes
+        patterns = [topic]
+        if "@" in topic:
+            symbol, stream = topic.split("@", 1)
+            patterns += [f"*@{stream}", f"{symbol}@*"]
+        patterns.append("*")
+        handlers = []
+        for pattern in patterns:
+            for handler in routes.get(pattern, ()):
+                if handler not in handlers:
+                    handlers.append(handler)
+        return tuple(handlers)
+
+    def __bool__(self):
+        return bool(self._routes)
@@ -0,0 +1,94 @@
+import asyncio
+
+from orderly_evm_connector.error import ParameterValueError
+from orderly_evm_connector.lib.constants import WEBSOCKET_STREAM_MAXSIZE
+
+_CLOSED = object()
+
+
+class TopicStream(object):
+    """Async iterator over the messages of one topic.
+
+    Messages are put in a bounded `asyncio.Queue` by the websocket reader.
+    `overflow` decides what happens when the consumer falls behind:
+
+        drop_oldest: the oldest queued message is dropped once the queue is
+            full (default)
+        conflate: every new message replaces the queued one, only the newest
+            is kept
+        block: the reader waits for the consumer, no message is lost but
+            heartbeats and every other topic wait too
+
+    `dropped` counts the messages lost to `drop_oldest` and `conflate`.
+    """
+
+    OVERFLOW_POLICIES = ("drop_oldest", "conflate", "block")
+
+    def __init__(
+        self,
+        topic: str,
+        maxsize: int = WEBSOCKET_STREAM_MAXSIZE,
+        overflow: str = "drop_oldest",
+        on_close=None,
+    ):
+        if overflow not in self.OVERFLOW_POLICIES:
+            raise ParameterValueError([overflow])
+        self.topic = topic
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.dropped = 0
+        self.closed = False
+        self._queue = asyncio.Queue(maxsize)
+        self._on_close = on_close
+        self.handler = self._put if overflow == "block" else self._put_nowait
+
+    def _put_nowait(self, manager, message):
+        queue = self._queue
+        if self.overflow == "conflate":
+            # at most the newest message is pending
+            while not queue.empty():
+                queue.get_nowait()
+                self.dropped += 1
+        elif queue.full():
+            queue.get_nowait()
+            self.dropped += 1
+        queue.put_nowait(message)
+
+    async def _put(self, manager, message):
+        await self._queue.put(message)
+
+    def qsize(self):
+        return self._queue.qsize()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.closed and self._queue.empty():
+            raise StopAsyncIteration
+        message = await self._queue.get()
+        if message is _CLOSED:
+            raise StopAsyncIteration
+        return message
+
+    async def get(self, timeout: float = None):
+        """Next message, raises `asyncio.TimeoutError` after `timeout` seconds"""
+        return await asyncio.wait_for(self.__anext__(), timeout)
+
+    def close(self):
+        """Stop the stream, messages already queued are still returned"""
+        if self.closed:
+            return
+        self.closed = True
+        if self._on_close:
+            self._on_close(self)
+        # a full queue has no consumer waiting to wake up, `__anext__` stops
+        # once it is drained
+        if not self._queue.full():
+            self._queue.put_nowait(_CLOSED)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,131 @@
+import threading
+
+PENDING = "pending"
+ACKED = "acked"
+FAILED = "failed"
+
+
+class SubscriptionRegistry(object):
+    """Subscriptions of a websocket client, keyed by topic and params.
+
+    Each subscription is `pending` until the server answers its subscribe
+    message, then `acked` or `failed`. A topic is subscribed once however
+    many times it is added, unless it failed, and every live subscription is
+    sent once when the connection is reopened.
+
+    Iterating the registry yields the subscribe messages.
+    """
+
+    def __init__(self):
+        self._messages = {}
+        self._states = {}
+        self._errors = {}
+        self._keys_by_topic = {}
+        # pending keys, oldest first
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(message: dict):
+        topic = message.get("topic")
+        params = message.get("params")
+        if not params:
+            return topic
+        return (topic, tuple(sorted(params.items())))
+
+    def add(self, message: dict):
+        """Register a subscribe message. Returns False, and keeps the first
+        message, when the subscription is already pending or acked."""
+        key = self.key(message)
+        with self._lock:
+            if self._states.get(key, FAILED) != FAILED:
+                return False
+            self._messages[key] = message
+            self._keys_by_topic.setdefault(message.get("topic"), {})[key] = None
+            self._set_pending(key)
+            return True
+
+    def remove(self, message: dict):
+        """Remove the subscription of an unsubscribe message, every
+        subscription of its topic when it has no params"""
+        topic = message.get("topic")
+        with self._lock:
+            if message.get("params"):
+                keys = [self.key(message)]
+            else:
+                keys = list(self._keys_by_topic.get(topic, ()))
+            for key in keys:
+                if self._messages.pop(key, None) is None:
+                    continue
+                self._states.pop(key, None)
+                self._errors.pop(key, None)
+                self._pending.pop(key, None)
+                topic_keys = self._keys_by_topic.get(topic)
+                topic_keys.pop(key, None)
+                if not topic_keys:
+                    del self._keys_by_topic[topic]
+
+    def acknowledge(self, response: dict):
+        """Update the state of the subscription answered by a subscribe
+        `response`. Returns its key, None if no subscription is pending."""
+        with self._lock:
+            if not self._pending:
+                return None
+            key = None
+            for topic_key in self._keys_by_topic.get(response.get("data"), ()):
+                if topic_key in self._pending:
+                    key = topic_key
+                    break
+            if key is None:
+                # responses without the topic answer the oldest subscription
+                key = next(iter(self._pending))
+            del self._pending[key]
+            if response.get("success"):
+                self._states[key] = ACKED
+            else:
+                self._states[key] = FAILED
+                self._errors[key] = response.get("errorMsg") or response
+            return key
+
+    def replay(self):
+        """Subscribe messages to send on a new connection, failed ones
+        included. They are all pending again."""
+        with self._lock:
+            for key in self._messages:
+                self._set_pending(key)
+            return list(self._messages.values())
+
+    def _set_pending(self, key):
+        self._states[key] = PENDING
+        self._errors.pop(key, None)
+        self._pending[key] = None
+
+    def state(self, topic: str, params: dict = None):
+        """`pending`, `acked`, `failed` or None if not subscribed"""
+        return self._states.get(self.key({"topic": topic, "params": params}))
+
+    def error(self, topic: str, params: dict = None):
+        return self._errors.get(self.key({"topic": topic, "params": params}))
+
+    def has_pending(self):
+        return bool(self._pending)
+
+    def topics(self):
+        return list(self._keys_by_topic)
+
+    def stats(self):
+        """Number of subscriptions in each state"""
+        with self._lock:
+            stats = {PENDING: 0, ACKED: 0, FAILED: 0}
+            for state in self._states.values():
+                stats[state] += 1
+            return stats
+
+    def __contains__(self, topic):
+        return topic in self._keys_by_topic
+
+    def __iter__(self):
+        return iter(list(self._messages.values()))
+
+    def __len__(self):
+        return len(self._messages)
@@ -20,6 +20,11 @@ class WebsocketPublicAPIClient(OrderlyWebsocketClient):
         on_open=None,
         on_close=None,
         on_error=None,
+        reconnect_policy=None,
+        message_format=None,
+        json_backend=None,
+        conflate=None,
+        router=None,
     ):
         _, self.orderly_websocket_public_endpoint, _ = get_endpoints(orderly_testnet)
         super().__init__(
@@ -34,6 +39,11 @@ class WebsocketPublicAPIClient(OrderlyWebsocketClient):
             timeout=timeout,
             debug=debug,
             proxies=proxies,
+            reconnect_policy=reconnect_policy,
+            message_format=message_format,
+            json_backend=json_backend,
+            conflate=conflate,
+            router=router,
         )
 
     from orderly_evm_connector.websocket.websocket_api._stream import request_orderbook
@@ -76,6 +86,11 @@ class WebsocketPublicAPIClientAsync(OrderlyWebsocketClient):
         on_open=None,
         on_close=None,
         on_error=None,
+        reconnect_policy=None,
+        message_format=None,
+        json_backend=None,
+        conflate=None,
+        router=None,
     ):
         _, self.orderly_websocket_public_endpoint, _ = get_endpoints(orderly_testnet)
         super().__init__(
@@ -91,6 +106,11 @@ class WebsocketPublicAPIClientAsync(OrderlyWebsocketClient):
             timeout=timeout,
             debug=debug,
             proxies=proxies,
+            reconnect_policy=reconnect_policy,
+            message_format=message_format,
+            json_backend=json_backend,
+            conflate=conflate,
+            router=router,
         )
 
     # public websocket
@@ -226,6 +246,11 @@ class WebsocketPrivateAPIClient(OrderlyWebsocketClient):
         on_open=None,
         on_close=None,
         on_error=None,
+        signer=None,
+        reconnect_policy=None,
+        message_format=None,
+        json_backend=None,
+        conflate=None,
     ):
         _, _, self.orderly_websocket_private_endpoint = get_endpoints(orderly_testnet)
         super().__init__(
@@ -242,6 +267,11 @@ class WebsocketPrivateAPIClient(OrderlyWebsocketClient):
             on_open=on_open,
             on_close=on_close,
             on_error=on_error,
+            signer=signer,
+            reconnect_policy=reconnect_policy,
+            message_format=message_format,
+            json_backend=json_backend,
+            conflate=conflate,
         )
 
     # private websocket
@@ -268,6 +298,12 @@ class WebsocketPrivateAPIClientAsync(OrderlyWebsocketClient):
         on_open=None,
         on_close=None,
         on_error=None,
+        signer=None,
+        reconnect_policy=None,
+        message_format=None,
+        json_backend=None,
+        conflate=None,
+        connect_semaphore=None,
     ):
         _, _, self.orderly_websocket_private_endpoint = get_endpoints(orderly_testnet)
         super().__init__(
@@ -285,6 +321,12 @@ class WebsocketPrivateAPIClientAsync(OrderlyWebsocketClient):
             on_open=on_open,
             on_close=on_close,
             on_error=on_error,
+            signer=signer,
+            reconnect_policy=reconnect_policy,
+            message_format=message_format,
+            json_backend=json_backend,
+            conflate=conflate,
+            connect_semaphore=connect_semaphore,
         )
         
     # private websocket
@@ -1,15 +1,23 @@
 import asyncio
+import inspect
 import json
 from typing import Optional
 
+from orderly_evm_connector.error import WebsocketClientError
+from orderly_evm_connector.lib.constants import WEBSOCKET_STREAM_MAXSIZE
 from orderly_evm_connector.lib.utils import (
+    cleanNoneValue,
     orderlyLog,
     get_uuid,
     parse_proxies,
-    generate_signature,
+    OrderlySigner,
 )
 from orderly_evm_connector.websocket.async_websocket_manager import AsyncWebsocketManager
 from orderly_evm_connector.websocket.orderly_socket_manager import OrderlySocketManager
+from orderly_evm_connector.websocket.conflation import get_conflator
+from orderly_evm_connector.websocket.router import TopicRouter
+from orderly_evm_connector.websocket.stream import TopicStream
+from orderly_evm_connector.websocket.subscriptions import SubscriptionRegistry
 
 
 class OrderlyWebsocketClient:
@@ -29,6 +37,13 @@ class OrderlyWebsocketClient:
         on_open=None,
         on_close=None,
         on_error=None,
+        signer=None,
+        reconnect_policy=None,
+        message_format=None,
+        json_backend=None,
+        conflate=None,
+        router=None,
+        connect_semaphore=None,
     ):
         orderly_account_id = (
             orderly_account_id
@@ -37,12 +52,26 @@ class OrderlyWebsocketClient:
         )
         self.websocket_url = f"{websocket_url}/{orderly_account_id}"
         self.orderly_secret = orderly_secret
+        self.signer = signer
+        self.reconnect_policy = reconnect_policy
+        self.connect_semaphore = connect_semaphore
+        # left to the socket manager default when not set: `str` in sync
+        # mode, `dict` in async mode
+        self._message_options = cleanNoneValue(
+            {"message_format": message_format, "json_backend": json_backend}
+        )
         self.wss_id = wss_id if wss_id else get_uuid()
         self.orderly_key = orderly_key
         self.private = private
         self.timeout = timeout
         self.logger = orderlyLog(debug=debug)
-        self.subscriptions = []
+        self.subscriptions = SubscriptionRegistry()
+        self.router = router if router is not None else TopicRouter()
+        self.conflator = get_conflator(conflate)
+        self.async_mode = async_mode
+        self._streams = {}
+        self._stream_subscriptions = set()
+        self._connect_handlers = []
         self._proxy_params = parse_proxies(proxies) if proxies else {}
         self.on_message = on_message
         self.on_open = on_open
@@ -67,17 +96,39 @@ class OrderlyWebsocketClient:
         self.logger.debug("Orderly WebSocket Client started.")
 
 
-    async def run(self):
+    async def run(self, timeout: float = None):
+        """Connect, and return once the connection is open and, for the
+        private client, authenticated. Returns False if `timeout` expired
+        first, raises `WebsocketClientError` if the server rejected `auth`."""
         manager = AsyncWebsocketManager(
             websocket_url=self.websocket_url,
             on_message=self.on_message,
             on_open=self.on_socket_open,
             on_close=self.on_close,
             on_error=self.on_error,
-            debug=self.debug
+            debug=self.debug,
+            reconnect_policy=self.reconnect_policy,
+            router=self.router,
+            conflator=self.conflator,
+            subscriptions=self.subscriptions,
+            connect_semaphore=self.connect_semaphore,
+            **self._message_options,
         )
-        asyncio.create_task(manager.run())
-        await manager.ensure_init()
+        task = asyncio.create_task(manager.run())
+        ready = await manager.wait_for(manager.connected, timeout)
+        if ready and self.private:
+            ready = await manager.wait_for(manager.authenticated, timeout)
+        if manager.auth_error is not None:
+            await manager.close()
+            raise WebsocketClientError(f"Websocket authentication failed: {manager.auth_error}")
+        if not ready and task.done() and task.exception():
+            raise task.exception()
+        return ready
+
+    async def wait_subscribed(self, timeout: float = None):
+        """Wait until the server acknowledged every subscription sent so far.
+        Returns False if `timeout` expired or the connection closed first."""
+        return await self.socket_manager.wait_for(self.socket_manager.subscribed, timeout)
 
     def _auth_params(self):
         return {
@@ -113,6 +164,11 @@ class OrderlyWebsocketClient:
             timeout=timeout,
             debug=debug,
             proxies=proxies,
+            reconnect_policy=self.reconnect_policy,
+            router=self.router,
+            conflator=self.conflator,
+            subscriptions=self.subscriptions,
+            **self._message_options,
         )
 
     def on_socket_open(self, socket_manager):
@@ -123,18 +179,86 @@ class OrderlyWebsocketClient:
         self.is_connected = True
         if self.private:
             self.auth_login()
-        for message in self.subscriptions:
-            self.socket_manager.send_message(json.dumps(message))
+        # every live subscription once, in one batch
+        messages = self.subscriptions.replay()
+        if messages:
+            self.socket_manager.send_messages([json.dumps(message) for message in messages])
+        for handler in self._connect_handlers:
+            result = handler(self.socket_manager)
+            if inspect.isawaitable(result):
+                asyncio.ensure_future(result)
 
     def auth_login(self):
         if not self.socket_manager._login:
-            if self.orderly_secret:
-                self._timestamp, self._signature = generate_signature(self.orderly_secret)
+            if self.signer is None and self.orderly_secret:
+                # held by the client, not by the module cache of `get_signer`
+                self.signer = OrderlySigner(self.orderly_secret)
+            if self.signer:
+                self._timestamp, self._signature = self.signer.sign()
                 self.auth_params = self._auth_params()
                 self.auth_params['params']['timestamp'] = int(self.auth_params['params']['timestamp'])
             self.socket_manager.send_message(json.dumps(self.auth_params))
             self.socket_manager._login = True
 
+    def add_handler(self, topic: str, handler):
+        """Call `handler(manager, message)` for messages of `topic` instead of
+        `on_message`. `topic` is an exact topic, `*@{stream}` for a stream of
+        every symbol, `{symbol}@*` for every stream of a symbol or `*`."""
+        self.router.add(topic, handler)
+
+    def remove_handler(self, topic: str, handler=None):
+        self.router.remove(topic, handler)
+
+    def add_connect_handler(self, handler):
+        """Call `handler(manager)` after every connection, reconnects
+        included, once the subscriptions are sent again"""
+        self._connect_handlers.append(handler)
+
+    def stream(
+        self,
+        topic: str,
+        maxsize: int = WEBSOCKET_STREAM_MAXSIZE,
+        overflow: str = "drop_oldest",
+        subscribe: bool = True,
+    ):
+        """Return a `TopicStream` to iterate over the messages of `topic` with
+        `async for`. The topic is subscribed if it is not already, and
+        unsubscribed when the last stream subscribing it is closed.
+
+        Only available on the async clients, once `run()` has been awaited.
+
+        Optional Args:
+            maxsize(int): size of the stream queue
+            overflow(str): `drop_oldest`, `conflate` or `block`, see `TopicStream`
+            subscribe(bool): send the subscribe message for `topic`
+        """
+        if not self.async_mode:
+            raise WebsocketClientError("stream() is only available on the async websocket clients")
+        stream = TopicStream(topic, maxsize, overflow, on_close=self._close_stream)
+        self.router.add(topic, stream.handler)
+        self._streams.setdefault(topic, []).append(stream)
+        if (
+            subscribe
+            and "*" not in topic
+            and topic not in self.subscriptions
+        ):
+            self._stream_subscriptions.add(topic)
+            self.send_message_to_server({"id": self.wss_id, "event": "subscribe", "topic": topic})
+        return stream
+
+    def _close_stream(self, stream):
+        self.router.remove(stream.topic, stream.handler)
+        streams = self._streams.get(stream.topic, [])
+        if stream in streams:
+            streams.remove(stream)
+        if not streams:
+            self._streams.pop(stream.topic, None)
+            if stream.topic in self._stream_subscriptions:
+                self._stream_subscriptions.discard(stream.topic)
+                self.send_message_to_server(
+                    {"id": self.wss_id, "event": "unsubscribe", "topic": stream.topic}
+                )
+
     def send(self, message: dict):
         self.socket_manager.send_message(json.dumps(message))
 
@@ -148,11 +272,15 @@ class OrderlyWebsocketClient:
             return self.unsubscribe(message)
 
     def subscribe(self, message):
-        if str(message) not in self.subscriptions:
-            self.subscriptions.append(message)
-        self.socket_manager.send_message(json.dumps(message))
+        """Send a subscribe message, unless its topic is already subscribed"""
+        if message.get("event") != "subscribe":
+            self.socket_manager.send_message(json.dumps(message))
+        elif self.subscriptions.add(message):
+            self.socket_manager.send_messages([json.dumps(message)])
 
     def unsubscribe(self, message):
+        # not replayed on reconnect any more
+        self.subscriptions.remove(message)
         self.socket_manager.send_message(json.dumps(message))
 
     def stop(self, id=None):
@@ -0,0 +1,96 @@
+import time
+
+import responses
+
+from orderly_evm_connector.lib.cache import DEFAULT_CACHE_TTLS, ResponseCache
+from orderly_evm_connector.rest import Rest as Client
+
+mock_item = {"success": True, "data": {"rows": []}}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_of_endpoints():
+    cache = ResponseCache(ttls={"GET /v1/public/config": None})
+    assert cache.ttl("/v1/public/info") == DEFAULT_CACHE_TTLS["GET /v1/public/info"]
+    assert cache.ttl("/v1/public/info/PERP_ETH_USDC") == 60
+    assert cache.ttl("/v1/public/token?chain_id=42161") == 300
+    assert cache.ttl("/v1/public/config") is None
+    assert cache.ttl("/v1/public/futures") is None
+    assert cache.ttl("/v1/public/futures", default=True) == cache.default_ttl
+
+
+def test_expiry_stale_window_and_lru():
+    clock = FakeClock()
+    cache = ResponseCache(maxsize=2, stale_while_revalidate=10, clock=clock)
+    cache.set("a", 1, ttl=5)
+    assert cache.lookup("a") == ("fresh", 1)
+    clock.now = 6
+    assert cache.lookup("a") == ("stale", 1)
+    assert cache.begin_refresh("a")
+    assert not cache.begin_refresh("a")
+    cache.end_refresh("a")
+    clock.now = 20
+    assert cache.lookup("a") == (None, None)
+
+    cache.set("a", 1, ttl=5)
+    cache.set("b", 2, ttl=5)
+    cache.lookup("a")
+    cache.set("c", 3, ttl=5)
+    assert cache.lookup("b") == (None, None)
+    assert cache.stats() == {
+        "hits": 2,
+        "stale_hits": 1,
+        "misses": 2,
+        "refreshes": 1,
+        "refresh_errors": 0,
+        "evictions": 1,
+        "size": 2,
+    }
+
+
+@responses.activate
+def test_client_cache_is_opt_in():
+    responses.add(responses.GET, "https://api.orderly.org/v1/public/info", json=mock_item)
+    responses.add(responses.GET, "https://api.orderly.org/v1/public/futures", json=mock_item)
+
+    client = Client()
+    client.get_available_symbols()
+    client.get_available_symbols()
+    assert len(responses.calls) == 2
+    # per call
+    client.get_available_symbols(use_cache=True)
+    client.get_available_symbols(use_cache=True)
+    assert len(responses.calls) == 3
+
+    cached = Client(cache=True)
+    for _ in range(3):
+        assert cached.get_available_symbols() == mock_item
+        cached.get_futures_info_for_all_markets()
+    cached.get_available_symbols(use_cache=False)
+    assert len(responses.calls) == 3 + 1 + 3 + 1
+    assert cached.cache.stats()["hits"] == 2
+
+
+@responses.activate
+def test_stale_response_is_refreshed_in_the_background():
+    responses.add(responses.GET, "https://api.orderly.org/v1/public/config", json={"version": 1})
+    clock = FakeClock()
+    client = Client(cache=ResponseCache(stale_while_revalidate=60, clock=clock))
+    assert client.get_leverage_configuration() == {"version": 1}
+
+    responses.replace(responses.GET, "https://api.orderly.org/v1/public/config", json={"version": 2})
+    clock.now = 301
+    assert client.get_leverage_configuration() == {"version": 1}
+    for _ in range(100):
+        if client.cache.lookup(client.orderly_endpoint + "/v1/public/config")[1] == {"version": 2}:
+            break
+        time.sleep(0.01)
+    assert client.get_leverage_configuration() == {"version": 2}
+    assert client.cache.stats()["refreshes"] == 1
@@ -0,0 +1,118 @@
+import asyncio
+
+import pytest
+
+numpy = pytest.importorskip("numpy")
+
+from orderly_evm_connector.error import ParameterValueError  # noqa: E402
+from orderly_evm_connector.lib.kline_store import Klines, KlineStore  # noqa: E402
+
+MINUTE = 60000
+NOW = 10000 * MINUTE + 30000  # half way through a bar
+
+
+def bar(t):
+    return float(t // MINUTE)
+
+
+class Client:
+    rate_limiter = True  # no pacing in the tests
+
+    def __init__(self, listed=0):
+        self.calls = []
+        self.listed = listed
+
+    def get_kline_history(self, symbol, resolution, from_timestamp=None, to_timestamp=None, limit=None):
+        self.calls.append(("history", from_timestamp * 1000, to_timestamp * 1000))
+        times = [t for t in range(from_timestamp * 1000, to_timestamp * 1000 + 1, MINUTE) if t >= self.listed][:limit]
+        return {
+            "s": "ok",
+            "t": [t // 1000 for t in times],
+            "o": [bar(t) for t in times],
+            "h": [bar(t) + 1 for t in times],
+            "l": [bar(t) - 1 for t in times],
+            "c": [bar(t) for t in times],
+            "v": [1] * len(times),
+            "a": [bar(t) for t in times],
+        }
+
+    def get_kline(self, symbol, type, limit=None):
+        self.calls.append(("kline", limit))
+        start = NOW // MINUTE * MINUTE
+        rows = [
+            {"start_timestamp": t, "end_timestamp": t + MINUTE, "open": bar(t), "close": bar(t), "high": bar(t) + 1,
+             "low": bar(t) - 1, "volume": 1, "amount": bar(t), "symbol": symbol, "type": type}
+            for t in range(start, start - limit * MINUTE, -MINUTE)
+        ]
+        return {"success": True, "data": {"rows": rows}}
+
+
+class AsyncClient(Client):
+    async def get_kline_history(self, *args, **kwargs):
+        return Client.get_kline_history(self, *args, **kwargs)
+
+    async def get_kline(self, *args, **kwargs):
+        return Client.get_kline(self, *args, **kwargs)
+
+
+def test_backfill_fetches_only_missing_ranges(tmp_path):
+    client = Client()
+    store = KlineStore(str(tmp_path), client, clock=lambda: NOW / 1000)
+    assert store.backfill("PERP_ETH_USDC", "1m", 7000 * MINUTE, 9000 * MINUTE) == 2000
+    assert client.calls == [("history", 7000 * MINUTE, 7999 * MINUTE), ("history", 8000 * MINUTE, 8999 * MINUTE)]
+    assert store.backfill("PERP_ETH_USDC", "1m", 7500 * MINUTE, 8500 * MINUTE) == 0
+    assert len(client.calls) == 2
+
+    # older bars are merged in front
+    client.calls = []
+    assert store.backfill("PERP_ETH_USDC", "1m", 6500 * MINUTE, 9001 * MINUTE) == 500 + 1
+    assert client.calls == [("history", 6500 * MINUTE, 6999 * MINUTE), ("history", 9000 * MINUTE, 9000 * MINUTE)]
+    # the latest bars come from get_kline, with the one still open
+    assert store.backfill("PERP_ETH_USDC", "1m", 6500 * MINUTE) == 999
+    assert client.calls[-1] == ("kline", 1000)
+    assert store.ranges("PERP_ETH_USDC", "1m") == [(6500 * MINUTE, 10000 * MINUTE)]
+
+    klines = store.read("PERP_ETH_USDC", "1m")
+    assert isinstance(klines.close, numpy.memmap)
+    assert len(klines.time) == 3500
+    assert (numpy.diff(klines.time) == MINUTE).all()
+    assert klines.close[-1] == 9999
+    # the bar still open is not stored
+    assert klines.time[-1] == 9999 * MINUTE
+
+    window = store.read("PERP_ETH_USDC", "1m", 8000 * MINUTE, 8010 * MINUTE)
+    assert window.open.tolist() == list(range(8000, 8010))
+    assert list(KlineStore(str(tmp_path)).read_all("1m")) == ["PERP_ETH_USDC"]
+
+
+def test_ranges_without_bars_are_not_fetched_again(tmp_path):
+    client = Client(listed=8000 * MINUTE)
+    store = KlineStore(str(tmp_path), client, clock=lambda: NOW / 1000)
+    assert store.backfill("PERP_NEW_USDC", "1m", 7000 * MINUTE, 8010 * MINUTE) == 10
+    assert store.backfill("PERP_NEW_USDC", "1m", 7000 * MINUTE, 8010 * MINUTE) == 0
+    assert len(client.calls) == 2
+
+
+def test_write_replaces_bars_and_repairs_uneven_columns(tmp_path):
+    store = KlineStore(str(tmp_path))
+    times = numpy.arange(5, dtype="<i8") * MINUTE
+    store.write("S", "1m", Klines(times, *(numpy.zeros(5) for _ in range(6))))
+    store.write("S", "1m", Klines(times[2:3], *(numpy.ones(1) for _ in range(6))))
+    assert store.read("S", "1m").close.tolist() == [0, 0, 1, 0, 0]
+
+    # a column longer than the others, from an interrupted append
+    with open(tmp_path / "1m" / "S" / "open.f8", "ab") as f:
+        f.write(numpy.ones(1).tobytes())
+    store = KlineStore(str(tmp_path))
+    assert len(store.read("S", "1m").open) == 5
+    store.write("S", "1m", Klines(times[-1:] + MINUTE, *(numpy.full(1, 2.0) for _ in range(6))))
+    assert store.read("S", "1m").open.tolist() == [0, 0, 1, 0, 0, 2]
+
+
+def test_backfill_async_and_resolution(tmp_path):
+    client = AsyncClient()
+    store = KlineStore(str(tmp_path), client, clock=lambda: NOW / 1000)
+    assert asyncio.run(store.backfill_async("PERP_ETH_USDC", "1m", 9990 * MINUTE)) == 10
+    assert client.calls == [("kline", 11)]
+    with pytest.raises(ParameterValueError):
+        store.missing("PERP_ETH_USDC", "1mon", 0)
@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+import responses
+
+from orderly_evm_connector.lib.rate_limiter import (
+    DEFAULT_RATE_LIMITS,
+    RateLimiter,
+    TokenBucket,
+)
+from orderly_evm_connector.rest import Rest as Client
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_defaults_follow_documented_limits():
+    assert DEFAULT_RATE_LIMITS["POST /v1/order"] == (10, 1)
+    assert DEFAULT_RATE_LIMITS["POST /v1/batch-order"] == (1, 1)
+    assert DEFAULT_RATE_LIMITS["GET /v1/tv/kline_history"] == (5, 10)
+
+
+@pytest.mark.parametrize(
+    "method, path, key",
+    [
+        ("GET", "/v1/order/123", "GET /v1/order/{order_id}"),
+        ("GET", "/v1/order/123/trades", "GET /v1/order/{order_id}/trades"),
+        ("DELETE", "/v1/order?order_id=1&symbol=PERP_ETH_USDC", "DELETE /v1/order"),
+        ("GET", "/v1/public/info/PERP_ETH_USDC", "GET /v1/public/info/{symbol}"),
+        ("GET", "/v1/public/info", "GET /v1/public/info"),
+    ],
+)
+def test_resolve_endpoint_key(method, path, key):
+    assert RateLimiter().resolve(method, path) == key
+
+
+def test_token_bucket_reserves_ahead():
+    clock = FakeClock()
+    bucket = TokenBucket(5, 10, clock=clock)
+    assert [bucket.reserve() for _ in range(5)] == [0.0] * 5
+    assert bucket.reserve() == pytest.approx(2.0)
+    clock.now = 10.0
+    assert bucket.reserve() == 0.0
+
+
+def test_overrides_and_unlimited_endpoints():
+    clock = FakeClock()
+    limiter = RateLimiter(limits={"POST /v1/order": (2, 1)}, clock=clock)
+    delays = [limiter.reserve("POST", "/v1/order")[1] for _ in range(3)]
+    assert delays == [0.0, 0.0, pytest.approx(0.5)]
+    assert limiter.reserve("GET", "/v1/not_documented")[1] == 0.0
+
+    limiter.set_limit("POST /v1/order", None, None)
+    assert limiter.reserve("POST", "/v1/order")[1] == 0.0
+
+
+def test_throttling_metrics():
+    clock = FakeClock()
+    limiter = RateLimiter(clock=clock)
+    for _ in range(3):
+        limiter.reserve("POST", "/v1/batch-order")
+    stats = limiter.stats()["POST /v1/batch-order"]
+    assert stats["requests"] == 3
+    assert stats["throttled"] == 2
+    assert stats["throttled_seconds"] == pytest.approx(3.0)
+    assert stats["max_wait"] == pytest.approx(2.0)
+
+
+def test_acquire_async_waits():
+    limiter = RateLimiter(limits={"GET /v1/public/futures": (1, 0.05)})
+
+    async def main():
+        await limiter.acquire_async("GET", "/v1/public/futures")
+        return await limiter.acquire_async("GET", "/v1/public/futures")
+
+    assert asyncio.run(main()) == pytest.approx(0.05, abs=0.01)
+
+
+@responses.activate
+def test_client_uses_rate_limiter():
+    responses.add(responses.GET, "https://api.orderly.org/v1/public/futures", json={})
+    limiter = RateLimiter(limits={"GET /v1/public/futures": (100, 1)})
+    client = Client(rate_limiter=limiter)
+    client.get_futures_info_for_all_markets()
+    client.get_futures_info_for_all_markets()
+    assert limiter.stats()["GET /v1/public/futures"]["requests"] == 2
+    assert isinstance(Client(rate_limiter=True).rate_limiter, RateLimiter)
+    assert Client().rate_limiter is None
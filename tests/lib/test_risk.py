@@ -0,0 +1,114 @@
+import pytest
+
+from orderly_evm_connector.error import ParameterValueError
+
+numpy = pytest.importorskip("numpy")
+
+from orderly_evm_connector.lib.risk import PortfolioRisk  # noqa: E402
+
+SYMBOLS = {
+    "success": True,
+    "data": {
+        "rows": [
+            {"symbol": "PERP_ETH_USDC", "base_imr": 0.1, "base_mmr": 0.05, "imr_factor": 0.0},
+            {"symbol": "PERP_BTC_USDC", "base_imr": 0.1, "base_mmr": 0.05, "imr_factor": 0.0000001},
+        ]
+    },
+}
+
+
+def positions():
+    return [
+        {"account_id": "a", "symbol": "PERP_ETH_USDC", "position_qty": 2, "cost_position": 4000, "mark_price": 2000},
+        {"account_id": "a", "symbol": "PERP_BTC_USDC", "position_qty": -0.5, "cost_position": -30000, "mark_price": 60000},
+        {"account_id": "b", "symbol": "PERP_ETH_USDC", "position_qty": -1, "cost_position": -2100, "mark_price": 2000},
+        {"account_id": "b", "symbol": "PERP_BTC_USDC", "position_qty": 0, "cost_position": 0, "mark_price": 60000},
+    ]
+
+
+def reference(rows, symbols, collateral, marks):
+    """The same formulas, one position at a time"""
+    params = {row["symbol"]: row for row in symbols["data"]["rows"]}
+    totals = {}
+    for row in rows:
+        if not row["position_qty"]:
+            continue
+        p = params[row["symbol"]]
+        qty, mark = row["position_qty"], marks[row["symbol"]]
+        notional = abs(qty) * mark
+        factor = p["imr_factor"] * notional ** 0.8
+        mmr = max(p["base_mmr"], p["base_mmr"] / p["base_imr"] * factor)
+        total = totals.setdefault(row["account_id"], {"notional": 0, "upnl": 0, "mm": 0})
+        total["notional"] += notional
+        total["upnl"] += qty * mark - row["cost_position"]
+        total["mm"] += notional * mmr
+    return {
+        account: (
+            (collateral[account] + t["upnl"]) / t["notional"],
+            collateral[account] + t["upnl"] - t["mm"],
+        )
+        for account, t in totals.items()
+    }
+
+
+def test_compute_matches_reference():
+    risk = PortfolioRisk(SYMBOLS)
+    collateral = {"a": 10000, "b": 500}
+    risk.load_positions(positions(), collateral=collateral)
+    result = risk.compute()
+    assert result.accounts == ["a", "b"]
+    assert len(result.notional) == 3
+    expected = reference(positions(), SYMBOLS, collateral, {"PERP_ETH_USDC": 2000, "PERP_BTC_USDC": 60000})
+    for i, account in enumerate(result.accounts):
+        assert result.margin_ratio[i] == pytest.approx(expected[account][0])
+        assert result.mm_buffer[i] == pytest.approx(expected[account][1])
+    assert result.exposure.tolist() == pytest.approx([2000, -30000])
+
+    # at the liquidation price the maintenance margin buffer is zero
+    eth_b = 2
+    liquidation_price = result.liquidation_price[eth_b]
+    risk.update_mark_prices({"PERP_ETH_USDC": liquidation_price})
+    assert risk.account("b")["mm_buffer"] == pytest.approx(0, abs=1e-6)
+
+
+def test_mark_price_updates_match_full_recompute():
+    risk = PortfolioRisk(SYMBOLS)
+    risk.load_positions(positions(), collateral={"a": 10000, "b": 500})
+    risk.set_leverage("PERP_ETH_USDC", {"success": True, "data": {"leverage": 5}}, account_id="a")
+    risk.update_mark_prices([{"symbol": "PERP_BTC_USDC", "price": 61000}, {"symbol": "PERP_NEAR_USDC", "price": 5}])
+    risk.update_mark_prices({"PERP_ETH_USDC": 1900})
+    incremental = risk.compute()
+    risk.recompute()
+    full = risk.compute()
+    for name in ("total_notional", "unrealized_pnl", "initial_margin", "maintenance_margin", "margin_ratio"):
+        assert getattr(incremental, name) == pytest.approx(getattr(full, name))
+    assert full.imr[0] == pytest.approx(0.2)
+    assert risk.account("a")["unrealized_pnl"] == pytest.approx(2 * 1900 - 4000 - 0.5 * 61000 + 30000)
+
+
+def test_missing_symbol_parameters():
+    risk = PortfolioRisk()
+    with pytest.raises(ParameterValueError):
+        risk.load_positions(positions(), collateral={"a": 1, "b": 1})
+
+    # the positions loaded before are kept
+    risk = PortfolioRisk(SYMBOLS)
+    risk.load_positions(positions(), collateral={"a": 10000, "b": 500})
+    before = risk.compute()
+    with pytest.raises(ParameterValueError):
+        risk.load_positions(positions() + [dict(positions()[0], symbol="PERP_SOL_USDC")], collateral={"c": 1})
+    after = risk.compute()
+    assert after.accounts == ["a", "b"] and after.symbol_names == ["PERP_ETH_USDC", "PERP_BTC_USDC"]
+    assert after.notional.tolist() == before.notional.tolist()
+    assert after.margin_ratio.tolist() == before.margin_ratio.tolist()
+
+
+def test_collateral_of_an_account_added_later():
+    risk = PortfolioRisk(SYMBOLS)
+    risk.load_positions(positions()[:2], collateral={"a": 10000})
+    risk.set_collateral({"b": 500})
+    assert risk.account("b")["collateral"] == 500
+    assert risk.account("b")["margin_ratio"] == float("inf")
+    risk.load_positions(positions(), collateral={"c": 1})
+    risk.set_collateral({"d": 2})
+    assert risk.compute().collateral.tolist()[2:] == [1, 2]
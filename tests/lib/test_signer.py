@@ -0,0 +1,79 @@
+import base64
+import os
+
+import base58
+import pytest
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+from orderly_evm_connector.api import API
+from orderly_evm_connector.error import ParameterValueError
+from orderly_evm_connector.lib.utils import (
+    OrderlySigner,
+    generate_signature,
+    get_signer,
+)
+from orderly_evm_connector.websocket.websocket_client import OrderlyWebsocketClient
+
+raw_secret = os.urandom(32)
+orderly_secret = "ed25519:" + base58.b58encode(raw_secret).decode()
+public_key = Ed25519PrivateKey.from_private_bytes(raw_secret).public_key()
+
+
+def test_signer_signature_verifies():
+    signer = OrderlySigner(orderly_secret)
+    timestamp, signature = signer.sign("GET/v1/positions")
+    public_key.verify(
+        base64.b64decode(signature), f"{timestamp}GET/v1/positions".encode()
+    )
+
+
+def test_signer_matches_generate_signature():
+    signer = OrderlySigner(orderly_secret)
+    _, signature = signer.sign("GET/v1/orders", timestamp=1700000000000)
+    _, expected = get_signer(orderly_secret).sign("GET/v1/orders", timestamp=1700000000000)
+    assert signature == expected
+    timestamp, _ = generate_signature(orderly_secret, "GET/v1/orders")
+    assert timestamp.isdigit()
+
+
+def test_signer_is_cached_per_secret():
+    signer = get_signer(orderly_secret)
+    assert get_signer(orderly_secret) is signer
+    get_signer.cache_clear()
+    assert get_signer(orderly_secret) is not signer
+
+
+def test_websocket_client_holds_its_own_signer():
+    class Manager:
+        _login = False
+
+        def send_message(self, message):
+            self.sent = message
+
+    get_signer.cache_clear()
+    client = OrderlyWebsocketClient("ws://127.0.0.1:1", orderly_key="key", orderly_secret=orderly_secret,
+                                    private=True, async_mode=True)
+    client.socket_manager = Manager()
+    client.auth_login()
+    assert isinstance(client.signer, OrderlySigner)
+    assert get_signer.cache_info().currsize == 0
+
+
+def test_invalid_secret_raises_value_error():
+    with pytest.raises(ValueError):
+        OrderlySigner("test_secret")
+    with pytest.raises(ValueError):
+        OrderlySigner(None)
+
+
+def test_api_builds_signer_once():
+    client = API(orderly_key="key", orderly_secret=orderly_secret)
+    assert isinstance(client.signer, OrderlySigner)
+    assert API(orderly_key="key").signer is None
+
+
+def test_api_rejects_a_malformed_secret():
+    with pytest.raises(ParameterValueError):
+        API(orderly_key="key", orderly_secret="test_secret")
+    with pytest.raises(ParameterValueError):
+        API(orderly_key="key", orderly_secret="ed25519:0OIl")
@@ -0,0 +1,106 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from orderly_evm_connector.lib.singleflight import AsyncSingleFlight, SingleFlight
+
+
+def test_concurrent_calls_share_one_call():
+    flight = SingleFlight()
+    calls = []
+    release = threading.Event()
+
+    def fetch():
+        calls.append(1)
+        release.wait(1)
+        return {"data": len(calls)}
+
+    with ThreadPoolExecutor(8) as pool:
+        futures = [pool.submit(flight.do, "/v1/public/info", fetch) for _ in range(8)]
+        time.sleep(0.1)
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert calls == [1]
+    assert all(result is results[0] for result in results)
+    assert flight.stats() == {"executed": 1, "shared": 7}
+    # once done, the next call is made again
+    assert flight.do("/v1/public/info", fetch) == {"data": 2}
+
+
+def test_errors_are_shared_too():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def fetch():
+        release.wait(1)
+        raise ValueError("server error")
+
+    with ThreadPoolExecutor(4) as pool:
+        futures = [pool.submit(flight.do, "key", fetch) for _ in range(4)]
+        time.sleep(0.1)
+        release.set()
+        for future in futures:
+            with pytest.raises(ValueError):
+                future.result()
+
+
+def test_async_calls_share_one_task():
+    async def main():
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return {"data": 1}
+
+        results = await asyncio.gather(*(flight.do("key", fetch) for _ in range(10)))
+        assert calls == [1]
+        assert all(result is results[0] for result in results)
+        assert flight.stats() == {"executed": 1, "shared": 9}
+
+        # a cancelled caller does not cancel the call of the others
+        first = asyncio.ensure_future(flight.do("other", fetch))
+        second = asyncio.ensure_future(flight.do("other", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        assert await second == {"data": 1}
+
+    asyncio.run(main())
+
+
+def test_rest_async_coalesces_identical_public_gets():
+    from aiohttp import web
+
+    from orderly_evm_connector.rest import RestAsync as AsyncClient
+
+    requests = []
+
+    async def handler(request):
+        requests.append(request.path_qs)
+        await asyncio.sleep(0.05)
+        return web.json_response({"success": True, "data": {"rows": []}})
+
+    async def main():
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+        try:
+            async with AsyncClient(orderly_api_url=url, singleflight=True) as client:
+                await asyncio.gather(
+                    *(client.get_futures_info_for_all_markets() for _ in range(20)),
+                    *(client.get_exchange_info("PERP_ETH_USDC") for _ in range(5)),
+                )
+        finally:
+            await runner.cleanup()
+
+    asyncio.run(main())
+    assert sorted(requests) == ["/v1/public/futures", "/v1/public/info/PERP_ETH_USDC"]
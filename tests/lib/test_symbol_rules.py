@@ -0,0 +1,184 @@
+import asyncio
+
+import pytest
+import responses
+from aiohttp import web
+
+from orderly_evm_connector.error import OrderValidationError, ParameterValueError
+from orderly_evm_connector.lib import symbol_rules as symbol_rules_module
+from orderly_evm_connector.lib.enums import OrderType
+from orderly_evm_connector.lib.symbol_rules import SymbolRules, SymbolRulesIndex
+from orderly_evm_connector.lib.utils import check_enum_parameter, get_enum_values
+from orderly_evm_connector.rest import Rest as Client
+from orderly_evm_connector.rest import RestAsync as AsyncClient
+
+ETH = {
+    "symbol": "PERP_ETH_USDC",
+    "quote_min": 0,
+    "quote_max": 100000,
+    "quote_tick": 0.01,
+    "base_min": 0.001,
+    "base_max": 3500,
+    "base_tick": 0.001,
+    "min_notional": 10,
+    "price_range": 0.02,
+}
+BTC = dict(ETH, symbol="PERP_BTC_USDC", quote_tick=0.1, base_min=0.00001, base_tick=0.00001)
+SYMBOLS = {"success": True, "data": {"rows": [ETH, BTC]}}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_price_ticks_start_at_quote_min(monkeypatch):
+    row = dict(ETH, quote_min=0.3, quote_tick=0.5)
+    rules = SymbolRules.from_row(row)
+    assert rules.validate(price=10.3) == []
+    assert rules.round_price(10.3, "SELL") == 10.3
+    assert rules.round_price(10.6, "BUY") == 10.3
+    assert rules.validate(price=10.5)
+    index = SymbolRulesIndex()
+    index.load([row])
+    assert index.round_prices("PERP_ETH_USDC", [10.3, 10.6, 10.9], "BUY") == [10.3, 10.3, 10.8]
+    monkeypatch.setattr(symbol_rules_module, "numpy", None)
+    assert index.round_prices("PERP_ETH_USDC", [10.3, 10.6, 10.9], "BUY") == [10.3, 10.3, 10.8]
+
+
+def test_rounding_to_ticks():
+    rules = SymbolRules.from_row(ETH)
+    assert rules.round_price(2000.123) == 2000.12
+    assert rules.round_price(2000.123, "SELL") == 2000.13
+    assert rules.round_price(2000.127, "BUY") == 2000.12
+    assert rules.round_price(2000.12, "SELL") == 2000.12
+    assert rules.round_quantity(1.23456) == 1.234
+    assert SymbolRules.from_row(BTC).round_quantity(0.123456789) == 0.12345
+
+
+def test_validation():
+    rules = SymbolRules.from_row(ETH)
+    assert rules.validate(2000.12, 0.5) == []
+    assert len(rules.validate(2000.123, 0.5)) == 1
+    assert len(rules.validate(2000.12, 0.0005)) == 2
+    assert rules.validate(2000.12, 0.001) == ["notional 2.00012 below 10.0"]
+    assert rules.validate(None, 0.5) == []
+
+
+def test_prepare_orders_rounds_or_rejects():
+    index = SymbolRulesIndex(mode="round")
+    index.load(SYMBOLS)
+    order = {"symbol": "PERP_ETH_USDC", "order_type": "LIMIT", "side": "BUY", "order_price": 2000.129, "order_quantity": 0.0125}
+    assert index.prepare_order(order)["order_price"] == 2000.12
+    assert index.prepare_order(order)["order_quantity"] == 0.012
+    assert order["order_price"] == 2000.129
+
+    orders = [
+        dict(order, order_price=2000 + n / 1000, order_quantity=0.01 + n / 10000) for n in range(20)
+    ] + [dict(order, symbol="PERP_BTC_USDC", side="SELL", order_price=60000.01)]
+    prepared = index.prepare_orders(orders)
+    assert prepared[:20] == [index.prepare_order(o) for o in orders[:20]]
+    assert prepared[20]["order_price"] == 60000.1
+
+    with pytest.raises(OrderValidationError):
+        index.prepare_order(dict(order, order_quantity=0.0001))
+    with pytest.raises(OrderValidationError):
+        index.prepare_order(dict(order, symbol="PERP_DOGE_USDC"))
+    strict = SymbolRulesIndex()
+    strict.load(SYMBOLS["data"]["rows"])
+    with pytest.raises(OrderValidationError):
+        strict.prepare_order(order)
+    with pytest.raises(ParameterValueError):
+        SymbolRulesIndex(mode="fix")
+
+
+def test_vectorized_rounding_without_numpy(monkeypatch):
+    index = SymbolRulesIndex()
+    index.load(SYMBOLS)
+    expected = index.round_prices("PERP_ETH_USDC", [1.005, 2000.129, 3.3333], "BUY")
+    monkeypatch.setattr(symbol_rules_module, "numpy", None)
+    assert index.round_prices("PERP_ETH_USDC", [1.005, 2000.129, 3.3333], "BUY") == expected
+    assert expected == [1.0, 2000.12, 3.33]
+    assert index.round_quantities("PERP_ETH_USDC", [0.0125, 1]) == [0.012, 1.0]
+
+
+def test_enum_values_are_computed_once():
+    assert get_enum_values(OrderType) is get_enum_values(OrderType)
+    assert "LIMIT" in get_enum_values(OrderType)
+    with pytest.raises(ParameterValueError):
+        check_enum_parameter("LIMITED", OrderType)
+
+
+@responses.activate
+def test_client_rejects_orders_before_sending():
+    responses.add(responses.GET, "https://api.orderly.org/v1/public/info", json=SYMBOLS)
+    responses.add(responses.POST, "https://api.orderly.org/v1/order", json={"success": True})
+    client = Client(orderly_key="ed25519:key", symbol_rules=True)
+
+    with pytest.raises(OrderValidationError):
+        client.create_order("PERP_ETH_USDC", "LIMIT", "BUY", order_price=2000.123, order_quantity=1)
+    assert [call.request.method for call in responses.calls] == ["GET"]
+    client.create_order("PERP_ETH_USDC", "LIMIT", "BUY", order_price=2000.12, order_quantity=1)
+    assert [call.request.method for call in responses.calls] == ["GET", "POST"]
+
+
+def test_async_client_loads_rules_before_the_first_order():
+    requests = []
+
+    async def handler(request):
+        requests.append((request.method, request.path))
+        if request.path == "/v1/public/info":
+            return web.json_response(SYMBOLS)
+        return web.json_response({"success": True, "data": {"rows": []}})
+
+    async def main():
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+        try:
+            async with AsyncClient(orderly_key="ed25519:key", orderly_api_url=url, symbol_rules=True) as client:
+                orders = [
+                    client.create_order("PERP_ETH_USDC", "LIMIT", "BUY", order_price=2000.12, order_quantity=1),
+                    client.batch_create_order(
+                        [{"symbol": "PERP_BTC_USDC", "order_type": "LIMIT", "side": "SELL",
+                          "order_price": 60000.1, "order_quantity": 0.001}]
+                    ),
+                ]
+                await asyncio.gather(*orders)
+                with pytest.raises(OrderValidationError):
+                    await client.create_order("PERP_ETH_USDC", "LIMIT", "BUY", order_price=2000.123, order_quantity=1)
+        finally:
+            await runner.cleanup()
+
+    asyncio.run(main())
+    # one load shared by both orders
+    assert requests[0] == ("GET", "/v1/public/info")
+    assert sorted(requests[1:]) == [("POST", "/v1/batch-order"), ("POST", "/v1/order")]
+
+
+def test_rules_are_reloaded_after_ttl():
+    class FakeRest:
+        calls = 0
+
+        def _request(self, *args):
+            pass
+
+        def get_available_symbols(self):
+            FakeRest.calls += 1
+            return SYMBOLS
+
+    clock = FakeClock()
+    index = SymbolRulesIndex(FakeRest(), ttl=60, clock=clock)
+    index.get("PERP_ETH_USDC")
+    index.get("PERP_BTC_USDC")
+    assert FakeRest.calls == 1
+    clock.now = 61
+    index.get("PERP_ETH_USDC")
+    assert FakeRest.calls == 2
@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from orderly_evm_connector.rest import RestAsync as AsyncClient
+
+mock_data = {"success": True, "data": {"status": 0}}
+
+
+async def start_server(handler):
+    app = web.Application()
+    app.router.add_route("*", "/{tail:.*}", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+def test_session_is_reused_across_requests():
+    peers = []
+
+    async def handler(request):
+        peers.append(request.transport.get_extra_info("peername"))
+        return web.json_response(mock_data)
+
+    async def main():
+        runner, url = await start_server(handler)
+        try:
+            async with AsyncClient(orderly_api_url=url) as client:
+                session = client._session
+                for _ in range(5):
+                    response = await client.get_system_maintenance_status()
+                    assert response == mock_data
+                assert client._session is session
+            assert client._session is None
+        finally:
+            await runner.cleanup()
+
+    asyncio.run(main())
+    # keep-alive: every request went over the same pooled connection
+    assert len(set(peers)) == 1
+
+
+def test_connector_settings_are_applied():
+    async def main():
+        client = AsyncClient(
+            orderly_api_url="http://127.0.0.1:1",
+            connection_limit=10,
+            connection_limit_per_host=4,
+            keepalive_timeout=30,
+            dns_cache_ttl=60,
+        )
+        session = client._get_session()
+        assert session.connector.limit == 10
+        assert session.connector.limit_per_host == 4
+        await client.aclose()
+        assert session.closed
+
+    asyncio.run(main())
+
+
+def test_timeout_is_honoured():
+    async def handler(request):
+        await asyncio.sleep(1)
+        return web.json_response(mock_data)
+
+    async def main():
+        runner, url = await start_server(handler)
+        try:
+            async with AsyncClient(orderly_api_url=url, timeout=0.1) as client:
+                with pytest.raises(asyncio.TimeoutError):
+                    await client.get_system_maintenance_status()
+        finally:
+            await runner.cleanup()
+
+    asyncio.run(main())
+
+
+def test_proxy_is_passed_to_requests():
+    client = AsyncClient(proxies={"https": "http://proxy.local:3128"})
+    assert client._get_proxy() == "http://proxy.local:3128"
+    assert AsyncClient()._get_proxy() is None
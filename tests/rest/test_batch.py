@@ -0,0 +1,115 @@
+import asyncio
+import json
+
+import pytest
+import responses
+from aiohttp import web
+
+from orderly_evm_connector.error import ParameterValueError, ServerError
+from orderly_evm_connector.lib.rate_limiter import RateLimiter
+from orderly_evm_connector.rest import Rest as Client
+from orderly_evm_connector.rest import RestAsync as AsyncClient
+
+orders = [
+    {
+        "symbol": "PERP_ETH_USDC",
+        "order_type": "LIMIT",
+        "side": "BUY",
+        "order_price": 2000 - i,
+        "order_quantity": 1,
+        "client_order_id": f"ladder-{i}",
+    }
+    for i in range(25)
+]
+
+
+def batch_response(request_orders):
+    rows = [
+        {
+            "order_id": i,
+            "client_order_id": order["client_order_id"],
+            "error_message": "none" if order["order_price"] != 1990 else "price out of range",
+        }
+        for i, order in enumerate(request_orders)
+    ]
+    return {"success": True, "data": {"rows": rows}}
+
+
+@responses.activate
+def test_batch_create_orders_chunks_and_maps_results():
+    def callback(request):
+        body = json.loads(request.body)
+        if body["orders"][0]["client_order_id"] == "ladder-20":
+            return 500, {}, "server error"
+        return 200, {}, json.dumps(batch_response(body["orders"]))
+
+    responses.add_callback(responses.POST, "https://api.orderly.org/v1/batch-order", callback=callback)
+    # raised from the published 1 request per second to keep the test fast
+    limiter = RateLimiter({"POST /v1/batch-order": (100, 1)})
+    client = Client(orderly_key="ed25519:key", rate_limiter=limiter)
+
+    results = client.batch_create_orders(orders)
+
+    assert len(responses.calls) == 3
+    assert limiter.stats()["POST /v1/batch-order"]["requests"] == 3
+    assert sorted(len(json.loads(call.request.body)["orders"]) for call in responses.calls) == [5, 10, 10]
+    assert [result["input"] for result in results] == orders
+    failed = [i for i, result in enumerate(results) if not result["success"]]
+    assert failed == [10] + list(range(20, 25))
+    assert results[10]["error"] == "price out of range"
+    # the error of a failed request is the error of each of its orders
+    assert isinstance(results[20]["error"], ServerError)
+    assert results[0]["data"]["client_order_id"] == "ladder-0"
+
+
+@responses.activate
+def test_batch_cancel_accepts_lists_and_comma_strings():
+    responses.add(responses.DELETE, "https://api.orderly.org/v1/batch-order", json={"success": True, "data": {"status": "CANCEL_SENT"}})
+    client = Client(orderly_key="ed25519:key")
+
+    results = client.batch_cancel_orders_chunked(",".join(str(i) for i in range(12)), chunk_size=5)
+    assert [result["input"] for result in results] == [str(i) for i in range(12)]
+    assert all(result["success"] for result in results)
+    assert sorted(call.request.params["order_ids"] for call in responses.calls) == [
+        "0,1,2,3,4",
+        "10,11",
+        "5,6,7,8,9",
+    ]
+    with pytest.raises(ParameterValueError):
+        client.batch_cancel_orders_chunked([1, 2], chunk_size=11)
+
+    # one pacer for every call of the client
+    pacer = client._batch_pacer
+    client.batch_cancel_orders_chunked([1, 2])
+    assert client._batch_pacer is pacer
+    assert pacer.stats()["DELETE /v1/batch-order"]["requests"] == 4
+
+
+def test_async_batch_create_orders():
+    requests = []
+
+    async def handler(request):
+        body = await request.json()
+        requests.append(len(body["orders"]))
+        await asyncio.sleep(0.01)
+        return web.json_response(batch_response(body["orders"]))
+
+    async def main():
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+        try:
+            async with AsyncClient(orderly_key="ed25519:key", orderly_api_url=url, rate_limiter=True) as client:
+                client.rate_limiter.set_limit("POST /v1/batch-order", 100, 1)
+                return await client.batch_create_orders(orders, chunk_size=7, max_workers=2)
+        finally:
+            await runner.cleanup()
+
+    results = asyncio.run(main())
+    assert sorted(requests) == [4, 7, 7, 7]
+    assert [result["input"] for result in results] == orders
+    assert [i for i, result in enumerate(results) if not result["success"]] == [10]
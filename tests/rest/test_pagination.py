@@ -0,0 +1,110 @@
+import asyncio
+
+import responses
+from aiohttp import web
+
+from orderly_evm_connector.rest import Rest as Client
+from orderly_evm_connector.rest import RestAsync as AsyncClient
+
+rows = [{"order_id": i} for i in range(1203)]
+
+
+def page_response(page, size, total=len(rows)):
+    return {
+        "success": True,
+        "data": {
+            "meta": {"total": total, "records_per_page": size, "current_page": page},
+            "rows": rows[(page - 1) * size : page * size],
+        },
+    }
+
+
+@responses.activate
+def test_iter_orders_walks_every_page():
+    for page in range(1, 4):
+        responses.add(
+            responses.GET,
+            "https://api.orderly.org/v1/orders",
+            json=page_response(page, 500),
+            match=[responses.matchers.query_param_matcher(
+                {"symbol": "PERP_ETH_USDC", "page": str(page), "size": "500"}
+            )],
+        )
+    client = Client()
+    iterator = client.iter_orders(symbol="PERP_ETH_USDC")
+    assert next(iterator) == rows[0]
+    # pages are only requested when they are needed
+    assert len(responses.calls) == 1
+    assert [rows[0]] + list(iterator) == rows
+    assert len(responses.calls) == 3
+
+
+@responses.activate
+def test_iteration_stops_on_short_page_without_total():
+    responses.add(
+        responses.GET,
+        "https://api.orderly.org/v1/trades",
+        json={"success": True, "data": {"rows": rows[:10]}},
+    )
+    assert list(Client().iter_trades(size=25)) == rows[:10]
+    assert len(responses.calls) == 1
+
+
+def test_async_iterator_prefetches_pages():
+    requested = []
+
+    async def handler(request):
+        page, size = int(request.query["page"]), int(request.query["size"])
+        requested.append(page)
+        await asyncio.sleep(0.01)
+        return web.json_response(page_response(page, size))
+
+    async def main():
+        app = web.Application()
+        app.router.add_get("/v1/orders", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        try:
+            async with AsyncClient(orderly_api_url=f"http://127.0.0.1:{port}") as client:
+                result = [row async for row in client.iter_orders(size=100, prefetch=3)]
+                assert result == rows
+                assert sorted(requested) == list(range(1, 14))
+
+                requested.clear()
+                iterator = client.iter_orders(size=100, prefetch=2)
+                async for row in iterator:
+                    if row == rows[0]:
+                        break
+                await iterator.aclose()
+                assert len(requested) <= 3
+        finally:
+            await runner.cleanup()
+
+    asyncio.run(main())
+
+
+def test_async_prefetch_bounds_pages_in_flight():
+    from orderly_evm_connector.rest._pagination import paginate_async
+
+    async def consume(prefetch):
+        requested = []
+
+        async def fetch(page, size):
+            requested.append(page)
+            await asyncio.sleep(0)
+            return page_response(page, size)
+
+        ahead = 0
+        async for row in paginate_async(None, fetch, size=100, prefetch=prefetch):
+            current = row["order_id"] // 100 + 1
+            await asyncio.sleep(0)
+            ahead = max(ahead, max(requested) - current)
+        return ahead, sorted(requested)
+
+    for prefetch in (0, 1, 2):
+        ahead, requested = asyncio.run(consume(prefetch))
+        assert ahead == prefetch
+        assert requested == list(range(1, 14))
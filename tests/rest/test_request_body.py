@@ -0,0 +1,70 @@
+import json
+
+import pytest
+import responses
+
+from orderly_evm_connector.error import ParameterValueError
+from orderly_evm_connector.lib.utils import get_json_backend, orjson
+from orderly_evm_connector.rest import Rest as Client
+
+orderly_key = "ed25519:key"
+mock_data = {"success": True, "data": {"order_id": 1}}
+
+create_order_params = {
+    "symbol": "PERP_NEAR_USDC",
+    "order_type": "LIMIT",
+    "side": "BUY",
+    "order_price": 1.3,
+    "order_quantity": 2,
+}
+
+backends = ["json"] + (["orjson"] if orjson is not None else [])
+
+
+@pytest.mark.parametrize("json_backend", backends)
+@responses.activate
+def test_signed_body_is_the_sent_body(json_backend):
+    responses.add(responses.POST, "https://api.orderly.org/v1/order", json=mock_data)
+    client = Client(orderly_key=orderly_key, json_backend=json_backend)
+    signed = []
+    prepare_params = client._prepare_params
+
+    def record_prepare_params(params):
+        signed.append(prepare_params(params))
+        return signed[-1]
+
+    client._prepare_params = record_prepare_params
+
+    response = client.create_order(**create_order_params)
+
+    body = responses.calls[0].request.body
+    assert isinstance(body, bytes)
+    assert signed == ["POST/v1/order" + body.decode()]
+    assert json.loads(body) == create_order_params
+    assert response == mock_data
+
+
+@responses.activate
+def test_batch_order_body_encoded_once():
+    responses.add(responses.POST, "https://api.orderly.org/v1/batch-order", json=mock_data)
+    client = Client(orderly_key=orderly_key, json_backend="json")
+    calls = []
+    json_dumps = client._json_dumps
+
+    def record_json_dumps(obj):
+        calls.append(obj)
+        return json_dumps(obj)
+
+    client._json_dumps = record_json_dumps
+
+    client.batch_create_order([create_order_params, create_order_params])
+
+    assert len(calls) == 1
+    assert json.loads(responses.calls[0].request.body) == {
+        "orders": [create_order_params, create_order_params]
+    }
+
+
+def test_unknown_json_backend():
+    with pytest.raises(ParameterValueError):
+        get_json_backend("simplejson")
@@ -7,7 +7,7 @@ class TestStrategyVaultAPI(unittest.TestCase):
     def setUp(self):
         self.client = Rest(
             orderly_key="test_key",
-            orderly_secret="test_secret",
+            orderly_secret="ed25519:4wBqpZM9xaSheZzJSMawUKKwhdpChKbZ5eu5ky4Vigw",
             orderly_account_id="test_account_id",
             wallet_secret="test_wallet_secret",
             orderly_testnet=True
@@ -0,0 +1,83 @@
+import base64
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import base58
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+from orderly_evm_connector.rest import Rest as Client
+
+raw_secret = os.urandom(32)
+orderly_secret = "ed25519:" + base58.b58encode(raw_secret).decode()
+public_key = Ed25519PrivateKey.from_private_bytes(raw_secret).public_key()
+
+
+class SignatureCheckingHandler(BaseHTTPRequestHandler):
+    """Verifies that every request carries a signature over its own method, path and body"""
+
+    protocol_version = "HTTP/1.1"
+    failures = []
+    lock = threading.Lock()
+
+    def _handle(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length).decode() if length else ""
+        message = f"{self.headers['orderly-timestamp']}{self.command}{self.path}{body}"
+        try:
+            public_key.verify(
+                base64.b64decode(self.headers["orderly-signature"]), message.encode()
+            )
+        except (InvalidSignature, TypeError, ValueError):
+            with self.lock:
+                self.failures.append(message)
+        payload = json.dumps({"success": True, "data": {"path": self.path}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+    def log_message(self, *args):
+        pass
+
+
+def test_shared_client_signs_each_request_independently():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SignatureCheckingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = Client(
+        orderly_key="ed25519:key",
+        orderly_secret=orderly_secret,
+        orderly_account_id="0xaccount",
+        orderly_api_url=f"http://127.0.0.1:{server.server_address[1]}",
+        pool_maxsize=16,
+    )
+
+    def call(i):
+        if i % 3 == 0:
+            return client.get_order(i)
+        if i % 3 == 1:
+            return client.get_trades(symbol="PERP_ETH_USDC", page=i)
+        return client.create_order(
+            symbol="PERP_ETH_USDC",
+            order_type="LIMIT",
+            side="BUY",
+            order_price=1000 + i,
+            order_quantity=1,
+        )
+
+    try:
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            results = list(executor.map(call, range(600)))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert SignatureCheckingHandler.failures == []
+    assert len(results) == 600
+    assert "orderly-signature" not in client.session.headers
@@ -0,0 +1,83 @@
+import json
+
+import pytest
+
+from orderly_evm_connector.error import ParameterValueError
+from orderly_evm_connector.websocket.candles import CandleBuilder, parse_bar_spec
+from orderly_evm_connector.websocket.router import TopicRouter
+
+
+class Client:
+    wss_id = "test"
+
+    def __init__(self):
+        self.router = TopicRouter()
+        self.sent = []
+
+    def add_handler(self, topic, handler):
+        self.router.add(topic, handler)
+
+    def trade(self, symbol, price, size, ts):
+        topic = f"{symbol}@trade"
+        message = {"topic": topic, "ts": ts, "data": {"symbol": symbol, "price": price, "size": size, "side": "BUY"}}
+        for handler in self.router.match(topic):
+            handler(None, json.dumps(message))
+
+    def send_message_to_server(self, message):
+        self.sent.append((message["event"], message["topic"]))
+
+
+def test_parse_bar_spec():
+    assert parse_bar_spec("5s") == ("time", 5000)
+    assert parse_bar_spec("1m") == ("time", 60000)
+    assert parse_bar_spec("volume:2.5") == ("volume", 2.5)
+    assert parse_bar_spec("notional:100") == ("notional", 100)
+    for spec in ("0s", "5x", "volume", "tick:0", "amount:5"):
+        with pytest.raises(ParameterValueError):
+            parse_bar_spec(spec)
+
+
+def test_time_bars():
+    client, closed = Client(), []
+    builder = CandleBuilder(client, bars=("1s", "5s"), on_bar=lambda symbol, spec, row: closed.append(row))
+    builder.subscribe("PERP_ETH_USDC")
+    assert client.sent == [("subscribe", "PERP_ETH_USDC@trade")]
+    client.trade("PERP_ETH_USDC", 10, 1, 1000)
+    client.trade("PERP_ETH_USDC", 12, 2, 1500)
+    client.trade("PERP_ETH_USDC", 9, 1, 1999)
+    client.trade("PERP_ETH_USDC", 11, 1, 3200)
+    assert closed == [
+        {"open": 10.0, "close": 9.0, "low": 9.0, "high": 12.0, "volume": 4.0, "amount": 43.0,
+         "symbol": "PERP_ETH_USDC", "type": "1s", "start_timestamp": 1000, "end_timestamp": 2000},
+    ]
+    # no bar for the second without trades, the open bar is closed by time
+    builder.close_expired(6000)
+    assert [(row["type"], row["start_timestamp"]) for row in closed] == [("1s", 1000), ("1s", 3000), ("5s", 0)]
+    rows = builder.get_kline("PERP_ETH_USDC", "5s")["data"]["rows"]
+    assert rows[0]["volume"] == 5 and rows[0]["close"] == 11
+    assert len(builder.flush("PERP_ETH_USDC", "1s")) == 2
+    assert builder.flush("PERP_ETH_USDC", "1s") == []
+
+
+def test_volume_and_notional_bars_split_trades():
+    builder = CandleBuilder(bars=("volume:10", "notional:100", "tick:2"))
+    builder.add_trade("S", 5, 4, 1)
+    builder.add_trade("S", 6, 35, 2)
+    volume = builder.flush("S", "volume:10")
+    assert [row["volume"] for row in volume] == [10, 10, 10]
+    assert volume[0]["open"] == 5 and volume[0]["close"] == 6 and volume[0]["end_timestamp"] == 2
+    assert builder.get_kline("S", "volume:10", include_open=True)["data"]["rows"][-1]["volume"] == pytest.approx(9)
+    notional = builder.flush("S", "notional:100")
+    assert [row["amount"] for row in notional] == pytest.approx([100, 100])
+    assert [row["volume"] for row in builder.flush("S", "tick:2")] == [39]
+
+
+def test_ring_keeps_last_bars():
+    builder = CandleBuilder(bars=("tick:1",), capacity=4)
+    for ts in range(10):
+        builder.add_trade("S", ts, 1, ts)
+    assert [row["open"] for row in builder.get_kline("S", "tick:1")["data"]["rows"]] == [7, 8, 9]
+    assert [row["open"] for row in builder.get_kline("S", "tick:1", limit=1)["data"]["rows"]] == [9]
+    assert len(builder.flush("S", "tick:1")) == 3
+    with pytest.raises(ParameterValueError):
+        builder.flush("S", "1m")
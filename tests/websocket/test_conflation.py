@@ -0,0 +1,122 @@
+import asyncio
+import json
+import threading
+import time
+
+import websockets
+
+from orderly_evm_connector.websocket.async_websocket_manager import AsyncWebsocketManager
+from orderly_evm_connector.websocket.conflation import Conflator, get_conflator
+from orderly_evm_connector.websocket.orderly_socket_manager import OrderlySocketManager
+
+
+def bbo(symbol, bid):
+    return {"topic": f"{symbol}@bbo", "ts": bid, "data": {"symbol": symbol, "bid": bid}}
+
+
+def test_newest_message_per_topic_is_kept():
+    conflator = Conflator()
+    for i in range(5):
+        assert conflator.offer("PERP_ETH_USDC@bbo", bbo("PERP_ETH_USDC", i))
+    assert conflator.offer("PERP_BTC_USDC@bbo", bbo("PERP_BTC_USDC", 9))
+    assert not conflator.offer("PERP_ETH_USDC@trade", {"topic": "PERP_ETH_USDC@trade"})
+
+    assert conflator.drain() == [
+        ("PERP_ETH_USDC@bbo", bbo("PERP_ETH_USDC", 4)),
+        ("PERP_BTC_USDC@bbo", bbo("PERP_BTC_USDC", 9)),
+    ]
+    assert conflator.drain() == []
+    assert conflator.stats()["PERP_ETH_USDC@bbo"] == {"received": 5, "delivered": 1, "coalesced": 4}
+
+
+def test_array_topics_are_conflated_per_symbol():
+    conflator = Conflator()
+    conflator.offer("bbos", {"topic": "bbos", "ts": 1, "data": [
+        {"symbol": "PERP_ETH_USDC", "bid": 1},
+        {"symbol": "PERP_BTC_USDC", "bid": 1},
+    ]})
+    conflator.offer("bbos", {"topic": "bbos", "ts": 2, "data": [{"symbol": "PERP_ETH_USDC", "bid": 2}]})
+    assert conflator.drain() == [("bbos", {"topic": "bbos", "ts": 2, "data": [
+        {"symbol": "PERP_ETH_USDC", "bid": 2},
+        {"symbol": "PERP_BTC_USDC", "bid": 1},
+    ]})]
+
+
+def test_topic_patterns():
+    conflator = get_conflator(["PERP_ETH_USDC@*", "markprices"])
+    assert conflator.matches("PERP_ETH_USDC@trade")
+    assert conflator.matches("markprices")
+    assert not conflator.matches("PERP_BTC_USDC@bbo")
+    assert get_conflator(False) is None
+    assert get_conflator(conflator) is conflator
+
+
+def test_async_manager_delivers_once_per_tick():
+    delivered = []
+
+    async def main():
+        manager = AsyncWebsocketManager(
+            "ws://127.0.0.1:1",
+            on_message=lambda _, message: delivered.append(message),
+            conflator=Conflator(),
+        )
+        task = asyncio.ensure_future(manager._deliver_conflated())
+        # a burst read without yielding to the event loop
+        for i in range(100):
+            await manager._dispatch(bbo("PERP_ETH_USDC", i), "PERP_ETH_USDC@bbo")
+        await manager._dispatch({"topic": "PERP_ETH_USDC@trade"}, "PERP_ETH_USDC@trade")
+        await asyncio.sleep(0.01)
+        await manager.close()
+        await asyncio.wait_for(task, 1)
+        return manager.conflator.stats()
+
+    stats = asyncio.run(main())
+    assert delivered == [{"topic": "PERP_ETH_USDC@trade"}, bbo("PERP_ETH_USDC", 99)]
+    assert stats["PERP_ETH_USDC@bbo"]["coalesced"] == 99
+
+
+def test_sync_manager_delivers_on_the_reader_thread():
+    loop = asyncio.new_event_loop()
+    ready = threading.Event()
+    urls = []
+
+    async def handler(ws, path=None):
+        for i in range(100):
+            await ws.send(json.dumps(bbo("PERP_ETH_USDC", i)))
+        await ws.send(json.dumps({"topic": "PERP_ETH_USDC@trade"}))
+        await ws.wait_closed()
+
+    def serve():
+        asyncio.set_event_loop(loop)
+        server = loop.run_until_complete(websockets.serve(handler, "127.0.0.1", 0))
+        urls.append(f"ws://127.0.0.1:{server.sockets[0].getsockname()[1]}")
+        ready.set()
+        loop.run_forever()
+
+    threading.Thread(target=serve, daemon=True).start()
+    ready.wait(5)
+    delivered = []
+
+    def on_message(_, message):
+        # a slow consumer, the burst is received meanwhile
+        if not delivered:
+            time.sleep(0.2)
+        delivered.append((threading.current_thread(), message))
+
+    manager = OrderlySocketManager(
+        urls[0], on_message=on_message, message_format="dict", conflator=Conflator()
+    )
+    manager.start()
+    deadline = time.monotonic() + 5
+    while bbo("PERP_ETH_USDC", 99) not in [message for _, message in delivered] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    manager.close()
+    manager.join(5)
+    loop.call_soon_threadsafe(loop.stop)
+
+    assert {thread for thread, _ in delivered} == {manager}
+    messages = [message for _, message in delivered]
+    assert {"topic": "PERP_ETH_USDC@trade"} in messages
+    bbos = [message for message in messages if message["topic"].endswith("@bbo")]
+    assert bbos[-1] == bbo("PERP_ETH_USDC", 99)
+    assert len(bbos) < 10
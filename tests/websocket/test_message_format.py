@@ -0,0 +1,135 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+import websockets
+
+from orderly_evm_connector.error import ParameterValueError
+from orderly_evm_connector.websocket.async_websocket_manager import AsyncWebsocketManager
+from orderly_evm_connector.websocket.orderly_socket_manager import OrderlySocketManager
+
+update = {
+    "topic": "PERP_ETH_USDC@orderbookupdate",
+    "ts": 1700000000200,
+    "data": {"symbol": "PERP_ETH_USDC", "prevTs": 1700000000000, "asks": [[2000.1, 1.5]], "bids": []},
+}
+
+
+class Server(object):
+    """Websocket server in a background thread sending a ping and an
+    orderbook update to every connection and recording what it receives"""
+
+    def __init__(self):
+        self.received = []
+        self.loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        async def handler(ws, path=None):
+            await ws.send(json.dumps({"event": "ping", "ts": 1700000000000}))
+            await ws.send(json.dumps(update))
+            async for message in ws:
+                self.received.append(json.loads(message))
+
+        def serve():
+            asyncio.set_event_loop(self.loop)
+            server = self.loop.run_until_complete(websockets.serve(handler, "127.0.0.1", 0))
+            self.url = f"ws://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+            ready.set()
+            self.loop.run_forever()
+
+        threading.Thread(target=serve, daemon=True).start()
+        ready.wait(5)
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+def receive(message_format, count):
+    server = Server()
+    messages = []
+    manager = OrderlySocketManager(
+        server.url,
+        on_message=lambda _, message: messages.append(message),
+        message_format=message_format,
+    )
+    manager.start()
+    deadline = time.monotonic() + 5
+    while (len(messages) < count or not server.received) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    manager.close()
+    manager.join(5)
+    server.stop()
+    assert server.received == [{"event": "pong"}]
+    return messages
+
+
+@pytest.mark.parametrize(
+    "message_format, expected",
+    [
+        ("str", json.dumps(update)),
+        ("bytes", json.dumps(update).encode()),
+        ("dict", update),
+    ],
+)
+def test_sync_manager_message_formats(message_format, expected):
+    messages = receive(message_format, 1)
+    # the ping is answered and not delivered
+    assert messages == [expected]
+    assert type(messages[0]) is type(expected)
+
+
+@pytest.mark.parametrize("message_format", ["str", "dict"])
+def test_async_manager_filters_pings_in_every_format(message_format):
+    server = Server()
+    messages = []
+
+    async def main():
+        manager = AsyncWebsocketManager(
+            server.url,
+            on_message=lambda _, message: messages.append(message),
+            message_format=message_format,
+        )
+        task = asyncio.ensure_future(manager.run())
+        for _ in range(500):
+            if messages and server.received:
+                break
+            await asyncio.sleep(0.01)
+        await manager.close()
+        task.cancel()
+
+    asyncio.run(main())
+    server.stop()
+    assert len(messages) == 1 and "ping" not in str(messages[0])
+    assert server.received == [{"event": "pong"}]
+
+
+def test_unknown_message_format_is_rejected():
+    with pytest.raises(ParameterValueError):
+        OrderlySocketManager("ws://127.0.0.1:1", message_format="xml")
+
+
+def test_async_manager_delivers_bytes():
+    server = Server()
+    messages = []
+
+    async def main():
+        manager = AsyncWebsocketManager(
+            server.url,
+            on_message=lambda _, message: messages.append(message),
+            message_format="bytes",
+        )
+        task = asyncio.ensure_future(manager.run())
+        for _ in range(500):
+            if messages and server.received:
+                break
+            await asyncio.sleep(0.01)
+        await manager.close()
+        task.cancel()
+
+    asyncio.run(main())
+    server.stop()
+    # the ping is answered and not delivered
+    assert messages == [json.dumps(update).encode()]
+    assert server.received == [{"event": "pong"}]
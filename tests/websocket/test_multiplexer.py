@@ -0,0 +1,121 @@
+import asyncio
+import json
+
+import websockets
+
+from orderly_evm_connector.websocket.multiplexer import WebsocketPrivateMultiplexer
+
+
+class Signer(object):
+    def __init__(self):
+        self.calls = 0
+
+    def sign(self):
+        self.calls += 1
+        return "1700000000000", "signature"
+
+
+async def private_server():
+    """Websocket server acknowledging `auth` and pushing one message, with
+    the account id of the connection path, on every subscribed topic"""
+    state = {"open": 0, "max_open": 0}
+
+    async def handler(ws, path=None):
+        path = path or getattr(ws, "path", None) or ws.request.path
+        account_id = path.rsplit("/", 1)[-1]
+        state["open"] += 1
+        state["max_open"] = max(state["max_open"], state["open"])
+        try:
+            async for raw in ws:
+                message = json.loads(raw)
+                if message.get("event") == "auth":
+                    await asyncio.sleep(0.01)
+                    await ws.send(json.dumps({"event": "auth", "success": True}))
+                elif message.get("event") == "subscribe":
+                    await ws.send(
+                        json.dumps({"topic": message["topic"], "data": {"accountId": account_id}})
+                    )
+        finally:
+            state["open"] -= 1
+
+    server = await websockets.serve(handler, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    return server, f"ws://127.0.0.1:{port}", state
+
+
+def test_messages_are_tagged_with_their_account():
+    async def main():
+        server, url, _ = await private_server()
+        messages = []
+        signer = Signer()
+
+        def on_message(account_id, message):
+            # auth acks go to on_message too
+            if "topic" in message:
+                messages.append((account_id, message))
+
+        mux = WebsocketPrivateMultiplexer(
+            orderly_key="ed25519:key",
+            topics=("balance",),
+            on_message=on_message,
+        )
+        for n in range(5):
+            client = mux.add_account(f"account{n}", signer=signer)
+            client.websocket_url = f"{url}/account{n}"
+        positions = []
+        mux.add_handler("position", lambda account_id, message: positions.append(account_id))
+
+        assert await mux.run() == []
+        mux.subscribe("position", account_ids=["account1", "account3"])
+        while len(messages) < 5 or len(positions) < 2:
+            await asyncio.sleep(0.01)
+
+        assert sorted(messages) == sorted(
+            (f"account{n}", {"topic": "balance", "data": {"accountId": f"account{n}"}})
+            for n in range(5)
+        )
+        assert sorted(positions) == ["account1", "account3"]
+        assert signer.calls == 5
+
+        await mux.remove_account("account0")
+        assert "account0" not in mux.clients
+        await mux.stop_async()
+        server.close()
+        await server.wait_closed()
+
+    asyncio.run(main())
+
+
+def test_accounts_share_the_connect_semaphore():
+    async def main():
+        server, url, state = await private_server()
+        mux = WebsocketPrivateMultiplexer(
+            orderly_key="ed25519:key", topics=(), max_concurrent_connects=2
+        )
+        for n in range(10):
+            client = mux.add_account(f"account{n}", signer=Signer())
+            client.websocket_url = f"{url}/account{n}"
+
+        assert await mux.run() == []
+        assert state["open"] == 10
+        managers = [client.socket_manager for client in mux.clients.values()]
+        assert all(manager.authenticated.is_set() for manager in managers)
+        assert all(manager.connect_semaphore is mux.connect_semaphore for manager in managers)
+        assert all(manager.reconnect_policy is mux.reconnect_policy for manager in managers)
+
+        await mux.stop_async()
+        server.close()
+        await server.wait_closed()
+
+    asyncio.run(main())
+
+
+def test_accounts_of_one_secret_share_its_signer():
+    secret = "ed25519:4wBqpZM9xaSheZzJSMawUKKwhdpChKbZ5eu5ky4Vigw"
+
+    async def main():
+        mux = WebsocketPrivateMultiplexer(orderly_key="ed25519:key", orderly_secret=secret, topics=())
+        first, second = mux.add_account("account0"), mux.add_account("account1")
+        assert first.signer is second.signer is not None
+
+    asyncio.run(main())
@@ -0,0 +1,164 @@
+import asyncio
+import json
+
+import pytest
+
+from orderly_evm_connector.error import ParameterValueError
+from orderly_evm_connector.websocket.orderbook import OrderBook, OrderBookManager
+from orderly_evm_connector.websocket.router import TopicRouter
+
+symbol = "PERP_ETH_USDC"
+
+
+class Client:
+    wss_id = "test"
+
+    def __init__(self):
+        self.on_message = None
+        self.router = TopicRouter()
+        self.sent = []
+
+    def add_handler(self, topic, handler):
+        self.router.add(topic, handler)
+
+    def receive(self, message):
+        # dispatch like the socket managers do
+        topic = (json.loads(message) if isinstance(message, str) else message).get("topic")
+        handlers = self.router.match(topic)
+        for handler in handlers or [self.on_message]:
+            handler(None, message)
+
+    def send(self, message):
+        self.sent.append(message)
+
+    def send_message_to_server(self, message):
+        self.sent.append(message)
+
+
+def update(ts, prev_ts, bids=(), asks=()):
+    return json.dumps(
+        {
+            "topic": f"{symbol}@orderbookupdate",
+            "ts": ts,
+            "data": {"symbol": symbol, "prevTs": prev_ts, "bids": bids, "asks": asks},
+        }
+    )
+
+
+def snapshot(ts, bids, asks):
+    return {
+        "id": "test",
+        "event": "request",
+        "success": True,
+        "ts": ts,
+        "data": {"symbol": symbol, "ts": ts, "bids": bids, "asks": asks},
+    }
+
+
+def test_book_levels_are_sorted_best_first():
+    book = OrderBook(symbol)
+    book.apply_snapshot([[10, 1], [9, 2], [9.5, 3]], [[12, 1], [11, 2], [11.5, 3]], 1)
+    book.apply_update([[9.5, 0], [10.5, 4]], [[11, 0]], 2, 1)
+    assert book.bbo() == {"symbol": symbol, "ts": 2, "bid": [10.5, 4], "ask": [11.5, 3]}
+    assert book.depth(2)["bids"] == [[10.5, 4], [10, 1]]
+    assert book.depth()["asks"] == [[11.5, 3], [12, 1]]
+
+
+def test_updates_are_buffered_until_snapshot():
+    client = Client()
+    books = OrderBookManager(client)
+    books.subscribe(symbol)
+    assert client.sent[0]["topic"] == f"{symbol}@orderbookupdate"
+    assert client.sent[1]["params"] == {"type": "orderbook", "symbol": symbol}
+
+    client.receive(update(100, 90, [[10, 1]]))
+    client.receive(update(110, 100, [[10, 0], [9.5, 2]], [[11, 3]]))
+    assert not books.is_ready(symbol)
+
+    client.receive(snapshot(105, [[10, 1], [9, 4]], [[11, 1], [12, 2]]))
+    assert books.is_ready(symbol)
+    assert books.get_bbo(symbol)["bid"] == [9.5, 2]
+    assert books.get_depth(symbol, 1) == {
+        "symbol": symbol,
+        "ts": 110,
+        "bids": [[9.5, 2]],
+        "asks": [[11, 3]],
+    }
+
+
+def test_gap_triggers_resync():
+    client = Client()
+    books = OrderBookManager(client)
+    books.subscribe(symbol)
+    client.receive(snapshot(100, [[10, 1]], [[11, 1]]))
+    client.receive(update(120, 110, [[10.5, 1]]))
+    assert not books.is_ready(symbol)
+    assert books.resyncs == 2
+    assert client.sent[-1]["event"] == "request"
+
+    client.receive(snapshot(115, [[10, 2]], [[11, 2]]))
+    assert books.is_ready(symbol)
+    assert books.get_depth(symbol)["bids"] == [[10.5, 1], [10, 2]]
+
+
+def test_async_query_waits_for_snapshot():
+    client = Client()
+    books = OrderBookManager(client)
+    books.subscribe(symbol)
+
+    async def main():
+        pending = asyncio.ensure_future(books.get_bbo_async(symbol, timeout=1))
+        await asyncio.sleep(0)
+        client.receive(snapshot(100, [[10, 1]], [[11, 1]]))
+        return await pending
+
+    assert asyncio.run(main())["ask"] == [11, 1]
+
+
+def test_async_query_times_out_on_unsynced_book():
+    books = OrderBookManager(Client())
+    books.subscribe(symbol)
+
+    async def main():
+        with pytest.raises(TimeoutError):
+            await books.get_depth_async(symbol, timeout=0.01)
+
+    asyncio.run(main())
+    assert books._waiters == {}
+
+
+def test_queries_refuse_unsynced_and_unknown_books():
+    client = Client()
+    books = OrderBookManager(client)
+    books.subscribe(symbol)
+    with pytest.raises(TimeoutError):
+        books.get_bbo(symbol)
+    client.receive(snapshot(100, [[10, 1]], [[11, 1]]))
+    assert books.get_bbo(symbol)["bid"] == [10, 1]
+    # a gap resyncs the book
+    client.receive(update(120, 110, [[10.5, 1]]))
+    with pytest.raises(TimeoutError):
+        books.get_depth(symbol, timeout=0.01)
+    with pytest.raises(ParameterValueError):
+        books.get_bbo("PERP_BTC_USDC")
+
+
+def test_orderbook_pushes_do_not_replace_a_delta_book():
+    def push(ts, bids, asks):
+        return json.dumps(
+            {"topic": f"{symbol}@orderbook", "ts": ts, "data": {"symbol": symbol, "bids": bids, "asks": asks}}
+        )
+
+    client = Client()
+    books = OrderBookManager(client)
+    books.subscribe(symbol)
+    client.receive(snapshot(100, [[10, 1], [9, 1]], [[11, 1]]))
+    client.receive(push(105, [[10, 5]], [[11, 5]]))
+    assert books.get_depth(symbol)["bids"] == [[10, 1], [9, 1]]
+    client.receive(update(110, 100, [[10, 2]]))
+    assert books.is_ready(symbol)
+
+    # without a delta subscription the pushes are the book
+    other = OrderBookManager(client)
+    other.process(push(105, [[10, 5]], [[11, 5]]))
+    assert other.get_bbo(symbol)["bid"] == [10, 5]
@@ -0,0 +1,150 @@
+import asyncio
+import json
+import threading
+
+from orderly_evm_connector.async_api import AsyncAPI
+from orderly_evm_connector.websocket.orders import OpenOrderStore, report_to_row
+from orderly_evm_connector.websocket.router import TopicRouter
+
+
+class Client:
+    wss_id = "test"
+
+    def __init__(self):
+        self.on_message = None
+        self.connect_handlers = []
+        self.router = TopicRouter()
+        self.sent = []
+
+    def add_handler(self, topic, handler):
+        self.router.add(topic, handler)
+
+    def add_connect_handler(self, handler):
+        self.connect_handlers.append(handler)
+
+    def receive(self, message):
+        for handler in self.router.match(message["topic"]):
+            handler(None, json.dumps(message))
+
+    def reconnect(self):
+        for handler in self.connect_handlers:
+            handler(None)
+
+    def send_message_to_server(self, message):
+        self.sent.append(message)
+
+
+class Rest:
+    """`iter_orders` returning `snapshots` one after the other, each once
+    `release` is set"""
+
+    def __init__(self, *snapshots):
+        self.snapshots = list(snapshots)
+        self.release = threading.Event()
+        self.release.set()
+        self.calls = []
+
+    def iter_orders(self, **kwargs):
+        self.calls.append(kwargs)
+        self.release.wait(1)
+        return iter(self.snapshots.pop(0))
+
+
+def row(order_id, status="NEW", client_order_id=None, symbol="PERP_ETH_USDC", updated_time=1):
+    return {
+        "order_id": order_id,
+        "client_order_id": client_order_id,
+        "symbol": symbol,
+        "side": "BUY",
+        "type": "LIMIT",
+        "price": 2000,
+        "quantity": 1,
+        "executed": 0,
+        "status": status,
+        "updated_time": updated_time,
+    }
+
+
+def report(order_id, status, timestamp, executed=0, client_order_id="", symbol="PERP_ETH_USDC"):
+    return {
+        "topic": "executionreport",
+        "ts": timestamp,
+        "data": {
+            "symbol": symbol,
+            "clientOrderId": client_order_id,
+            "orderId": order_id,
+            "type": "LIMIT",
+            "side": "BUY",
+            "quantity": 1,
+            "price": 2000,
+            "totalExecutedQuantity": executed,
+            "status": status,
+            "timestamp": timestamp,
+        },
+    }
+
+
+def test_reports_update_the_indexes():
+    client = Client()
+    store = OpenOrderStore(client)
+    store.load_snapshot([row(1, client_order_id="a"), row(2, symbol="PERP_BTC_USDC"), row(3, status="FILLED")])
+    assert len(store) == 2 and 3 not in store
+
+    client.receive(report(4, "NEW", 2, client_order_id="b"))
+    client.receive(report(1, "PARTIAL_FILLED", 3, executed=0.5))
+    assert store.get_by_client_order_id("b")["order_id"] == 4
+    assert store.get(1)["executed"] == 0.5
+    assert store.get(1)["client_order_id"] == "a"
+    assert sorted(o["order_id"] for o in store.get_open_orders("PERP_ETH_USDC")) == [1, 4]
+
+    client.receive(report(1, "FILLED", 4, executed=1))
+    client.receive(report(4, "CANCELLED", 5, client_order_id="b"))
+    # an older report does not bring an order back
+    client.receive(report(2, "NEW", 0, symbol="PERP_BTC_USDC"))
+    client.receive(report(2, "CANCELLED", 6, symbol="PERP_BTC_USDC"))
+    assert len(store) == 0
+    assert store.get_by_client_order_id("b") is None
+    assert store.symbols() == []
+    assert report_to_row(report(5, "NEW", 7)["data"])["updated_time"] == 7
+
+
+def test_reconciles_on_subscribe_and_reconnect():
+    client = Client()
+    rest = Rest([row(1), row(2)], [row(2), row(3)])
+    store = OpenOrderStore(client, rest)
+    store.subscribe()
+    assert client.sent == [{"id": "test", "topic": "executionreport", "event": "subscribe"}]
+    assert store.wait_ready(1)
+    assert rest.calls == [{"symbol": None, "status": "INCOMPLETE"}]
+    assert sorted(o["order_id"] for o in store.get_open_orders()) == [1, 2]
+
+    # reports received while the snapshot is loading are replayed over it
+    rest.release.clear()
+    client.reconnect()
+    client.receive(report(3, "FILLED", 9))
+    client.receive(report(4, "NEW", 9))
+    assert store.reconciles == 2
+    rest.release.set()
+    for _ in range(100):
+        if 1 not in store:
+            break
+        threading.Event().wait(0.01)
+    assert sorted(o["order_id"] for o in store.get_open_orders()) == [2, 4]
+
+
+def test_async_reconcile():
+    class AsyncRest(AsyncAPI):
+        def __init__(self):
+            pass
+
+        async def iter_orders(self, **kwargs):
+            for r in [row(1), row(2, status="CANCELLED")]:
+                yield r
+
+    async def main():
+        store = OpenOrderStore(Client(), AsyncRest())
+        store.reconcile()
+        assert await store.wait_ready_async(1)
+        return [o["order_id"] for o in store.get_open_orders()]
+
+    assert asyncio.run(main()) == [1]
@@ -0,0 +1,123 @@
+import asyncio
+import json
+
+import websockets
+
+from orderly_evm_connector.websocket.pool import WebsocketPublicAPIClientPool
+
+
+class Manager(object):
+    def __init__(self):
+        self.sent = []
+        self._login = False
+
+    def send_message(self, message):
+        self.sent.append(json.loads(message))
+
+    def send_messages(self, messages):
+        for message in messages:
+            self.send_message(message)
+
+
+def offline_pool(**kwargs):
+    pool = WebsocketPublicAPIClientPool(async_mode=True, **kwargs)
+    for client in pool.clients:
+        client.socket_manager = Manager()
+    return pool
+
+
+def test_topics_are_spread_by_hash():
+    pool = offline_pool(shards=4)
+    symbols = [f"PERP_{n}_USDC" for n in range(100)]
+    for symbol in symbols:
+        pool.get_orderbookupdate(f"{symbol}@orderbookupdate")
+
+    counts = [len(client.subscriptions) for client in pool.clients]
+    assert sum(counts) == 100
+    assert all(count > 0 for count in counts)
+    # a topic always lands on the same shard
+    assert pool.shard_for(f"{symbols[0]}@orderbookupdate") == pool.shard_for(
+        f"{symbols[0]}@orderbookupdate"
+    )
+    assert [stats["topics"] for stats in pool.shard_stats()] == counts
+
+    topic = f"{symbols[0]}@orderbookupdate"
+    shard = pool.shard_for(topic)
+    pool.send_message_to_server({"id": pool.wss_id, "event": "unsubscribe", "topic": topic})
+    assert topic not in pool.clients[shard].subscriptions
+    assert pool.shard_stats()[shard]["topics"] == counts[shard] - 1
+
+
+def test_topics_are_spread_by_weight():
+    pool = offline_pool(shards=2, weights={"*@orderbookupdate": 5, "PERP_BTC_USDC@trade": 3})
+    pool.get_orderbookupdate("PERP_ETH_USDC@orderbookupdate")
+    pool.get_trade("PERP_BTC_USDC@trade")
+    pool.get_trade("PERP_ETH_USDC@trade")
+    pool.get_trade("PERP_SOL_USDC@trade")
+
+    assert pool.shard_for("PERP_ETH_USDC@orderbookupdate") == 0
+    assert [stats["load"] for stats in pool.shard_stats()] == [5, 5]
+    assert len(pool.clients[1].subscriptions) == 3
+
+
+def test_closing_streams_releases_the_shard_load():
+    async def main():
+        pool = offline_pool(shards=2, weights={"*@orderbookupdate": 5})
+        first = pool.stream("PERP_ETH_USDC@orderbookupdate")
+        second = pool.stream("PERP_ETH_USDC@orderbookupdate")
+        assert sum(stats["load"] for stats in pool.shard_stats()) == 5
+        first.close()
+        assert sum(stats["load"] for stats in pool.shard_stats()) == 5
+        second.close()
+        assert [stats["load"] for stats in pool.shard_stats()] == [0, 0]
+        assert [stats["topics"] for stats in pool.shard_stats()] == [0, 0]
+
+        # streams not subscribing, and streams of a topic also subscribed
+        pool.stream("PERP_BTC_USDC@orderbookupdate", subscribe=False).close()
+        assert sum(stats["load"] for stats in pool.shard_stats()) == 0
+        pool.get_trade("PERP_ETH_USDC@trade")
+        pool.stream("PERP_ETH_USDC@trade").close()
+        assert sum(stats["load"] for stats in pool.shard_stats()) == 1
+        pool.send_message_to_server({"id": pool.wss_id, "event": "unsubscribe", "topic": "PERP_ETH_USDC@trade"})
+        assert sum(stats["load"] for stats in pool.shard_stats()) == 0
+
+    asyncio.run(main())
+
+
+def test_shards_share_the_handlers():
+    pool = offline_pool(shards=3)
+    handler = lambda manager, message: None
+    pool.add_handler("*@bbo", handler)
+    assert all(client.router.match("PERP_ETH_USDC@bbo") == (handler,) for client in pool.clients)
+
+
+def test_every_shard_delivers_to_one_stream():
+    async def main():
+        async def handler(ws, path=None):
+            async for raw in ws:
+                message = json.loads(raw)
+                if message.get("event") == "subscribe":
+                    await ws.send(json.dumps({"topic": message["topic"], "data": {}}))
+
+        server = await websockets.serve(handler, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        pool = WebsocketPublicAPIClientPool(shards=2, async_mode=True)
+        for client in pool.clients:
+            client.websocket_url = f"ws://127.0.0.1:{port}"
+        await pool.run()
+
+        received = asyncio.Queue()
+        pool.add_handler("*@trade", lambda manager, message: received.put_nowait((manager, message)))
+        topics = [f"PERP_{n}_USDC@trade" for n in range(8)]
+        for topic in topics:
+            pool.get_trade(topic)
+        messages = [await asyncio.wait_for(received.get(), 2) for _ in topics]
+
+        assert sorted(message["topic"] for _, message in messages) == sorted(topics)
+        assert len({id(manager) for manager, _ in messages}) == 2
+
+        await pool.stop_async()
+        server.close()
+        await server.wait_closed()
+
+    asyncio.run(main())
@@ -0,0 +1,121 @@
+import json
+import threading
+
+import pytest
+
+from orderly_evm_connector.websocket.positions import PositionEngine
+from orderly_evm_connector.websocket.router import TopicRouter
+
+
+class Client:
+    wss_id = "test"
+
+    def __init__(self):
+        self.connect_handlers = []
+        self.router = TopicRouter()
+        self.sent = []
+
+    def add_handler(self, topic, handler):
+        self.router.add(topic, handler)
+
+    def add_connect_handler(self, handler):
+        self.connect_handlers.append(handler)
+
+    def receive(self, topic, data, ts=1):
+        for handler in self.router.match(topic):
+            handler(None, json.dumps({"topic": topic, "ts": ts, "data": data}))
+
+    def reconnect(self):
+        for handler in self.connect_handlers:
+            handler(None)
+
+    def send_message_to_server(self, message):
+        self.sent.append(message["topic"])
+
+
+class Rest:
+    def __init__(self):
+        self.release = threading.Event()
+        self.release.set()
+        self.positions = [
+            {"symbol": "PERP_ETH_USDC", "position_qty": 2, "cost_position": 4000, "mark_price": 2000, "timestamp": 1},
+        ]
+
+    def get_all_positions_info(self):
+        self.release.wait(1)
+        return {"success": True, "data": {"rows": list(self.positions)}}
+
+    def get_current_holdings(self):
+        return {"success": True, "data": {"holding": [{"token": "USDC", "holding": 1000, "frozen": 10, "pending_short": 0}]}}
+
+    def get_account_information(self):
+        return {"success": True, "data": {"account_id": "0x1", "max_leverage": 10}}
+
+
+def push(symbol, qty, cost, mark_price, timestamp):
+    return {
+        "positions": [
+            {"symbol": symbol, "positionQty": qty, "costPosition": cost, "markPrice": mark_price, "timestamp": timestamp}
+        ]
+    }
+
+
+def test_mark_prices_update_unrealized_pnl():
+    client, public = Client(), Client()
+    engine = PositionEngine(client, public)
+    client.receive("position", push("PERP_ETH_USDC", 2, 4000, 2000, 1))
+    client.receive("position", push("PERP_BTC_USDC", -0.1, -6000, 60000, 1))
+    assert engine.get_unrealized_pnl() == 0
+
+    state = engine.state
+    public.receive("markprices", [{"symbol": "PERP_ETH_USDC", "price": 2100}, {"symbol": "PERP_NEAR_USDC", "price": 5}])
+    assert engine.get_position("PERP_ETH_USDC").unrealized_pnl == pytest.approx(200)
+    assert engine.get_unrealized_pnl() == pytest.approx(200)
+    # a published state is never modified
+    assert state.positions["PERP_ETH_USDC"].mark_price == 2000
+    assert state.unrealized_pnl == 0
+
+    public.receive("markprices", [{"symbol": "PERP_BTC_USDC", "price": 59000}])
+    assert engine.get_unrealized_pnl() == pytest.approx(300)
+    # the last mark price is kept for positions opened later
+    client.receive("position", push("PERP_NEAR_USDC", 10, 40, 4, 2))
+    assert engine.get_position("PERP_NEAR_USDC").unrealized_pnl == pytest.approx(10)
+    # closed positions are dropped, older pushes ignored
+    client.receive("position", push("PERP_BTC_USDC", 0, 0, 59000, 3))
+    client.receive("position", push("PERP_BTC_USDC", -0.1, -6000, 60000, 2))
+    assert engine.get_position("PERP_BTC_USDC") is None
+    assert engine.get_unrealized_pnl() == pytest.approx(210)
+
+
+def test_balance_and_account_pushes():
+    client = Client()
+    engine = PositionEngine(client)
+    client.receive("balance", {"balances": {"USDC": {"holding": 5, "frozen": 1, "pendingShortQty": 0}}}, ts=3)
+    client.receive("account", {"accountId": "0x1", "takerFeeRate": 6})
+    assert engine.get_balance().holding == 5
+    assert engine.get_balance().updated_time == 3
+    assert engine.state.account == {"account_id": "0x1", "taker_fee_rate": 6}
+
+
+def test_resync_on_subscribe_and_reconnect():
+    client, public, rest = Client(), Client(), Rest()
+    engine = PositionEngine(client, public, rest)
+    engine.subscribe()
+    assert client.sent == ["position", "balance", "account"]
+    assert public.sent == ["markprices"]
+    assert engine.wait_ready(1)
+    assert engine.get_balance("USDC").frozen == 10
+    assert engine.state.account["max_leverage"] == 10
+
+    # pushes received while reloading are replayed over the snapshot
+    rest.release.clear()
+    rest.positions = []
+    client.reconnect()
+    client.receive("position", push("PERP_BTC_USDC", 1, 60000, 60000, 5))
+    rest.release.set()
+    for _ in range(100):
+        if engine.get_position("PERP_ETH_USDC") is None:
+            break
+        threading.Event().wait(0.01)
+    assert [p.symbol for p in engine.get_positions()] == ["PERP_BTC_USDC"]
+    assert engine.resyncs == 2
@@ -0,0 +1,149 @@
+import asyncio
+import json
+import time
+
+import pytest
+import websockets
+
+from orderly_evm_connector.error import WebsocketClientError
+from orderly_evm_connector.websocket.websocket_client import OrderlyWebsocketClient
+
+
+class Signer(object):
+    def sign(self):
+        return "1700000000000", "signature"
+
+
+async def acking_server(auth_delay=0.0, auth_success=True):
+    """Websocket server acknowledging `auth` and `subscribe` events, and
+    sending one message on every subscribed topic"""
+    received = []
+
+    async def handler(ws, path=None):
+        async for raw in ws:
+            message = json.loads(raw)
+            received.append(message)
+            event = message.get("event")
+            if event == "auth":
+                await asyncio.sleep(auth_delay)
+                await ws.send(json.dumps({"id": message["id"], "event": "auth", "success": auth_success}))
+            elif event == "subscribe":
+                topic = message["topic"]
+                await ws.send(
+                    json.dumps(
+                        {"id": message["id"], "event": "subscribe", "success": True, "data": topic}
+                    )
+                )
+                await ws.send(json.dumps({"topic": topic, "data": {"n": 1}}))
+
+    server = await websockets.serve(handler, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    return server, f"ws://127.0.0.1:{port}", received
+
+
+def test_run_returns_once_connected_without_waiting_for_a_message():
+    async def main():
+        server, url, _ = await acking_server()
+        client = OrderlyWebsocketClient(url, async_mode=True)
+        started = time.monotonic()
+        await client.run()
+        startup = time.monotonic() - started
+        # the server sends nothing before a subscription
+        assert startup < 0.5
+        assert client.socket_manager.connected.is_set()
+
+        stream = client.stream("PERP_ETH_USDC@trade")
+        assert await client.wait_subscribed(timeout=2)
+        message = await stream.get(timeout=2)
+        first_message = time.monotonic() - started
+        assert message["topic"] == "PERP_ETH_USDC@trade"
+        assert first_message < 1
+
+        await client.stop_async()
+        server.close()
+        await server.wait_closed()
+
+    asyncio.run(main())
+
+
+def test_private_run_waits_for_the_auth_ack():
+    async def main():
+        server, url, received = await acking_server(auth_delay=0.2)
+        client = OrderlyWebsocketClient(
+            url, orderly_key="ed25519:key", private=True, async_mode=True, signer=Signer()
+        )
+        started = time.monotonic()
+        await client.run()
+        assert time.monotonic() - started >= 0.2
+        assert client.socket_manager.authenticated.is_set()
+        assert received[0]["event"] == "auth"
+
+        await client.stop_async()
+        server.close()
+        await server.wait_closed()
+
+    asyncio.run(main())
+
+
+def test_private_run_raises_when_auth_is_rejected():
+    async def main():
+        server, url, _ = await acking_server(auth_success=False)
+        client = OrderlyWebsocketClient(
+            url, orderly_key="ed25519:key", private=True, async_mode=True, signer=Signer()
+        )
+        with pytest.raises(WebsocketClientError):
+            await client.run(timeout=5)
+        assert not client.socket_manager.authenticated.is_set()
+
+        # a server that never answers `auth`
+        server.close()
+        await server.wait_closed()
+        server, url, _ = await acking_server(auth_delay=10)
+        client = OrderlyWebsocketClient(
+            url, orderly_key="ed25519:key", private=True, async_mode=True, signer=Signer()
+        )
+        assert await client.run(timeout=0.2) is False
+        await client.stop_async()
+        server.close()
+
+    asyncio.run(main())
+
+
+def test_subscribed_is_cleared_until_every_subscription_is_acked():
+    async def main():
+        server, url, received = await acking_server()
+        client = OrderlyWebsocketClient(url, async_mode=True)
+        await client.run()
+        manager = client.socket_manager
+        for topic in ("PERP_ETH_USDC@bbo", "PERP_BTC_USDC@bbo", "PERP_ETH_USDC@bbo"):
+            client.subscribe({"id": client.wss_id, "event": "subscribe", "topic": topic})
+        assert not manager.subscribed.is_set()
+        assert await client.wait_subscribed(timeout=2)
+        assert client.subscriptions.stats() == {"pending": 0, "acked": 2, "failed": 0}
+        assert len(received) == 2
+
+        await client.stop_async()
+        server.close()
+        await server.wait_closed()
+
+    asyncio.run(main())
+
+
+def test_connect_handlers_are_called_instead_of_on_open():
+    async def main():
+        server, url, _ = await acking_server()
+        opened, connected = [], []
+        client = OrderlyWebsocketClient(url, async_mode=True, on_open=lambda manager: opened.append(manager))
+        client.subscriptions.add({"id": client.wss_id, "event": "subscribe", "topic": "PERP_ETH_USDC@bbo"})
+        client.add_connect_handler(connected.append)
+        await client.run()
+        assert await client.wait_subscribed(timeout=2)
+        # `on_open` is the user's and is not called by the client
+        assert opened == []
+        assert connected == [client.socket_manager]
+
+        await client.stop_async()
+        server.close()
+        await server.wait_closed()
+
+    asyncio.run(main())
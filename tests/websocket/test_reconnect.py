@@ -0,0 +1,132 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+import websockets
+
+from orderly_evm_connector.error import ParameterValueError
+from orderly_evm_connector.websocket.async_websocket_manager import AsyncWebsocketManager
+from orderly_evm_connector.websocket.orderly_socket_manager import OrderlySocketManager
+from orderly_evm_connector.websocket.reconnect import ReconnectPolicy
+
+
+def fast_policy(**kwargs):
+    kwargs.setdefault("initial_delay", 0.01)
+    kwargs.setdefault("max_delay", 0.05)
+    kwargs.setdefault("jitter", 0)
+    return ReconnectPolicy(**kwargs)
+
+
+async def dropping_server(drops):
+    """Websocket server sending one message per connection and dropping the
+    first `drops` connections"""
+    connections = []
+
+    async def handler(ws, path=None):
+        connections.append(ws)
+        await ws.send(json.dumps({"topic": "connection", "data": len(connections)}))
+        if len(connections) <= drops:
+            await ws.close(code=1011)
+            return
+        await ws.wait_closed()
+
+    server = await websockets.serve(handler, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    return server, f"ws://127.0.0.1:{port}", connections
+
+
+def test_delay_grows_exponentially_up_to_the_cap():
+    policy = ReconnectPolicy(initial_delay=0.1, max_delay=1, multiplier=2, jitter=0)
+    assert [policy.delay(attempt) for attempt in range(6)] == [0.1, 0.2, 0.4, 0.8, 1, 1]
+    jittered = ReconnectPolicy(initial_delay=0.1, jitter=0.5, random_func=lambda: 1.0)
+    assert jittered.delay(0) == pytest.approx(0.05)
+    assert ReconnectPolicy(max_retries=None).should_retry(10**6)
+    assert not ReconnectPolicy(max_retries=3).should_retry(3)
+    with pytest.raises(ParameterValueError):
+        ReconnectPolicy(give_up="retry")
+
+
+def test_async_manager_reconnects_with_backoff():
+    policy = fast_policy()
+    messages = []
+
+    async def main():
+        server, url, connections = await dropping_server(drops=3)
+        manager = AsyncWebsocketManager(
+            url, on_message=lambda _, message: messages.append(message), reconnect_policy=policy
+        )
+        task = asyncio.ensure_future(manager.run())
+        try:
+            for _ in range(200):
+                if len(messages) == 4:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await manager.close()
+            task.cancel()
+            server.close()
+            await server.wait_closed()
+
+    asyncio.run(main())
+    assert [message["data"] for message in messages] == [1, 2, 3, 4]
+    stats = policy.stats()
+    assert stats["reconnects"] == 3
+    assert stats["attempts"] == 3
+    # no fixed 5s sleep between a drop and the next connection
+    assert stats["max_latency"] < 1
+
+
+def test_async_manager_gives_up_and_closes():
+    policy = fast_policy(max_retries=2, give_up="close")
+    closed = []
+
+    async def main():
+        server, url, _ = await dropping_server(drops=1)
+        manager = AsyncWebsocketManager(
+            url, on_close=lambda _: closed.append(True), reconnect_policy=policy
+        )
+        await manager.create_ws_connection()
+        server.close()
+        await server.wait_closed()
+        await asyncio.wait_for(manager.read_data(), 5)
+
+    asyncio.run(main())
+    assert closed == [True]
+    stats = policy.stats()
+    assert stats["give_ups"] == 1
+    assert stats["failures"] == 3
+
+
+def test_sync_manager_reconnects_once_per_drop():
+    policy = fast_policy()
+    messages = []
+    ready = threading.Event()
+    loop = asyncio.new_event_loop()
+    holder = {}
+
+    def serve():
+        asyncio.set_event_loop(loop)
+        holder["server"], holder["url"], _ = loop.run_until_complete(dropping_server(drops=2))
+        ready.set()
+        loop.run_forever()
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    ready.wait(5)
+    manager = OrderlySocketManager(
+        holder["url"],
+        on_message=lambda _, message: messages.append(json.loads(message)),
+        reconnect_policy=policy,
+    )
+    manager.start()
+    deadline = time.monotonic() + 5
+    while len(messages) < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    manager.close()
+    manager.join(5)
+    loop.call_soon_threadsafe(loop.stop)
+
+    assert [message["data"] for message in messages] == [1, 2, 3]
+    assert policy.stats()["reconnects"] == 2
@@ -0,0 +1,50 @@
+import asyncio
+
+from orderly_evm_connector.lib.utils import get_ws_topic
+from orderly_evm_connector.websocket.async_websocket_manager import AsyncWebsocketManager
+from orderly_evm_connector.websocket.router import TopicRouter
+
+
+def test_exact_and_wildcard_routes():
+    router = TopicRouter()
+    bbo, eth, every, report = object(), object(), object(), object()
+    router.add("*@bbo", bbo)
+    router.add("PERP_ETH_USDC@*", eth)
+    router.add("*", every)
+    router.add("executionreport", report)
+
+    assert router.match("PERP_ETH_USDC@bbo") == (bbo, eth, every)
+    assert router.match("PERP_BTC_USDC@bbo") == (bbo, every)
+    assert router.match("PERP_ETH_USDC@trade") == (eth, every)
+    assert router.match("executionreport") == (report, every)
+    assert router.match(None) == ()
+
+    router.remove("*")
+    router.remove("*@bbo", bbo)
+    assert router.match("PERP_BTC_USDC@bbo") == ()
+
+
+def test_topic_is_read_without_decoding():
+    assert get_ws_topic(b'{"topic":"PERP_ETH_USDC@bbo","ts":1,"data":{}}') == "PERP_ETH_USDC@bbo"
+    assert get_ws_topic('{"id":"1", "topic": "executionreport"}') == "executionreport"
+    assert get_ws_topic(b'{"event":"ping","ts":1}') is None
+
+
+def test_managers_fall_back_to_on_message():
+    routed, fallback = [], []
+
+    async def main():
+        router = TopicRouter()
+        router.add("*@bbo", lambda _, message: routed.append(message))
+        manager = AsyncWebsocketManager(
+            "ws://127.0.0.1:1",
+            on_message=lambda _, message: fallback.append(message),
+            router=router,
+        )
+        await manager._dispatch({"topic": "PERP_ETH_USDC@bbo"}, "PERP_ETH_USDC@bbo")
+        await manager._dispatch({"topic": "PERP_ETH_USDC@trade"}, "PERP_ETH_USDC@trade")
+        await manager._dispatch({"event": "subscribe"}, None)
+
+    asyncio.run(main())
+    assert routed == [{"topic": "PERP_ETH_USDC@bbo"}]
+    assert fallback == [{"topic": "PERP_ETH_USDC@trade"}, {"event": "subscribe"}]
@@ -0,0 +1,94 @@
+import asyncio
+import json
+
+import pytest
+import websockets
+
+from orderly_evm_connector.error import ParameterValueError
+from orderly_evm_connector.websocket.stream import TopicStream
+from orderly_evm_connector.websocket.websocket_client import OrderlyWebsocketClient
+
+topic = "PERP_ETH_USDC@trade"
+
+
+def fill(stream, count):
+    for i in range(count):
+        stream.handler(None, {"topic": topic, "data": i})
+
+
+def test_overflow_policies():
+    async def main():
+        oldest = TopicStream(topic, maxsize=3, overflow="drop_oldest")
+        fill(oldest, 5)
+        oldest.close()
+        assert [message["data"] async for message in oldest] == [2, 3, 4]
+        assert oldest.dropped == 2
+
+        latest = TopicStream(topic, maxsize=3, overflow="conflate")
+        fill(latest, 5)
+        assert latest.qsize() == 1
+        latest.close()
+        assert [message["data"] async for message in latest] == [4]
+        assert latest.dropped == 4
+
+        # conflated well below maxsize too
+        latest = TopicStream(topic, overflow="conflate")
+        fill(latest, 3)
+        assert latest.qsize() == 1
+        assert (await latest.get(timeout=1))["data"] == 2
+        assert latest.dropped == 2
+
+        blocking = TopicStream(topic, maxsize=1, overflow="block")
+        await blocking.handler(None, 1)
+        put = asyncio.ensure_future(blocking.handler(None, 2))
+        await asyncio.sleep(0.01)
+        assert not put.done()
+        assert await blocking.get() == 1
+        await put
+        assert await blocking.get() == 2
+
+    asyncio.run(main())
+    with pytest.raises(ParameterValueError):
+        TopicStream(topic, overflow="latest")
+
+
+def test_slow_stream_does_not_delay_heartbeat():
+    received = []
+
+    async def handler(ws, path=None):
+        await ws.send(json.dumps({"event": "connected"}))
+        async for raw in ws:
+            message = json.loads(raw)
+            received.append(message)
+            if message.get("event") == "subscribe":
+                for i in range(500):
+                    await ws.send(json.dumps({"topic": topic, "data": i}))
+                await ws.send(json.dumps({"event": "ping", "ts": 1}))
+
+    async def main():
+        server = await websockets.serve(handler, "127.0.0.1", 0)
+        url = f"ws://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+        client = OrderlyWebsocketClient(url, async_mode=True)
+        try:
+            await client.run()
+            stream = client.stream(topic, maxsize=10)
+            # nobody reads the stream while the burst arrives
+            for _ in range(200):
+                if {"event": "pong"} in received:
+                    break
+                await asyncio.sleep(0.01)
+            assert {"event": "pong"} in received
+            messages = [await stream.get(timeout=1) for _ in range(10)]
+            assert [message["data"] for message in messages] == list(range(490, 500))
+            assert stream.dropped == 490
+
+            stream.close()
+            await asyncio.sleep(0.05)
+            assert received[-1] == {"id": client.wss_id, "event": "unsubscribe", "topic": topic}
+            assert client.router.match(topic) == ()
+        finally:
+            await client.socket_manager.close()
+            server.close()
+            await server.wait_closed()
+
+    asyncio.run(main())
@@ -0,0 +1,72 @@
+from orderly_evm_connector.websocket.subscriptions import SubscriptionRegistry
+
+
+def subscribe(topic, params=None):
+    message = {"id": "wss", "event": "subscribe", "topic": topic}
+    if params:
+        message["params"] = params
+    return message
+
+
+def test_topic_is_registered_once():
+    registry = SubscriptionRegistry()
+    assert registry.add(subscribe("PERP_ETH_USDC@bbo"))
+    assert not registry.add(subscribe("PERP_ETH_USDC@bbo"))
+    assert registry.add(subscribe("executionreport", {"symbol": "PERP_ETH_USDC"}))
+    assert registry.add(subscribe("executionreport", {"symbol": "PERP_BTC_USDC"}))
+    assert len(registry) == 3
+    assert "PERP_ETH_USDC@bbo" in registry
+    assert registry.state("PERP_ETH_USDC@bbo") == "pending"
+
+
+def test_acknowledgements_update_the_state():
+    registry = SubscriptionRegistry()
+    registry.add(subscribe("PERP_ETH_USDC@bbo"))
+    registry.add(subscribe("PERP_BTC_USDC@bbo"))
+    registry.add(subscribe("balance"))
+
+    assert registry.acknowledge({"event": "subscribe", "success": True, "data": "PERP_BTC_USDC@bbo"})
+    assert registry.state("PERP_BTC_USDC@bbo") == "acked"
+    # without the topic, the oldest pending subscription is answered
+    registry.acknowledge({"event": "subscribe", "success": False, "errorMsg": "invalid topic"})
+    assert registry.state("PERP_ETH_USDC@bbo") == "failed"
+    assert registry.error("PERP_ETH_USDC@bbo") == "invalid topic"
+    assert registry.has_pending()
+    registry.acknowledge({"event": "subscribe", "success": True, "data": "balance"})
+    assert not registry.has_pending()
+    assert registry.acknowledge({"event": "subscribe", "success": True}) is None
+    assert registry.stats() == {"pending": 0, "acked": 2, "failed": 1}
+
+    # a failed subscription can be sent again
+    assert registry.add(subscribe("PERP_ETH_USDC@bbo"))
+    assert not registry.add(subscribe("PERP_BTC_USDC@bbo"))
+
+
+def test_unsubscribe_removes_the_topic():
+    registry = SubscriptionRegistry()
+    registry.add(subscribe("PERP_ETH_USDC@bbo"))
+    registry.add(subscribe("executionreport", {"symbol": "PERP_ETH_USDC"}))
+    registry.add(subscribe("executionreport", {"symbol": "PERP_BTC_USDC"}))
+
+    registry.remove({"event": "unsubscribe", "topic": "executionreport", "params": {"symbol": "PERP_BTC_USDC"}})
+    assert registry.state("executionreport", {"symbol": "PERP_BTC_USDC"}) is None
+    assert registry.state("executionreport", {"symbol": "PERP_ETH_USDC"}) == "pending"
+    registry.remove({"event": "unsubscribe", "topic": "executionreport"})
+    registry.remove({"event": "unsubscribe", "topic": "PERP_ETH_USDC@bbo"})
+    assert len(registry) == 0
+    assert registry.topics() == []
+    assert not registry.has_pending()
+
+
+def test_replay_sends_every_topic_once():
+    registry = SubscriptionRegistry()
+    for _ in range(3):
+        for n in range(300):
+            registry.add(subscribe(f"PERP_{n}_USDC@trade"))
+    for n in range(300):
+        registry.acknowledge({"event": "subscribe", "success": True, "data": f"PERP_{n}_USDC@trade"})
+
+    messages = registry.replay()
+    assert len(messages) == 300
+    assert len({message["topic"] for message in messages}) == 300
+    assert registry.stats()["pending"] == 300